@@ -46,35 +46,35 @@ class ResultVerifier:
 
     def get_winner(self):
         if self.board_of_concern.board[0][0] == self.board_of_concern.board[0][1] == self.board_of_concern.board[0][2] \
-                and self.board_of_concern.board[0][0] == Piece.EmptySlot:
+                and self.board_of_concern.board[0][0] != Piece.EmptySlot:
             return self.board_of_concern.board[0][0]
 
         elif self.board_of_concern.board[1][0] == self.board_of_concern.board[1][1] == self.board_of_concern.board[1][2]\
-                and self.board_of_concern.board[1][0] == Piece.EmptySlot:
+                and self.board_of_concern.board[1][0] != Piece.EmptySlot:
             return self.board_of_concern.board[1][0]
 
         elif self.board_of_concern.board[2][0] == self.board_of_concern.board[2][1] == self.board_of_concern.board[2][2] and \
-                self.board_of_concern.board[2][0] == Piece.EmptySlot:
+                self.board_of_concern.board[2][0] != Piece.EmptySlot:
             return self.board_of_concern.board[2][0]
 
         elif self.board_of_concern.board[0][0] == self.board_of_concern.board[1][0] == self.board_of_concern.board[2][0] and \
-                self.board_of_concern.board[0][0] == Piece.EmptySlot:
+                self.board_of_concern.board[0][0] != Piece.EmptySlot:
             return self.board_of_concern.board[0][0]
 
         elif self.board_of_concern.board[0][1] == self.board_of_concern.board[1][1] == self.board_of_concern.board[2][1] and \
-                self.board_of_concern.board[0][1] == Piece.EmptySlot:
+                self.board_of_concern.board[0][1] != Piece.EmptySlot:
             return self.board_of_concern.board[0][1]
 
         elif self.board_of_concern.board[0][2] == self.board_of_concern.board[1][2] == self.board_of_concern.board[2][2] and \
-                self.board_of_concern.board[0][2] == Piece.EmptySlot:
+                self.board_of_concern.board[0][2] != Piece.EmptySlot:
             return self.board_of_concern.board[0][2]
 
         elif self.board_of_concern.board[0][0] == self.board_of_concern.board[1][1] == self.board_of_concern.board[2][2] and \
-                self.board_of_concern.board[0][0] == Piece.EmptySlot:
+                self.board_of_concern.board[0][0] != Piece.EmptySlot:
             return self.board_of_concern.board[0][0]
 
         elif self.board_of_concern.board[2][0] == self.board_of_concern.board[1][1] == self.board_of_concern.board[0][2] and \
-                self.board_of_concern.board[2][0] == Piece.EmptySlot:
+                self.board_of_concern.board[2][0] != Piece.EmptySlot:
             return self.board_of_concern.board[2][0]
 
         else:
@@ -1,6 +1,7 @@
 
 import socket
 import os
+import struct
 import threading
 import logging
 from queue import Queue
@@ -50,37 +51,36 @@ class BasicSocket:
     Base class for connection sockets
 
     implements base routines for sending and receiving data over the socket connection
+    every message is preceded by its length as an 8 byte big endian integer
     """
+    HANDSHAKE = struct.Struct("!Q")
+
     def __init__(self, assigned_port=Configurations().port, sock_addr=socket.gethostname()):
         assert isinstance(assigned_port, int)
         self.hostname = sock_addr
         self.assigned_port = assigned_port
         self.socket_conn = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.connection = None
+        # grows to the largest message received so far
+        self.receive_buffer = bytearray(4096)
         logging.log(logging.DEBUG, f"{self.__class__.__name__} || socket initiated")
 
     def receive_data(self):
         """
         reads the data from the buffer when a connection has been established
+        the payload is received in place into a buffer reused across calls
         :return: the data read from the buffer in string format
         """
-        data = []
-        # get the fixed size handshake message which specifies the length of the message to be read next
-        hs_message = self.connection.recv(Configurations().handshake_size).decode()
-        # convert the read to int
-        data_size = int(hs_message, 16)
-        # size of pending data to be read from the server is initialized to the size read from handshake
-        pending_data = data_size
-        # loop until the full message is read in chucks of 2 KB
-        while pending_data > 0:
-            blob = self.connection.recv(min(pending_data, 2048))
-            # If, before the fixed size of message s completely read, the line goes empty raise an error
-            if len(blob) == 0:
-                raise Exception("Abnormal Disconnection")
-            # reduce the size of the data pending by subtracting the size of the received data
-            pending_data -= len(blob)
-            # the newly read data is appended to the main data variable
-            data.append(blob)
+        header = memoryview(self.receive_buffer)[:Configurations().handshake_size]
+        self.__receive_exactly(header)
+        # binary handshake message which specifies the length of the message to be read next
+        (data_size,) = BasicSocket.HANDSHAKE.unpack_from(header)
+        header.release()
+        if data_size > len(self.receive_buffer):
+            self.receive_buffer = bytearray(data_size)
+        with memoryview(self.receive_buffer) as view:
+            self.__receive_exactly(view[:data_size])
+            data = str(view[:data_size], "utf-8")
         logging.log(logging.DEBUG, f"{self.__class__.__name__} || data received")
         return data
 
@@ -90,22 +90,27 @@ class BasicSocket:
         :param data: Data content in string format
         :return: None
         """
-        # size of data calculated
-        data_size = len(data)
-        # the data is then converted to hex string for uniformity in size
-        size_in_hex = "0x%0.8X" % data_size
+        payload = data.encode() if isinstance(data, str) else data
         # send the handshake message that is the data to be read further on the other end
-        self.connection.send(size_in_hex.encode())
-        # counter initialized to 0
-        sent_so_far = 0
-        # the contents of the data is sent in loops
-        while sent_so_far < data_size:
-            sent_blob_size = self.connection.send(data[sent_so_far:])
-            if len(sent_blob_size) == 0:
-                raise Exception("abnormal disconnection")
-            sent_so_far += sent_blob_size
+        self.connection.sendall(BasicSocket.HANDSHAKE.pack(len(payload)))
+        # sendall continues partial sends itself, the payload is never sliced
+        self.connection.sendall(payload)
         logging.log(logging.DEBUG, f"{self.__class__.__name__} || data transmission is completed")
 
+    def __receive_exactly(self, view):
+        """
+        fills the view from the connection
+        :param view: writable memoryview
+        :return: None
+        """
+        received = 0
+        while received < len(view):
+            count = self.connection.recv_into(view[received:])
+            # If, before the fixed size of message s completely read, the line goes empty raise an error
+            if count == 0:
+                raise Exception("Abnormal Disconnection")
+            received += count
+
 
 class HostSocket(BasicSocket):
     """
@@ -0,0 +1,265 @@
+import asyncio
+import itertools
+import logging
+import struct
+from enum import Enum
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Union
+from tcp.framing import FRAME_HEADER, MAX_FRAME_SIZE
+
+# first frame of every connection, sent by the client
+HANDSHAKE_REQUEST = b"TTTHELLO"
+# reply of the host, followed by the peer id it assigned as an unsigned 32 bit integer
+HANDSHAKE_RESPONSE = b"TTTWELCM"
+_PEER_ID = struct.Struct("!I")
+
+
+class PeerStates(Enum):
+    """
+    enumeration of the states of a connection, same for the host and the client side
+    """
+    PENDING_HANDSHAKE = 0x01
+    READY = 0x02
+    CLOSED = 0x03
+
+
+async def read_frame(reader: asyncio.StreamReader, max_frame_size: int = MAX_FRAME_SIZE) -> bytes:
+    """
+    reads one frame in the format of tcp.framing
+    :param reader: stream of the connection
+    :param max_frame_size: frames above this size are refused
+    :return: payload, raises asyncio.IncompleteReadError when the peer disconnects
+    """
+    (frame_size,) = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    if frame_size > max_frame_size:
+        raise ValueError(f"frame of {frame_size} bytes exceeds the limit of {max_frame_size}")
+    return await reader.readexactly(frame_size)
+
+
+def write_frame(writer: asyncio.StreamWriter, payload: bytes):
+    """
+    queues one frame in the format of tcp.framing, await writer.drain() to apply backpressure
+    :param writer: stream of the connection
+    :param payload: bytes like object
+    :return: None
+    """
+    writer.writelines((FRAME_HEADER.pack(len(payload)), payload))
+
+
+# called for every frame received from a peer in READY state, may be a coroutine function
+MessageHandler = Callable[["Peer", bytes], Union[None, Awaitable[None]]]
+
+
+class Peer:
+    """
+    one persistent connection and its state
+    """
+
+    def __init__(self, peer_id: int, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.peer_id = peer_id
+        self.reader = reader
+        self.writer = writer
+        self.address = writer.get_extra_info("peername")
+        self.state = PeerStates.PENDING_HANDSHAKE
+        self.received_count = 0
+        self.sent_count = 0
+
+    async def send(self, payload: bytes):
+        """
+        sends one message, waits while the transport buffer of the connection is full
+        :param payload: bytes like object
+        :return: None
+        """
+        if self.state is PeerStates.CLOSED:
+            raise ConnectionError(f"peer {self.peer_id} is closed")
+        write_frame(self.writer, payload)
+        self.sent_count += 1
+        await self.writer.drain()
+
+    async def close(self):
+        if self.state is not PeerStates.CLOSED:
+            self.state = PeerStates.CLOSED
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def _call_handler(handler: MessageHandler, peer: Peer, payload: bytes):
+    result = handler(peer, payload)
+    if asyncio.iscoroutine(result):
+        await result
+
+
+class AsyncHost:
+    """
+    host role, accepts any number of persistent client connections on one event loop
+
+    every connection runs its own state machine: the first frame has to be the handshake,
+    after that every frame is handed to the message handler until the peer disconnects
+    """
+
+    def __init__(self, handler: MessageHandler, host_address: str = "127.0.0.1", port: int = 0,
+                 max_peers: int = 10000, handshake_timeout: float = 5.0):
+        """
+        :param handler: called with the peer and the payload of every received message
+        :param host_address: address to listen on
+        :param port: port to listen on, 0 picks a free one
+        :param max_peers: connections beyond this number are closed right after the accept
+        :param handshake_timeout: seconds a new connection has to send the handshake
+        """
+        self.handler = handler
+        self.host_address = host_address
+        self.port = port
+        self.max_peers = max_peers
+        self.handshake_timeout = handshake_timeout
+        self.peers: Dict[int, Peer] = {}
+        self.__peer_ids = itertools.count(1)
+        self.__server: Optional[asyncio.AbstractServer] = None
+        self.__connections = set()
+
+    async def start(self) -> Tuple[str, int]:
+        """
+        starts listening
+        :return: (address, port) the host listens on
+        """
+        self.__server = await asyncio.start_server(self.__serve, self.host_address, self.port)
+        self.host_address, self.port = self.__server.sockets[0].getsockname()[:2]
+        logging.debug(f"{self.__class__.__name__} | listening on {(self.host_address, self.port)}")
+        return self.host_address, self.port
+
+    async def broadcast(self, payload: bytes):
+        """
+        sends the message to every peer in READY state
+        :param payload: bytes like object
+        :return: None
+        """
+        peers = [peer for peer in self.peers.values() if peer.state is PeerStates.READY]
+        for peer in peers:
+            write_frame(peer.writer, payload)
+            peer.sent_count += 1
+        await asyncio.gather(*(peer.writer.drain() for peer in peers), return_exceptions=True)
+
+    async def close(self):
+        """
+        stops accepting, closes every connection and waits for their state machines to end
+        :return: None
+        """
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+        for task in list(self.__connections):
+            task.cancel()
+        await asyncio.gather(*self.__connections, return_exceptions=True)
+
+    async def __serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self.__connections.add(task)
+        peer = Peer(next(self.__peer_ids), reader, writer)
+        try:
+            # connections still in the handshake count as well, the task of this one included
+            if len(self.__connections) > self.max_peers:
+                logging.debug(f"{self.__class__.__name__} | {peer.address} refused, host is full")
+                return
+            while peer.state is not PeerStates.CLOSED:
+                if peer.state is PeerStates.PENDING_HANDSHAKE:
+                    frame = await asyncio.wait_for(read_frame(reader), self.handshake_timeout)
+                    if frame != HANDSHAKE_REQUEST:
+                        logging.debug(f"{self.__class__.__name__} | {peer.address} sent an invalid handshake")
+                        return
+                    await peer.send(HANDSHAKE_RESPONSE + _PEER_ID.pack(peer.peer_id))
+                    peer.state = PeerStates.READY
+                    self.peers[peer.peer_id] = peer
+                elif peer.state is PeerStates.READY:
+                    frame = await read_frame(reader)
+                    peer.received_count += 1
+                    await _call_handler(self.handler, peer, frame)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError, ValueError) as e:
+            logging.debug(f"{self.__class__.__name__} | {peer.address} | {e!r}")
+        finally:
+            self.peers.pop(peer.peer_id, None)
+            self.__connections.discard(task)
+            await peer.close()
+
+
+class AsyncClient:
+    """
+    client role, one persistent connection to a host
+
+    received messages are passed to the handler when one is given, otherwise they are queued
+    for receive
+    """
+
+    def __init__(self, handler: MessageHandler = None):
+        self.handler = handler
+        self.peer: Optional[Peer] = None
+        # created on connect, bound to the running loop
+        self.__inbox: Optional[asyncio.Queue] = None
+        self.__reader_task: Optional[asyncio.Task] = None
+
+    @property
+    def peer_id(self) -> Optional[int]:
+        return self.peer.peer_id if self.peer is not None else None
+
+    async def connect(self, host_address: str, port: int, timeout: float = 5.0) -> int:
+        """
+        connects and performs the handshake
+        :param host_address: address of the host
+        :param port: port of the host
+        :param timeout: seconds allowed for connecting and the handshake
+        :return: peer id assigned by the host
+        """
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host_address, port), timeout)
+        peer = Peer(0, reader, writer)
+        try:
+            await peer.send(HANDSHAKE_REQUEST)
+            response = await asyncio.wait_for(read_frame(reader), timeout)
+        except BaseException:
+            await peer.close()
+            raise
+        if not response.startswith(HANDSHAKE_RESPONSE) or len(response) != len(HANDSHAKE_RESPONSE) + _PEER_ID.size:
+            await peer.close()
+            raise ConnectionError(f"invalid handshake response from {(host_address, port)}")
+        (peer.peer_id,) = _PEER_ID.unpack_from(response, len(HANDSHAKE_RESPONSE))
+        peer.state = PeerStates.READY
+        self.peer = peer
+        self.__inbox = asyncio.Queue()
+        self.__reader_task = asyncio.ensure_future(self.__read_loop())
+        return peer.peer_id
+
+    async def send(self, payload: bytes):
+        if self.peer is None:
+            raise ConnectionError("not connected")
+        await self.peer.send(payload)
+
+    async def receive(self) -> Optional[bytes]:
+        """
+        waits for the next queued message
+        :return: payload, None once the connection is closed
+        """
+        if self.__inbox is None:
+            raise ConnectionError("not connected")
+        return await self.__inbox.get()
+
+    async def close(self):
+        if self.__reader_task is not None:
+            self.__reader_task.cancel()
+            await asyncio.gather(self.__reader_task, return_exceptions=True)
+        if self.peer is not None:
+            await self.peer.close()
+
+    async def __read_loop(self):
+        peer = self.peer
+        try:
+            while peer.state is PeerStates.READY:
+                frame = await read_frame(peer.reader)
+                peer.received_count += 1
+                if self.handler is not None:
+                    await _call_handler(self.handler, peer, frame)
+                else:
+                    self.__inbox.put_nowait(frame)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError) as e:
+            logging.debug(f"{self.__class__.__name__} | {peer.address} | {e!r}")
+        finally:
+            self.__inbox.put_nowait(None)
+            await peer.close()
@@ -0,0 +1,165 @@
+import asyncio
+import selectors
+import socket
+import threading
+import time
+import tcp.exceptions as exc
+from typing import Callable, List, Optional
+
+
+class Deadline:
+    """
+    point in time an operation has to be done by, measured on the monotonic clock
+    """
+    __slots__ = ("end",)
+
+    def __init__(self, seconds: Optional[float] = None):
+        """
+        :param seconds: time from now, None for no deadline
+        """
+        self.end = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self, cap: Optional[float] = None) -> Optional[float]:
+        """
+        :param cap: upper bound of the result, e.g. the timeout of a single step
+        :return: seconds left, never negative, None if there is neither a deadline nor a cap
+        """
+        if self.end is None:
+            return cap
+        remaining = max(self.end - time.monotonic(), 0.0)
+        return remaining if cap is None else min(remaining, cap)
+
+    def is_expired(self) -> bool:
+        return self.end is not None and time.monotonic() >= self.end
+
+    def check(self):
+        """
+        :return: None, raises DeadlineExceededError once the deadline passed
+        """
+        if self.is_expired():
+            raise exc.DeadlineExceededError("deadline exceeded")
+
+
+class CancellationToken:
+    """
+    cancels blocking network operations of other threads within milliseconds
+
+    cancel() sets the token and writes a byte to a wakeup socketpair. wait_readable and
+    wait_writable select on the socket of the operation together with the wakeup socket, so a
+    thread blocked in them returns as soon as the token is cancelled or its deadline passes,
+    without closing sockets under it or injecting exceptions. the socketpair is created on first
+    use and released by close()
+    """
+
+    def __init__(self):
+        self.__event = threading.Event()
+        self.__lock = threading.Lock()
+        self.__callbacks: List[Callable[[], None]] = []
+        self.__wakeup_receiver: Optional[socket.socket] = None
+        self.__wakeup_sender: Optional[socket.socket] = None
+        self.reason: Optional[str] = None
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self.__event.is_set()
+
+    def cancel(self, reason: str = "cancelled"):
+        """
+        cancels the token, calling it again has no effect
+        :param reason: message of the OperationCancelledError raised to the waiting threads
+        :return: None
+        """
+        with self.__lock:
+            if self.__event.is_set():
+                return
+            self.reason = reason
+            self.__event.set()
+            if self.__wakeup_sender is not None:
+                self.__wakeup_sender.send(b"\x00")
+            callbacks, self.__callbacks = self.__callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], None]):
+        """
+        registers a function called from the cancelling thread, right away if already cancelled
+        :param callback: function without arguments
+        :return: None
+        """
+        with self.__lock:
+            if not self.__event.is_set():
+                self.__callbacks.append(callback)
+                return
+        callback()
+
+    def cancel_task(self, task: asyncio.Task, loop: asyncio.AbstractEventLoop):
+        """
+        cancels the asyncio task when the token is cancelled, from any thread
+        :param task: task to be cancelled
+        :param loop: loop the task runs on
+        :return: None
+        """
+        self.add_callback(lambda: loop.call_soon_threadsafe(task.cancel))
+
+    def raise_if_cancelled(self):
+        if self.__event.is_set():
+            raise exc.OperationCancelledError(self.reason)
+
+    def sleep(self, seconds: float) -> bool:
+        """
+        waits for the given time unless the token is cancelled earlier
+        :param seconds: time to wait
+        :return: True if the full time passed, False if cancelled
+        """
+        return not self.__event.wait(seconds)
+
+    @property
+    def wakeup_socket(self) -> socket.socket:
+        """
+        socket which turns readable on cancellation, to be registered on selectors of the caller
+        """
+        with self.__lock:
+            if self.__wakeup_receiver is None:
+                self.__wakeup_receiver, self.__wakeup_sender = socket.socketpair()
+                self.__wakeup_receiver.setblocking(False)
+                if self.__event.is_set():
+                    self.__wakeup_sender.send(b"\x00")
+            return self.__wakeup_receiver
+
+    def wait_readable(self, conn_socket: socket.socket, deadline: Deadline = None):
+        """
+        blocks until the socket has data or a connection to accept
+        :param conn_socket: socket to wait for
+        :param deadline: raises DeadlineExceededError when it passes first
+        :return: None, raises OperationCancelledError when the token is cancelled first
+        """
+        self.__wait(conn_socket, selectors.EVENT_READ, deadline)
+
+    def wait_writable(self, conn_socket: socket.socket, deadline: Deadline = None):
+        """
+        blocks until the socket accepts data or a non-blocking connect is done
+        :param conn_socket: socket to wait for
+        :param deadline: raises DeadlineExceededError when it passes first
+        :return: None, raises OperationCancelledError when the token is cancelled first
+        """
+        self.__wait(conn_socket, selectors.EVENT_WRITE, deadline)
+
+    def close(self):
+        with self.__lock:
+            for wakeup_socket in (self.__wakeup_receiver, self.__wakeup_sender):
+                if wakeup_socket is not None:
+                    wakeup_socket.close()
+            self.__wakeup_receiver = self.__wakeup_sender = None
+
+    def __wait(self, conn_socket: socket.socket, events: int, deadline: Optional[Deadline]):
+        deadline = Deadline() if deadline is None else deadline
+        self.raise_if_cancelled()
+        with selectors.DefaultSelector() as selector:
+            selector.register(conn_socket, events)
+            selector.register(self.wakeup_socket, selectors.EVENT_READ)
+            while True:
+                ready = selector.select(deadline.remaining())
+                self.raise_if_cancelled()
+                if ready:
+                    return
+                deadline.check()
@@ -0,0 +1,184 @@
+import struct
+from typing import NamedTuple, Tuple, Union
+
+# every message starts with the codec version and its type, one byte each, followed by the fields
+# of the type in network byte order. coins are the values of components.board.Coin: 1 X, 2 O, 3 empty
+CODEC_VERSION = 0x01
+HEADER = struct.Struct("!BB")
+
+
+class MoveMessage(NamedTuple):
+    game_id: int
+    x: int
+    y: int
+    coin: int
+
+
+class BoardStateMessage(NamedTuple):
+    game_id: int
+    # number of updates the board had applied
+    sequence: int
+    # 9 bit masks of the X and O coins, bit index x * 3 + y
+    x_mask: int
+    o_mask: int
+
+
+class PlayerSwitchMessage(NamedTuple):
+    game_id: int
+    player_id: int
+    is_holding_turn: bool
+
+
+class CoinAssignmentMessage(NamedTuple):
+    game_id: int
+    player_id: int
+    coin: int
+
+
+class HandshakeMessage(NamedTuple):
+    player_id: int
+    # utf-8 encoded on the wire, at most 255 bytes
+    name: str
+
+
+class CellDeltaMessage(NamedTuple):
+    game_id: int
+    # position of the update in the replication stream, see tcp.replication
+    sequence: int
+    # x * 3 + y of the updated cell, CLEARED_INDEX when the board was cleared
+    index: int
+    coin: int
+    # low 16 bits of the state checksum after the update
+    checksum: int
+
+
+class BoardSnapshotMessage(NamedTuple):
+    game_id: int
+    sequence: int
+    x_mask: int
+    o_mask: int
+    # crc32 of the masks, see tcp.replication.state_checksum
+    checksum: int
+
+
+# index of a CellDeltaMessage clearing the whole board
+CLEARED_INDEX = 0xFF
+
+GameMessage = Union[MoveMessage, BoardStateMessage, PlayerSwitchMessage, CoinAssignmentMessage, HandshakeMessage,
+                    CellDeltaMessage, BoardSnapshotMessage]
+
+
+class CodecError(ValueError):
+    pass
+
+
+# message type -> (type byte, layout of the fixed size fields)
+_LAYOUTS = {
+    MoveMessage: (0x01, struct.Struct("!IBBB")),
+    BoardStateMessage: (0x02, struct.Struct("!IIHH")),
+    PlayerSwitchMessage: (0x03, struct.Struct("!II?")),
+    CoinAssignmentMessage: (0x04, struct.Struct("!IIB")),
+    # the name follows as its length in one byte and the utf-8 bytes
+    HandshakeMessage: (0x05, struct.Struct("!IB")),
+    CellDeltaMessage: (0x06, struct.Struct("!IIBBH")),
+    BoardSnapshotMessage: (0x07, struct.Struct("!IIHHI")),
+}
+# type byte -> (message type, layout) for the decoder
+_TYPES = {type_id: (message_type, layout) for message_type, (type_id, layout) in _LAYOUTS.items()}
+# message type -> layout of the header followed by the fields, used by the encoder
+_ENCODERS = {message_type: struct.Struct("!BB" + layout.format[1:])
+             for message_type, (_, layout) in _LAYOUTS.items()}
+
+
+def encoded_size(message: GameMessage) -> int:
+    """
+    :param message: one of the message types of the codec
+    :return: number of bytes encode returns for the message
+    """
+    size = _ENCODERS[type(message)].size
+    if type(message) is HandshakeMessage:
+        size += len(message.name.encode())
+    return size
+
+
+def encode(message: GameMessage) -> bytes:
+    """
+    :param message: one of the message types of the codec
+    :return: encoded bytes
+    """
+    message_type = type(message)
+    try:
+        type_id, _ = _LAYOUTS[message_type]
+    except KeyError:
+        raise CodecError(f"{message_type.__name__} can not be encoded") from None
+    try:
+        if message_type is HandshakeMessage:
+            name = message.name.encode()
+            return _ENCODERS[message_type].pack(CODEC_VERSION, type_id, message.player_id, len(name)) + name
+        return _ENCODERS[message_type].pack(CODEC_VERSION, type_id, *message)
+    except struct.error as e:
+        raise CodecError(f"{message} is out of range: {e}") from None
+
+
+def encode_into(buffer, offset: int, message: GameMessage) -> int:
+    """
+    writes the encoded message into a preallocated buffer
+    :param buffer: writable bytes like object
+    :param offset: position of the first byte
+    :param message: one of the message types of the codec
+    :return: number of bytes written
+    """
+    message_type = type(message)
+    if message_type is HandshakeMessage:
+        data = encode(message)
+        buffer[offset:offset + len(data)] = data
+        return len(data)
+    try:
+        type_id, _ = _LAYOUTS[message_type]
+        encoder = _ENCODERS[message_type]
+        encoder.pack_into(buffer, offset, CODEC_VERSION, type_id, *message)
+    except KeyError:
+        raise CodecError(f"{message_type.__name__} can not be encoded") from None
+    except struct.error as e:
+        raise CodecError(f"{message} does not fit: {e}") from None
+    return encoder.size
+
+
+def decode_from(data, offset: int = 0) -> Tuple[GameMessage, int]:
+    """
+    reads one message out of a buffer holding any number of messages
+    the fields are unpacked in place through a memoryview, only a handshake name is copied
+    :param data: bytes like object
+    :param offset: position of the first byte of the message
+    :return: (message, number of bytes consumed)
+    """
+    view = data if isinstance(data, memoryview) else memoryview(data)
+    try:
+        version, type_id = HEADER.unpack_from(view, offset)
+        if version != CODEC_VERSION:
+            raise CodecError(f"unsupported codec version {version}")
+        message_type, layout = _TYPES[type_id]
+        fields = layout.unpack_from(view, offset + HEADER.size)
+    except KeyError:
+        raise CodecError(f"unknown message type {type_id}") from None
+    except struct.error as e:
+        raise CodecError(f"truncated message: {e}") from None
+    size = HEADER.size + layout.size
+    if message_type is HandshakeMessage:
+        player_id, name_length = fields
+        start = offset + size
+        if start + name_length > len(view):
+            raise CodecError("truncated handshake name")
+        return HandshakeMessage(player_id, str(view[start:start + name_length], "utf-8")), size + name_length
+    return message_type._make(fields), size
+
+
+def decode(data) -> GameMessage:
+    """
+    :param data: bytes like object holding exactly one message
+    :return: decoded message
+    """
+    message, size = decode_from(data)
+    if size != len(data):
+        raise CodecError(f"{len(data) - size} trailing bytes after the message")
+    return message
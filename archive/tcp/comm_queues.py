@@ -1,6 +1,11 @@
+import logging
 import queue
 import threading
 import pickle
+from collections import deque
+from enum import Enum
+from typing import Any, Dict, List, Optional
+import tcp.exceptions as exc
 
 
 class BaseTransmissionQueue:
@@ -45,7 +50,7 @@ class BaseReceptionQueue(threading.Thread):
 
     __singleton = None
 
-    def __int__(self):
+    def __init__(self):
         threading.Thread.__init__(self)
         self._reception_queue = queue.Queue()
         # list of all registered listeners
@@ -83,7 +88,316 @@ class BaseReceptionQueue(threading.Thread):
         raise NotImplementedError
 
 
+class OverflowPolicies(Enum):
+    """
+    enumeration of what a push does when the queue of a recipient is full
+    """
+    # wait for the consumer, up to the put timeout of the queue
+    BLOCK = 0x01
+    # discard the message being pushed
+    DROP_NEWEST = 0x02
+    # discard the oldest queued message to make room
+    DROP_OLDEST = 0x03
+    # raise QueueOverflowError
+    RAISE = 0x04
+
+
+class BoundedQueue:
+    """
+    fifo of at most max_size messages with an overflow policy, one per recipient
+
+    get_many drains any number of messages under a single lock acquisition. close wakes up
+    every waiting producer and consumer, the messages left can still be read
+    """
+    __slots__ = ("max_size", "overflow_policy", "put_timeout", "messages", "is_closed",
+                 "pushed_count", "dropped_count", "__not_empty", "__not_full")
+
+    def __init__(self, max_size: int = 256, overflow_policy: OverflowPolicies = OverflowPolicies.DROP_OLDEST,
+                 put_timeout: float = None):
+        """
+        :param max_size: maximum number of queued messages
+        :param overflow_policy: behaviour of put on a full queue
+        :param put_timeout: seconds a BLOCK put waits before raising QueueOverflowError, None waits forever
+        """
+        if max_size < 1:
+            raise ValueError(f"max_size has to be positive, got {max_size}")
+        self.max_size = max_size
+        self.overflow_policy = overflow_policy
+        self.put_timeout = put_timeout
+        self.messages = deque()
+        self.is_closed = False
+        self.pushed_count = 0
+        self.dropped_count = 0
+        lock = threading.Lock()
+        self.__not_empty = threading.Condition(lock)
+        self.__not_full = threading.Condition(lock)
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def put(self, message) -> bool:
+        """
+        queues the message according to the overflow policy
+        :param message: any object, queued by reference
+        :return: True if queued, False if dropped or the queue is closed
+        """
+        with self.__not_full:
+            if self.is_closed:
+                return False
+            if len(self.messages) >= self.max_size:
+                if self.overflow_policy is OverflowPolicies.DROP_NEWEST:
+                    self.dropped_count += 1
+                    return False
+                if self.overflow_policy is OverflowPolicies.DROP_OLDEST:
+                    self.messages.popleft()
+                    self.dropped_count += 1
+                elif self.overflow_policy is OverflowPolicies.RAISE:
+                    raise exc.QueueOverflowError(f"queue is full with {self.max_size} messages")
+                else:
+                    is_free = self.__not_full.wait_for(lambda: len(self.messages) < self.max_size or self.is_closed,
+                                                       self.put_timeout)
+                    if not is_free:
+                        raise exc.QueueOverflowError(f"queue stayed full for {self.put_timeout} seconds")
+                    if self.is_closed:
+                        return False
+            self.messages.append(message)
+            self.pushed_count += 1
+            self.__not_empty.notify()
+            return True
+
+    def get_many(self, max_count: int, timeout: Optional[float] = 0) -> List[Any]:
+        """
+        takes up to max_count messages in order
+        :param max_count: maximum number of messages returned
+        :param timeout: seconds to wait for the first message, None waits until one arrives or the queue is closed
+        :return: list of messages, empty if none arrived in time
+        """
+        with self.__not_empty:
+            if not self.messages and timeout != 0:
+                self.__not_empty.wait_for(lambda: self.messages or self.is_closed, timeout)
+            count = min(max_count, len(self.messages))
+            batch = [self.messages.popleft() for _ in range(count)]
+            if count:
+                self.__not_full.notify(count)
+            return batch
+
+    def get(self, timeout: Optional[float] = None):
+        """
+        :param timeout: seconds to wait, 0 does not wait, None waits until a message arrives or the queue is closed
+        :return: the oldest message, raises queue.Empty if there is none
+        """
+        batch = self.get_many(1, timeout)
+        if not batch:
+            raise queue.Empty
+        return batch[0]
+
+    def close(self):
+        with self.__not_empty:
+            self.is_closed = True
+            self.__not_empty.notify_all()
+            self.__not_full.notify_all()
+
+
+class TransmissionQueue(BaseTransmissionQueue):
+    """
+    outgoing messages with a bounded queue per recipient
+
+    a message pushed FOR_ALL is queued by reference for every recipient, no copy is made, so
+    it must not be modified afterwards. every recipient has its own bound and overflow policy:
+    a spectator on a slow link set to DROP_OLDEST loses its oldest updates instead of holding
+    up the push of the game loop, while the players can be set to BLOCK
+    """
+
+    def __new__(cls, *args, **kwargs):
+        # one instance per host, unlike the singleton of the base class
+        return object.__new__(cls)
+
+    def __init__(self, max_size: int = 256, overflow_policy: OverflowPolicies = OverflowPolicies.DROP_OLDEST,
+                 put_timeout: float = None):
+        """
+        :param max_size: default bound of the recipient queues
+        :param overflow_policy: default overflow policy of the recipient queues
+        :param put_timeout: default seconds a BLOCK push waits for a full queue
+        """
+        BaseTransmissionQueue.__init__(self)
+        self.max_size = max_size
+        self.overflow_policy = overflow_policy
+        self.put_timeout = put_timeout
+        # recipient id -> queue, replaced on every change so push iterates without a lock
+        self.queue_list: Dict[str, BoundedQueue] = {}
+        self.__lock = threading.Lock()
+
+    def build(self):
+        return self
+
+    def add_recipient(self, recipient_id: str, max_size: int = None, overflow_policy: OverflowPolicies = None,
+                      put_timeout: float = None) -> BoundedQueue:
+        """
+        creates the queue of a recipient, the defaults of the transmission queue apply to unset arguments
+        :param recipient_id: remote peer address or any other key
+        :return: queue of the recipient
+        """
+        if recipient_id == BaseTransmissionQueue.FOR_ALL:
+            raise ValueError(f"{recipient_id} is reserved for broadcasts")
+        recipient_queue = BoundedQueue(self.max_size if max_size is None else max_size,
+                                       self.overflow_policy if overflow_policy is None else overflow_policy,
+                                       self.put_timeout if put_timeout is None else put_timeout)
+        with self.__lock:
+            if recipient_id in self.queue_list:
+                raise ValueError(f"recipient {recipient_id} is already registered")
+            queue_list = dict(self.queue_list)
+            queue_list[recipient_id] = recipient_queue
+            self.queue_list = queue_list
+        return recipient_queue
+
+    def remove_recipient(self, recipient_id: str):
+        """
+        drops the queue of the recipient and wakes up its waiting consumer
+        :return: None
+        """
+        with self.__lock:
+            queue_list = dict(self.queue_list)
+            recipient_queue = queue_list.pop(recipient_id)
+            self.queue_list = queue_list
+        recipient_queue.close()
+
+    def get_recipient_ids(self) -> List[str]:
+        return list(self.queue_list)
+
+    def push(self, message, recipient_id: str = BaseTransmissionQueue.FOR_ALL) -> int:
+        """
+        queues the message for one recipient or, by reference, for all of them
+        with FOR_ALL an overflow error of one recipient is raised after the others got the message
+        :param message: message to be transferred
+        :param recipient_id: recipient of the message, FOR_ALL by default
+        :return: number of recipients the message was queued for
+        """
+        if recipient_id != BaseTransmissionQueue.FOR_ALL:
+            return int(self.__get_queue(recipient_id).put(message))
+        queued_count = 0
+        overflow = None
+        for recipient_queue in self.queue_list.values():
+            try:
+                queued_count += recipient_queue.put(message)
+            except exc.QueueOverflowError as e:
+                overflow = overflow or e
+        if overflow is not None:
+            raise overflow
+        return queued_count
+
+    def get_message(self, recipient_id: str = None, timeout: Optional[float] = None):
+        """
+        reads the recipient specific queue and gets the message to be transmitted
+        :param recipient_id: recipient, may be left out while there is only one
+        :param timeout: seconds to wait, 0 does not wait, None waits until a message arrives or the recipient is removed
+        :return: the oldest message, raises queue.Empty if there is none
+        """
+        return self.__get_queue(recipient_id).get(timeout)
+
+    def get_many(self, recipient_id: str = None, max_count: int = 64, timeout: Optional[float] = 0) -> List[Any]:
+        """
+        drains up to max_count messages of the recipient in one go, e.g. to send them in a single write
+        :param recipient_id: recipient, may be left out while there is only one
+        :param max_count: maximum number of messages returned
+        :param timeout: seconds to wait for the first message
+        :return: list of messages in order
+        """
+        return self.__get_queue(recipient_id).get_many(max_count, timeout)
+
+    def get_statistics(self) -> Dict[str, dict]:
+        """
+        :return: recipient id -> size, pushed and dropped count of its queue
+        """
+        return {recipient_id: {"size": len(recipient_queue), "pushed": recipient_queue.pushed_count,
+                               "dropped": recipient_queue.dropped_count}
+                for recipient_id, recipient_queue in self.queue_list.items()}
+
+    def __get_queue(self, recipient_id: Optional[str]) -> BoundedQueue:
+        queue_list = self.queue_list
+        if recipient_id is None:
+            if len(queue_list) != 1:
+                raise ValueError(f"recipient_id is required with {len(queue_list)} recipients")
+            return next(iter(queue_list.values()))
+        try:
+            return queue_list[recipient_id]
+        except KeyError:
+            raise KeyError(f"unknown recipient {recipient_id}") from None
+
+
+class ReceptionQueue(BaseReceptionQueue):
+    """
+    incoming messages, handed to the registered listeners on the thread of the queue
+
+    push only appends to a bounded queue, so the receiving sockets never wait for the listeners:
+    by default a full queue drops its oldest message. the thread drains the queue in batches and
+    sets buffer to a (from_address, message) pair before every update call of the listeners, a
+    listener raising an exception is logged and does not stop the delivery. for normal use call
+    build() then start(), and close() to stop once the queued messages are delivered
+    """
+
+    def __new__(cls, *args, **kwargs):
+        # one instance per connection set, unlike the singleton of the base class
+        return object.__new__(cls)
+
+    def __init__(self, max_size: int = 1024, overflow_policy: OverflowPolicies = OverflowPolicies.DROP_OLDEST,
+                 put_timeout: float = None, max_batch_size: int = 64):
+        """
+        :param max_size: maximum number of messages waiting for the listeners
+        :param overflow_policy: behaviour of push on a full queue
+        :param put_timeout: seconds a BLOCK push waits for a full queue
+        :param max_batch_size: maximum number of messages taken from the queue at a time
+        """
+        BaseReceptionQueue.__init__(self)
+        self._reception_queue = BoundedQueue(max_size, overflow_policy, put_timeout)
+        self.max_batch_size = max_batch_size
+
+    def build(self):
+        self._execution_control_flag = True
+        return self
+
+    def register_listener(self, listener):
+        self.listeners_register = self.listeners_register + [listener]
+
+    def unregister_listener(self, listener):
+        self.listeners_register = [registered for registered in self.listeners_register if registered is not listener]
+
+    def push(self, decoded_message, from_address: str = None) -> bool:
+        return self._reception_queue.put((from_address, decoded_message))
+
+    def close(self):
+        """
+        stops accepting messages and waits for the thread to deliver the queued ones
+        :return: None
+        """
+        self._execution_control_flag = False
+        self._reception_queue.close()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join()
+
+    def run(self) -> None:
+        while True:
+            # waits until messages arrive, an empty batch means the queue is closed and drained
+            batch = self._reception_queue.get_many(self.max_batch_size, None)
+            if not batch:
+                break
+            for self.buffer in batch:
+                self._notify_listeners()
+        self.buffer = None
+
+    def _notify_listeners(self):
+        for registered_listener in self.listeners_register:
+            try:
+                registered_listener.update()
+            except Exception:
+                logging.exception(f"{self.__class__.__name__} | listener {registered_listener!r} failed")
+
+
 class Message:
+    """
+    pickled message container
+
+    unpickling runs arbitrary code from the peer, the game messages are sent with tcp.codec instead
+    """
 
     def __init__(self, pickle_dump = None):
         if pickle_dump is None:
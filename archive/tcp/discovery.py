@@ -0,0 +1,303 @@
+import errno
+import logging
+import selectors
+import socket
+import time
+from enum import Enum
+from typing import Iterable, List, Optional, Tuple
+import tcp.exceptions as exc
+from tcp.cancellation import CancellationToken, Deadline
+
+# connect_ex results of a non-blocking connect still in progress, 10035 is WSAEWOULDBLOCK
+_CONNECT_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN, 10035}
+
+
+class ProbeStates(Enum):
+    """
+    enumeration of the states of a single discovery probe
+    """
+    CONNECTING = 0x01
+    SENDING = 0x02
+    RECEIVING = 0x03
+
+
+class _Probe:
+    """
+    one non-blocking connection to a candidate address
+    """
+    __slots__ = ("address", "conn_socket", "state", "deadline", "pending", "received")
+
+    def __init__(self, address: str, conn_socket: socket.socket, request: bytes, deadline: float):
+        self.address = address
+        self.conn_socket = conn_socket
+        self.state = ProbeStates.CONNECTING
+        self.deadline = deadline
+        # part of the request not sent yet
+        self.pending = memoryview(request)
+        self.received = bytearray()
+
+
+class ProbeScanner:
+    """
+    polls candidate addresses for a peer answering the challenge, all from the calling thread
+
+    every probe connects, sends the request and reads a response of the expected length.
+    at most max_in_flight probes are open at a time, a probe not done within probe_timeout
+    is dropped. scan returns as soon as the first peer answers with the expected response
+    """
+
+    def __init__(self, port: int, request: bytes, response: bytes,
+                 probe_timeout: float = 0.5, max_in_flight: int = 64):
+        """
+        :param port: port the peers listen on
+        :param request: challenge sent by every probe
+        :param response: answer expected from a valid peer
+        :param probe_timeout: seconds a single probe may take
+        :param max_in_flight: maximum number of simultaneously open probes
+        """
+        self.port = port
+        self.request = request
+        self.response = response
+        self.probe_timeout = probe_timeout
+        self.max_in_flight = max_in_flight
+        self.probe_count = 0
+
+    def scan(self, addresses: Iterable[str], timeout: float = None,
+             cancellation_token: CancellationToken = None) -> Optional[str]:
+        """
+        probes the addresses until one answers the challenge
+        :param addresses: ip addresses to be probed, in order
+        :param timeout: seconds the whole scan may take, unlimited by default
+        :param cancellation_token: raises OperationCancelledError and closes the probes when cancelled
+        :return: address of the first valid peer, None if none answered
+        """
+        if cancellation_token is not None:
+            cancellation_token.raise_if_cancelled()
+        candidates = iter(addresses)
+        selector = selectors.DefaultSelector()
+        end = None if timeout is None else time.monotonic() + timeout
+        is_exhausted = False
+        self.probe_count = 0
+        # the wakeup socket of the token is registered without data, every other key is a probe
+        if cancellation_token is not None:
+            selector.register(cancellation_token.wakeup_socket, selectors.EVENT_READ)
+        try:
+            while True:
+                while not is_exhausted and self.__in_flight(selector, cancellation_token) < self.max_in_flight:
+                    address = next(candidates, None)
+                    if address is None:
+                        is_exhausted = True
+                    else:
+                        self.__start_probe(selector, address)
+                if not self.__in_flight(selector, cancellation_token):
+                    return None
+                now = time.monotonic()
+                if end is not None and now >= end:
+                    return None
+                deadline = min(key.data.deadline for key in selector.get_map().values() if key.data is not None)
+                if end is not None:
+                    deadline = min(deadline, end)
+                for key, _ in selector.select(max(deadline - now, 0)):
+                    if key.data is None:
+                        cancellation_token.raise_if_cancelled()
+                    elif self.__advance(selector, key.data):
+                        return key.data.address
+                now = time.monotonic()
+                for key in list(selector.get_map().values()):
+                    if key.data is not None and key.data.deadline <= now:
+                        logging.debug(f"{self.__class__.__name__} | {key.data.address} | timed out")
+                        self.__finish(selector, key.data)
+        finally:
+            for key in list(selector.get_map().values()):
+                if key.data is not None:
+                    self.__finish(selector, key.data)
+            selector.close()
+
+    @staticmethod
+    def __in_flight(selector: selectors.BaseSelector, cancellation_token: Optional[CancellationToken]) -> int:
+        return len(selector.get_map()) - (cancellation_token is not None)
+
+    def __start_probe(self, selector: selectors.BaseSelector, address: str):
+        conn_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        conn_socket.setblocking(False)
+        self.probe_count += 1
+        result = conn_socket.connect_ex((address, self.port))
+        if result != 0 and result not in _CONNECT_IN_PROGRESS:
+            logging.debug(f"{self.__class__.__name__} | {address} | connect failed | {errno.errorcode.get(result)}")
+            conn_socket.close()
+            return
+        probe = _Probe(address, conn_socket, self.request, time.monotonic() + self.probe_timeout)
+        selector.register(conn_socket, selectors.EVENT_WRITE, probe)
+
+    def __advance(self, selector: selectors.BaseSelector, probe: _Probe) -> bool:
+        """
+        runs the state machine of the probe as far as the socket allows
+        :return: True if the peer answered the challenge
+        """
+        try:
+            if probe.state is ProbeStates.CONNECTING:
+                error = probe.conn_socket.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if error != 0:
+                    raise ConnectionRefusedError(error, errno.errorcode.get(error, "connect failed"))
+                probe.state = ProbeStates.SENDING
+            if probe.state is ProbeStates.SENDING:
+                probe.pending = probe.pending[probe.conn_socket.send(probe.pending):]
+                if probe.pending:
+                    return False
+                probe.state = ProbeStates.RECEIVING
+                selector.modify(probe.conn_socket, selectors.EVENT_READ, probe)
+                return False
+            blob = probe.conn_socket.recv(len(self.response) - len(probe.received))
+            if not blob:
+                raise ConnectionAbortedError("connection closed before the response")
+            probe.received += blob
+            if len(probe.received) < len(self.response):
+                return False
+            is_valid = probe.received == self.response
+            logging.debug(f"{self.__class__.__name__} | {probe.address} | response {bytes(probe.received)} | {is_valid}")
+            self.__finish(selector, probe)
+            return is_valid
+        except (BlockingIOError, InterruptedError):
+            return False
+        except OSError as e:
+            logging.debug(f"{self.__class__.__name__} | {probe.address} | {e}")
+            self.__finish(selector, probe)
+            return False
+
+    @staticmethod
+    def __finish(selector: selectors.BaseSelector, probe: _Probe):
+        selector.unregister(probe.conn_socket)
+        probe.conn_socket.close()
+
+
+class DiscoveryModes(Enum):
+    """
+    enumeration of the ways PeerIdentifier can look for peers
+    """
+    TCP_SCAN = 0x01
+    UDP_BROADCAST = 0x02
+    UDP_MULTICAST = 0x03
+
+
+# administratively scoped group the multicast announces are sent to
+MULTICAST_GROUP = "239.255.47.47"
+BROADCAST_ADDRESS = "<broadcast>"
+
+
+def announce(port: int, request: bytes, response: bytes, target_address: str = BROADCAST_ADDRESS,
+             listen_window: float = 1.0, first_only: bool = True, interface_address: str = None,
+             cancellation_token: CancellationToken = None) -> List[str]:
+    """
+    sends the challenge in a single datagram and collects the peers answering it
+    :param port: port the responders listen on
+    :param request: challenge sent to the peers
+    :param response: answer expected from a valid peer
+    :param target_address: broadcast, multicast or unicast address the challenge is sent to
+    :param listen_window: seconds the replies are collected for
+    :param first_only: return as soon as the first valid reply arrives
+    :param interface_address: address of the interface multicast announces are sent from
+    :param cancellation_token: raises OperationCancelledError when cancelled during the window
+    :return: addresses of the peers that answered, in order of arrival
+    """
+    peers = []
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as datagram_socket:
+        datagram_socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        if _is_multicast(target_address):
+            datagram_socket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 1)
+            if interface_address is not None:
+                datagram_socket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF,
+                                           socket.inet_aton(interface_address))
+        datagram_socket.sendto(request, (target_address, port))
+        deadline = Deadline(listen_window)
+        while True:
+            received = _receive_from(datagram_socket, len(response) + 1, deadline, cancellation_token)
+            if received is None:
+                break
+            data, (address, _) = received
+            logging.debug(f"announce | {address} | {data}")
+            if data == response and address not in peers:
+                peers.append(address)
+                if first_only:
+                    break
+    return peers
+
+
+def _receive_from(datagram_socket: socket.socket, size: int, deadline: Deadline,
+                  cancellation_token: Optional[CancellationToken]):
+    """
+    waits for one datagram until the deadline, through the token when one is given
+    :return: (data, address), None once the deadline passed
+    """
+    if deadline.is_expired():
+        return None
+    if cancellation_token is not None:
+        try:
+            cancellation_token.wait_readable(datagram_socket, deadline)
+        except exc.DeadlineExceededError:
+            return None
+    datagram_socket.settimeout(deadline.remaining())
+    try:
+        return datagram_socket.recvfrom(size)
+    except (socket.timeout, BlockingIOError):
+        return None
+
+
+def _is_multicast(address: str) -> bool:
+    try:
+        return 224 <= int(address.split(".", 1)[0]) <= 239
+    except ValueError:
+        return False
+
+
+class DatagramResponder:
+    """
+    answers the datagram challenge of announce, the host side of the udp discovery
+    """
+
+    def __init__(self, port: int, request: bytes, response: bytes, bind_address: str = "",
+                 multicast_group: str = None, interface_address: str = "0.0.0.0"):
+        """
+        :param port: port to listen on, 0 picks a free one
+        :param request: challenge expected from the peers
+        :param response: answer sent to a valid peer
+        :param bind_address: address to listen on, all interfaces by default
+        :param multicast_group: group to join for multicast announces
+        :param interface_address: address of the interface the group is joined on
+        """
+        self.request = request
+        self.response = response
+        self.datagram_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.datagram_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.datagram_socket.bind((bind_address, port))
+        if multicast_group is not None:
+            membership = socket.inet_aton(multicast_group) + socket.inet_aton(interface_address)
+            self.datagram_socket.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        self.port = self.datagram_socket.getsockname()[1]
+
+    def serve(self, listen_window: float, max_peers: int = 1,
+              cancellation_token: CancellationToken = None) -> List[Tuple[str, int]]:
+        """
+        answers valid challenges until max_peers peers are found or the window is over
+        a peer announcing more than once is counted once, with the address of its first announce
+        :param listen_window: seconds to listen for
+        :param max_peers: number of peers after which the responder stops, None for no limit
+        :param cancellation_token: raises OperationCancelledError when cancelled during the window
+        :return: (ip address, port) of the peers that sent a valid challenge, as accept returns them
+        """
+        peers = []
+        deadline = Deadline(listen_window)
+        while max_peers is None or len(peers) < max_peers:
+            received = _receive_from(self.datagram_socket, len(self.request) + 1, deadline, cancellation_token)
+            if received is None:
+                break
+            data, peer_address = received
+            if data != self.request:
+                logging.debug(f"{self.__class__.__name__} | {peer_address} | invalid challenge {data}")
+                continue
+            self.datagram_socket.sendto(self.response, peer_address)
+            if all(peer[0] != peer_address[0] for peer in peers):
+                peers.append(peer_address)
+        return peers
+
+    def close(self):
+        self.datagram_socket.close()
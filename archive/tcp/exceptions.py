@@ -4,4 +4,15 @@ class SocketConnectionError(Exception):
     pass
 
 class AccessingClosedSocketError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class OperationCancelledError(Exception):
+    pass
+
+
+class DeadlineExceededError(TimeoutError):
+    pass
+
+
+class QueueOverflowError(Exception):
+    pass
@@ -0,0 +1,85 @@
+import logging
+import socket
+import struct
+import tcp.exceptions as exc
+
+# payload length sent ahead of every frame, 8 bytes as the handshake of tcp.py
+FRAME_HEADER = struct.Struct("!Q")
+# frames above this size are refused instead of allocating a buffer for them
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+# payloads up to this size are copied behind the header and sent with a single sendall
+# where sendmsg is not available (windows), larger ones are sent without a copy
+SMALL_FRAME_SIZE = 4096
+
+
+def send_frame(conn_socket: socket.socket, payload) -> int:
+    """
+    sends the payload behind its length header without copying it
+    :param conn_socket: connected stream socket
+    :param payload: bytes like object
+    :return: number of bytes sent including the header
+    """
+    payload = memoryview(payload).cast("B")
+    header = FRAME_HEADER.pack(len(payload))
+    if not hasattr(conn_socket, "sendmsg"):
+        if len(payload) <= SMALL_FRAME_SIZE:
+            conn_socket.sendall(header + payload)
+        else:
+            conn_socket.sendall(header)
+            conn_socket.sendall(payload)
+        return len(header) + len(payload)
+    # scatter gather, partial sends continue on views of the remaining bytes
+    buffers = [memoryview(header), payload]
+    while buffers:
+        sent = conn_socket.sendmsg(buffers)
+        if sent == 0:
+            raise exc.SocketConnectionError("abnormal disconnection")
+        while buffers and sent >= len(buffers[0]):
+            sent -= len(buffers[0])
+            buffers.pop(0)
+        if buffers and sent:
+            buffers[0] = buffers[0][sent:]
+    return len(header) + len(payload)
+
+
+class FrameReader:
+    """
+    reads length prefixed frames from a stream socket
+
+    the payload is received with recv_into straight into a buffer owned by the reader, the buffer
+    is allocated once and only grows when a larger frame arrives. read_frame returns a view of the
+    buffer which stays valid until the next read_frame call
+    """
+
+    def __init__(self, conn_socket: socket.socket, initial_capacity: int = 4096, max_frame_size: int = MAX_FRAME_SIZE):
+        self.conn_socket = conn_socket
+        self.max_frame_size = max_frame_size
+        self.buffer = bytearray(max(initial_capacity, FRAME_HEADER.size))
+        self.__view = memoryview(self.buffer)
+
+    def read_frame(self) -> memoryview:
+        """
+        blocks until a whole frame is received
+        after an oversized frame the stream is out of step and the connection has to be dropped
+        :return: memoryview of the payload, copy it with bytes() to keep it beyond the next read
+        """
+        self.__receive_exactly(self.__view[:FRAME_HEADER.size])
+        (frame_size,) = FRAME_HEADER.unpack_from(self.buffer)
+        if frame_size > self.max_frame_size:
+            raise ValueError(f"frame of {frame_size} bytes exceeds the limit of {self.max_frame_size}")
+        if frame_size > len(self.buffer):
+            self.buffer = bytearray(max(frame_size, 2 * len(self.buffer)))
+            self.__view = memoryview(self.buffer)
+            logging.debug(f"{self.__class__.__name__} | buffer grown to {len(self.buffer)}")
+        payload = self.__view[:frame_size]
+        self.__receive_exactly(payload)
+        return payload
+
+    def __receive_exactly(self, view: memoryview):
+        received = 0
+        size = len(view)
+        while received < size:
+            count = self.conn_socket.recv_into(view[received:], size - received)
+            if count == 0:
+                raise exc.SocketConnectionError("Abnormal Disconnection")
+            received += count
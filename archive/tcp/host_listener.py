@@ -1,16 +1,25 @@
+import logging
+import selectors
 import socket
 import tcp.exceptions as exc
 import tcp.sysenvcons as sysenvcons
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+# pending connections the kernel keeps for the listening socket, sized for the joins at match start
+ACCEPT_BACKLOG = 128
 
 
 class BaseHostListenerSocket:
 
-    def __init__(self, host_socket: socket.socket = None, max_connection: int = 5):
+    def __init__(self, host_socket: socket.socket = None, max_connection: int = 5,
+                 host_address: str = None, port: int = None, backlog: int = ACCEPT_BACKLOG):
         self.host_socket = host_socket
         self.max_connection = max_connection
-        self.port = sysenvcons.BasicTCPConstructs.port
-        self.host_address = sysenvcons.BasicTCPConstructs.host
+        self.port = sysenvcons.BasicTCPConstructs.port if port is None else port
+        self.host_address = sysenvcons.BasicTCPConstructs.host if host_address is None else host_address
+        self.backlog = backlog
         self.is_bound = False
 
     def bind_and_listen(self) -> int:
@@ -24,10 +33,10 @@ class BaseHostListenerSocket:
         """
         raise NotImplemented
 
-    def accept(self) -> (socket.socket, str):
+    def accept(self) -> (socket.socket, Tuple[str, int]):
         """
         accept the incoming request and return the socket object and remote address
-        :return: socket connection, remote address
+        :return: socket connection, remote (address, port)
         """
         raise NotImplemented
 
@@ -44,22 +53,33 @@ class BaseHostListenerSocket:
 class BasicHostListenerSocket(BaseHostListenerSocket):
     """
     Simple implementation of Host Listner
+
+    the listening socket is non-blocking, accept raises BlockingIOError when no connection is pending.
+    max_connection is the number of connections served at a time, see BasicHostDispatcher
     """
 
-    def __init__(self, host_socket: socket.socket = None, max_connection: int = 5):
-        BaseHostListenerSocket.__init__(self, host_socket, max_connection)
+    def __init__(self, host_socket: socket.socket = None, max_connection: int = 5,
+                 host_address: str = None, port: int = None, backlog: int = ACCEPT_BACKLOG):
+        BaseHostListenerSocket.__init__(self, host_socket, max_connection, host_address, port, backlog)
 
     def bind_and_listen(self) -> int:
-        self.host_socket.bind((socket.gethostname(), self.port))
-        self.host_socket.listen(self.max_connection)
+        if self.host_socket is None:
+            self.host_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.host_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.host_socket.bind((self.host_address, self.port))
+        self.host_socket.listen(self.backlog)
+        self.host_socket.setblocking(False)
+        # port 0 binds to a free port
+        self.port = self.host_socket.getsockname()[1]
         self.is_bound = True
         return 0
 
-    def accept(self) -> (socket.socket, str):
+    def accept(self) -> (socket.socket, Tuple[str, int]):
         if not self.is_bound:
             raise exc.AccessingClosedSocketError("Accessing non-open socket")
         conn, address = self.host_socket.accept()
-        assert isinstance(address, str)
+        # accepted sockets do not inherit the non-blocking mode on every platform
+        conn.setblocking(True)
         return conn, address
 
     def kill_socket(self) -> int:
@@ -68,6 +88,93 @@ class BasicHostListenerSocket(BaseHostListenerSocket):
         return 0
 
 
+class HostDispatcherMetrics:
+    """
+    counters of a BasicHostDispatcher, updated by the accepting thread and the workers
+
+    queued connections are accepted but wait for a free worker, busy ones are being handled.
+    the accept burst is the number of connections taken off the backlog in one wakeup
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self.accepted_count = 0
+        self.refused_count = 0
+        self.completed_count = 0
+        self.failed_count = 0
+        self.dropped_count = 0
+        self.queued_count = 0
+        self.busy_count = 0
+        self.peak_queued_count = 0
+        self.peak_busy_count = 0
+        self.last_accept_burst = 0
+        self.peak_accept_burst = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def active_count(self) -> int:
+        return self.queued_count + self.busy_count
+
+    @property
+    def saturation(self) -> float:
+        """
+        :return: share of the workers handling a connection, 1.0 when all are busy
+        """
+        return self.busy_count / self.max_workers
+
+    def record_burst(self, accepted: int, refused: int):
+        with self.__lock:
+            self.accepted_count += accepted
+            self.refused_count += refused
+            self.last_accept_burst = accepted + refused
+            self.peak_accept_burst = max(self.peak_accept_burst, self.last_accept_burst)
+
+    def record_queued(self):
+        with self.__lock:
+            self.queued_count += 1
+            self.peak_queued_count = max(self.peak_queued_count, self.queued_count)
+
+    def record_started(self):
+        with self.__lock:
+            self.queued_count -= 1
+            self.busy_count += 1
+            self.peak_busy_count = max(self.peak_busy_count, self.busy_count)
+
+    def record_dropped(self):
+        with self.__lock:
+            self.queued_count -= 1
+            self.dropped_count += 1
+
+    def record_finished(self, is_failed: bool):
+        with self.__lock:
+            self.busy_count -= 1
+            if is_failed:
+                self.failed_count += 1
+            else:
+                self.completed_count += 1
+
+    def snapshot(self) -> dict:
+        with self.__lock:
+            return {
+                "accepted": self.accepted_count,
+                "refused": self.refused_count,
+                "completed": self.completed_count,
+                "failed": self.failed_count,
+                "dropped": self.dropped_count,
+                "queued": self.queued_count,
+                "busy": self.busy_count,
+                "peak_queued": self.peak_queued_count,
+                "peak_busy": self.peak_busy_count,
+                "last_accept_burst": self.last_accept_burst,
+                "peak_accept_burst": self.peak_accept_burst,
+                "saturation": self.busy_count / self.max_workers,
+            }
+
+
+# called by a worker with every accepted connection, the dispatcher closes the socket afterwards
+ConnectionHandler = Callable[[socket.socket, Tuple[str, int]], None]
+
+
 class BaseHostDispatcher(threading.Thread):
 
     def __init__(self):
@@ -93,27 +200,111 @@ class BaseHostDispatcher(threading.Thread):
 
 
 class BasicHostDispatcher(BaseHostDispatcher):
+    """
+    accepts connections on the non-blocking socket of the host listener and hands each one to
+    the handler on a pool of max_workers threads
 
-    def __init__(self):
+    every wakeup drains the backlog, so a burst of joins is taken in one go. at most
+    host_listener.max_connection connections are queued or handled at a time, the ones beyond
+    are closed right after the accept. for normal use call build() then start(), and close()
+    to stop: accepting ends at once, handlers already running finish, queued connections are
+    closed without being handled
+    """
+
+    def __init__(self, handler: ConnectionHandler = None, host_listener: BaseHostListenerSocket = None,
+                 max_workers: int = 4):
+        """
+        :param handler: called with the connection socket and the remote address
+        :param host_listener: listener socket, a BasicHostListenerSocket on the default address if None
+        :param max_workers: number of threads handling connections
+        """
         BaseHostDispatcher.__init__(self)
+        self.handler = handler
+        self.host_listener = BasicHostListenerSocket() if host_listener is None else host_listener
+        self.max_workers = max_workers
+        self.metrics = HostDispatcherMetrics(max_workers)
+        self.__executor: Optional[ThreadPoolExecutor] = None
+        self.__selector: Optional[selectors.BaseSelector] = None
+        # written to by close to wake the selector up
+        self.__wakeup_receiver, self.__wakeup_sender = socket.socketpair()
 
     def build(self):
         if not self.host_listener.is_bound:
             self.host_listener.bind_and_listen()
+        self.__executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="host-dispatcher")
+        self.__selector = selectors.DefaultSelector()
+        self.__selector.register(self.host_listener.host_socket, selectors.EVENT_READ)
+        self.__selector.register(self.__wakeup_receiver, selectors.EVENT_READ)
+        self.execution_control_flag_is_set = True
         return self
 
-    def close(self):
+    def close(self, wait: bool = True):
+        """
+        stops accepting and shuts the workers down
+        :param wait: block until the running handlers are done
+        :return: None
+        """
+        self.execution_control_flag_is_set = False
+        try:
+            self.__wakeup_sender.send(b"\x00")
+        except OSError:
+            pass
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join()
         if self.host_listener.is_bound:
             self.host_listener.kill_socket()
-        else:
-            self.execution_control_flag_is_set = False
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=wait, cancel_futures=True)
+        if self.__selector is not None:
+            self.__selector.close()
+        self.__wakeup_receiver.close()
+        self.__wakeup_sender.close()
 
     def _listening_process(self):
-        self.execution_control_flag = True
+        for key, _ in self.__selector.select():
+            if key.fileobj is self.__wakeup_receiver:
+                return
+            self.__accept_pending()
+
+    def __accept_pending(self):
+        accepted = refused = 0
         while self.execution_control_flag_is_set:
-            conn_socket, address = self.host_listener.accept()
-        # TODO: finish the code
+            try:
+                conn_socket, address = self.host_listener.accept()
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                # e.g. the peer reset the connection before it was accepted
+                logging.debug(f"{self.__class__.__name__} | accept failed | {e}")
+                break
+            if self.metrics.active_count >= self.host_listener.max_connection:
+                logging.debug(f"{self.__class__.__name__} | {address} refused, host is full")
+                conn_socket.close()
+                refused += 1
+                continue
+            accepted += 1
+            self.metrics.record_queued()
+            future = self.__executor.submit(self.__handle, conn_socket, address)
+            future.add_done_callback(lambda f, s=conn_socket: self.__on_cancelled(f, s))
+        self.metrics.record_burst(accepted, refused)
+
+    def __handle(self, conn_socket: socket.socket, address: Tuple[str, int]):
+        self.metrics.record_started()
+        is_failed = False
+        try:
+            with conn_socket:
+                self.handler(conn_socket, address)
+        except Exception as e:
+            is_failed = True
+            logging.debug(f"{self.__class__.__name__} | {address} | handler failed | {e!r}")
+        finally:
+            self.metrics.record_finished(is_failed)
+
+    def __on_cancelled(self, future, conn_socket: socket.socket):
+        if future.cancelled():
+            conn_socket.close()
+            self.metrics.record_dropped()
 
     def run(self) -> None:
         while self.execution_control_flag_is_set:
-            self._listening_process()
\ No newline at end of file
+            self._listening_process()
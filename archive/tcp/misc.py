@@ -1,62 +1,45 @@
-import ctypes
-import inspect
 import threading
+import tcp.exceptions as exc
+from tcp.cancellation import CancellationToken
 
 
-def _async_raise(tid, exctype):
-    # Raises an exception in the threads with id tid
-    if not inspect.isclass(exctype):
-        raise TypeError("Only types can be raised (not instances)")
-    res = ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_long(tid),
-                                                     ctypes.py_object(exctype))
-    if res == 0:
-        raise ValueError("invalid thread id")
-    elif res != 1:
-        # "if it returns a number greater than one, you're in trouble,
-        # and you should call it again with exc=NULL to revert the effect"
-        ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_long(tid), None)
-        raise SystemError("PyThreadState_SetAsyncExc failed")
-
-
-class ThreadWithExc(threading.Thread):
+class CancellableThread(threading.Thread):
     """
-    A thread class that supports raising exception in the thread from
-       another thread.
-    """
-    def __get_my_tid(self):
-        """
-        determines this (self's) thread id
-        """
-        if not self.isAlive():
-            raise threading.ThreadError("the thread is not active")
-
-        # do we have it cached?
-        if hasattr(self, "_thread_id"):
-            return self._thread_id
-
-        raise AssertionError("could not determine the thread's id")
+    A thread class that can be stopped from another thread.
 
-    def raiseExc(self, exctype):
-        """Raises the given exception type in the context of this thread.
-
-        If the thread is busy in a system call (time.sleep(),
-        socket.accept(), ...), the exception is simply ignored.
-
-        If you are sure that your exception should terminate the thread,
-        one way to ensure that it works is:
-
-            t = ThreadWithExc( ... )
-            ...
-            t.raiseExc( SomeException )
-            while t.isAlive():
-                time.sleep( 0.1 )
-                t.raiseExc( SomeException )
-
-        If the exception is to be caught by the thread, you need a way to
-        check that your thread has caught it.
+    the target is called with the cancellation token of the thread as its first argument and is
+    expected to block only through the token (wait_readable, wait_writable, sleep), so stop()
+    returns within milliseconds even while the thread waits on a socket.
+    """
 
-        CAREFUL : this function is executed in the context of the
-        caller thread, to raise an excpetion in the context of the
-        thread represented by this instance.
+    def __init__(self, target: callable = None, args: tuple = (), kwargs: dict = None, name: str = None,
+                 daemon: bool = None, cancellation_token: CancellationToken = None):
+        threading.Thread.__init__(self, name=name, daemon=daemon)
+        self.target = target
+        self.args = args
+        self.kwargs = {} if kwargs is None else kwargs
+        # a token created here is released with the thread, a given one stays with the caller
+        self.__is_token_owned = cancellation_token is None
+        self.cancellation_token = CancellationToken() if cancellation_token is None else cancellation_token
+
+    def run(self) -> None:
+        try:
+            if self.target is not None:
+                self.target(self.cancellation_token, *self.args, **self.kwargs)
+        except exc.OperationCancelledError:
+            # the regular way for the target to end after stop()
+            pass
+        finally:
+            if self.__is_token_owned:
+                self.cancellation_token.close()
+
+    def stop(self, timeout: float = None) -> bool:
+        """
+        cancels the token of the thread and waits for it to end
+        :param timeout: seconds to wait for the thread, None waits until it ends
+        :return: True if the thread has ended
         """
-        _async_raise( self._get_my_tid(), exctype )
\ No newline at end of file
+        self.cancellation_token.cancel("thread stopped")
+        if self.is_alive():
+            self.join(timeout)
+        return not self.is_alive()
@@ -2,10 +2,19 @@
 import logging
 import socket
 import threading
-import time
+import tcp.exceptions as exc
+from tcp.cancellation import CancellationToken, Deadline
+from tcp.discovery import (BROADCAST_ADDRESS, MULTICAST_GROUP, DatagramResponder, DiscoveryModes, ProbeScanner,
+                           announce)
 
+# seconds the server waits for a client, a request being processed when it passes is completed first
 SERVER_POLLING_WAITING_DURATION = 30
-SERVER_POLLING_WAITING_DURATION_SHORT = 5
+# seconds a single discovery probe may take
+PROBE_TIMEOUT = 0.5
+# maximum number of discovery probes open at a time
+MAX_IN_FLIGHT_PROBES = 64
+# seconds the udp discovery modes wait for answers
+UDP_LISTEN_WINDOW = 2.0
 
 
 class PeerIdentifier:
@@ -14,6 +23,12 @@ class PeerIdentifier:
 
     for normal use intialize the object with is_server argument
     then call get_peer_connections(self). address of the peer shall be returned
+
+    with DiscoveryModes.TCP_SCAN the client probes every address of its /24 network,
+    with the udp modes it sends a single broadcast or multicast datagram instead and the
+    server answers it, both sides wait at most listen_window seconds
+
+    cancel() stops a get_peer_connections call running in another thread within milliseconds
     """
     APPLICATION_PORT = 12121
     HOST_ADDRESS = socket.gethostbyname(socket.gethostname()).split("/")[0]
@@ -25,13 +40,26 @@ class PeerIdentifier:
     def __init__(self, id_key: str = "0x123456",
                  is_server: bool = True,
                  port=APPLICATION_PORT,
-                 host_address=HOST_ADDRESS):
+                 host_address=HOST_ADDRESS,
+                 discovery_mode: DiscoveryModes = DiscoveryModes.TCP_SCAN,
+                 listen_window: float = UDP_LISTEN_WINDOW,
+                 udp_target_address: str = None,
+                 cancellation_token: CancellationToken = None):
 
         PeerIdentifier.POLLING_REQUEST_STRING = id_key
         PeerIdentifier.POLLING_RESPONSE_STRING = self.__calculate_response(id_key)
         PeerIdentifier.APPLICATION_PORT = port
         PeerIdentifier.HOST_ADDRESS = host_address
         self.is_server = is_server
+        self.discovery_mode = discovery_mode
+        self.listen_window = listen_window
+        # address the udp announce is sent to, derived from the discovery mode by default
+        if udp_target_address is None:
+            udp_target_address = MULTICAST_GROUP if discovery_mode is DiscoveryModes.UDP_MULTICAST else BROADCAST_ADDRESS
+        self.udp_target_address = udp_target_address
+        # a token created here is released after every get_peer_connections call
+        self.__is_token_owned = cancellation_token is None
+        self.cancellation_token = CancellationToken() if cancellation_token is None else cancellation_token
         # variable to maintain the list of all peers identified by the server
         self.registered_peer_list = []
         # variable to keep count of sub threads started
@@ -79,10 +107,21 @@ class PeerIdentifier:
 
         :return: ip address list
         """
-        if self.is_server:
-            return self.__get_client_details()
-        else:
-            return self.__get_server_details()
+        try:
+            if self.is_server:
+                return self.__get_client_details()
+            else:
+                return self.__get_server_details()
+        finally:
+            if self.__is_token_owned:
+                self.cancellation_token.close()
+
+    def cancel(self):
+        """
+        stops the polling threads, get_peer_connections returns what was found so far
+        :return: None
+        """
+        self.cancellation_token.cancel("peer identification cancelled")
 
     def push_peer_details(self, ip_address: tuple):
         """
@@ -98,9 +137,12 @@ class PeerIdentifier:
         Function triggering the server side routine to identify the clients
         :return: client list
         """
+        if self.discovery_mode is not DiscoveryModes.TCP_SCAN:
+            return self.__answer_announces()
         server_thread = PeerPollingReceptor(port=PeerIdentifier.APPLICATION_PORT,
                                             max_conc_conn_count=PeerIdentifier.MAX_CONCURRENT_CONNECTIONS,
-                                            controller=self)
+                                            controller=self,
+                                            cancellation_token=self.cancellation_token)
         server_thread.start()
         server_thread.join()
         logging.debug(f"{self.__class__.__name__} | __get_client_details | completed | {self.registered_peer_list}")
@@ -111,26 +153,69 @@ class PeerIdentifier:
         Function triggering the client side routine to identify the server in the network if any
         :return: server ip address
         """
+        if self.discovery_mode is not DiscoveryModes.TCP_SCAN:
+            try:
+                servers = announce(PeerIdentifier.APPLICATION_PORT, PeerIdentifier.POLLING_REQUEST_STRING.encode(),
+                                   PeerIdentifier.POLLING_RESPONSE_STRING.encode(), self.udp_target_address,
+                                   self.listen_window, cancellation_token=self.cancellation_token)
+            except exc.OperationCancelledError as e:
+                logging.debug(f"{self.__class__.__name__} | __get_server_details | {e}")
+                return None
+            logging.debug(f"{self.__class__.__name__} | __get_server_details | {servers}")
+            return servers[0] if servers else None
         client_thread = PeerPollingClient(port=PeerIdentifier.APPLICATION_PORT,
                                           max_conc_conn_count=PeerIdentifier.MAX_CONCURRENT_CONNECTIONS,
-                                          controller=self)
+                                          controller=self,
+                                          cancellation_token=self.cancellation_token)
         client_thread.start()
         client_thread.join()
         server_address = client_thread.server_ip_address
         logging.debug(f"{self.__class__.__name__} | __get_server_details | {server_address}")
         return server_address
 
+    def __answer_announces(self):
+        """
+        server side of the udp discovery modes, answers the first valid announce
+        :return: client list
+        """
+        multicast_group = MULTICAST_GROUP if self.discovery_mode is DiscoveryModes.UDP_MULTICAST else None
+        responder = DatagramResponder(PeerIdentifier.APPLICATION_PORT, PeerIdentifier.POLLING_REQUEST_STRING.encode(),
+                                      PeerIdentifier.POLLING_RESPONSE_STRING.encode(), multicast_group=multicast_group)
+        try:
+            for address in responder.serve(self.listen_window, cancellation_token=self.cancellation_token):
+                self.push_peer_details(address)
+        except exc.OperationCancelledError as e:
+            logging.debug(f"{self.__class__.__name__} | __answer_announces | {e}")
+        finally:
+            responder.close()
+        logging.debug(f"{self.__class__.__name__} | __answer_announces | completed | {self.registered_peer_list}")
+        return self.registered_peer_list
+
 
 class PeerPollingReceptor(threading.Thread):
     """
     Class for server side application to listen for Client polls
+
+    the thread only blocks through the cancellation token, it ends within milliseconds of a
+    cancel and once the waiting duration has passed
     """
 
-    def __init__(self, port, max_conc_conn_count, controller: PeerIdentifier):
+    def __init__(self, port, max_conc_conn_count, controller: PeerIdentifier,
+                 cancellation_token: CancellationToken = None,
+                 waiting_duration: float = SERVER_POLLING_WAITING_DURATION,
+                 host_address: str = None):
         threading.Thread.__init__(self)
         # prepare socket for listening
         self.polling_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.polling_socket.bind((socket.gethostname(), port))
+        self.polling_socket.bind((socket.gethostname() if host_address is None else host_address, port))
+        self.polling_socket.setblocking(False)
+        self.port = self.polling_socket.getsockname()[1]
+        # listen right away, so polls arriving before the thread runs are queued
+        self.polling_socket.listen(max_conc_conn_count)
+        # cancels the listening, the thread also stops once the waiting duration passed
+        self.__is_token_owned = cancellation_token is None
+        self.cancellation_token = CancellationToken() if cancellation_token is None else cancellation_token
+        self.waiting_duration = waiting_duration
         # flag for tracking if a client has been identified
         self.is_client_identified = False
         # flag for tracking if a connection request has been accepted
@@ -144,50 +229,69 @@ class PeerPollingReceptor(threading.Thread):
         logging.debug(f"{self.__class__.__name__} | created")
 
     def run(self) -> None:
-        # start listening
-        self.polling_socket.listen(self.max_concurrent_conn_count)
-        # start the timer thread to stop the thread after significant time
-        threading.Thread(target=monitor_and_close, args=(self.polling_socket, self)).start()
+        deadline = Deadline(self.waiting_duration)
         logging.debug(f"{self.__class__.__name__} | run | listening started")
 
         try:
             # need to loop until a client is identified
             while not self.is_client_identified:
-                conn, address, key_message = self.__accept_and_read_message()
-                logging.debug(f"{self.__class__.__name__} | run | message received | {address}:{key_message}")
-                # check if a valid key is received if yes process else restart
-                if self.__validate_key(key_message):
-                    logging.debug(f"{self.__class__.__name__} | run | {address} key message validated")
-                    self.client_address = address
-                    self.is_client_identified = True
-                    # send the calculated response
-                    length = conn.send(PeerIdentifier.POLLING_RESPONSE_STRING.encode())
-                    logging.debug(f"{self.__class__.__name__} | {length} bytes sent as response")
-                else:
-                    # since the connection does not give the expected key, restart the process
-                    self.is_processing_request = False
+                accepted = self.__accept_and_read_message(deadline)
+                if accepted is None:
+                    continue
+                conn, address, key_message = accepted
+                with conn:
+                    logging.debug(f"{self.__class__.__name__} | run | message received | {address}:{key_message}")
+                    # check if a valid key is received if yes process else restart
+                    if self.__validate_key(key_message):
+                        logging.debug(f"{self.__class__.__name__} | run | {address} key message validated")
+                        self.client_address = address
+                        self.is_client_identified = True
+                        # send the calculated response
+                        length = conn.send(PeerIdentifier.POLLING_RESPONSE_STRING.encode())
+                        logging.debug(f"{self.__class__.__name__} | {length} bytes sent as response")
+                    else:
+                        # since the connection does not give the expected key, restart the process
+                        self.is_processing_request = False
             # loop exited since client established. push it
             self.controller.push_peer_details(self.client_address)
 
-        except WindowsError as e:
-            logging.debug(f"{self.__class__.__name__} | {e}")
+        except exc.DeadlineExceededError:
+            logging.debug(f"{self.__class__.__name__} | run | timed out")
+        except exc.OperationCancelledError as e:
+            logging.debug(f"{self.__class__.__name__} | run | {e}")
         except Exception as e:
             logging.debug(f"{self.__class__.__name__} | {e}")
 
         finally:
             self.polling_socket.close()
+            if self.__is_token_owned:
+                self.cancellation_token.close()
 
-    def __accept_and_read_message(self):
+    def __accept_and_read_message(self, deadline: Deadline):
         """
         internal function for accepting the connection and processing data
-        :return: socket, ip_addr, message received
+        :param deadline: time after which no further connection is accepted
+        :return: socket, ip_addr, message received or None if the connection went away before the accept
         """
-        # accept the connection request
-        conn, address = self.polling_socket.accept()
+        # wait for a connection request, raises when cancelled or past the deadline
+        self.cancellation_token.wait_readable(self.polling_socket, deadline)
+        try:
+            conn, address = self.polling_socket.accept()
+        except (BlockingIOError, InterruptedError, ConnectionAbortedError):
+            return None
+        conn.setblocking(True)
         # set the flag indicating the process has started
         self.is_processing_request = True
-        # read the message from the connection
-        key_message = conn.recv(PeerIdentifier.POLLING_STRING_LENGTH).decode()
+        # read the message from the connection, a request being processed is completed past the deadline
+        try:
+            self.cancellation_token.wait_readable(conn, Deadline(PROBE_TIMEOUT))
+            key_message = conn.recv(PeerIdentifier.POLLING_STRING_LENGTH).decode(errors="replace")
+        except (exc.DeadlineExceededError, ConnectionError):
+            key_message = ""
+        except BaseException:
+            # cancelled, the connection is not handed to the caller
+            conn.close()
+            raise
 
         logging.debug(f"{self.__class__.__name__} | __accept_and_read_message | {address} | {key_message}")
 
@@ -204,29 +308,13 @@ class PeerPollingReceptor(threading.Thread):
         return result
 
 
-def monitor_and_close(polling_socket, controller: PeerPollingReceptor):
-    """
-    function to terminate the thread when the timer expires
-    :param polling_socket: socket object to be timed
-    :param controller: Controlled which give process status
-    :return: None
-    """
-    # Initially sleep for default time
-    time.sleep(SERVER_POLLING_WAITING_DURATION)
-    # then wait for another intermediate time until a current process, if any, is completed
-    while not controller.is_processing_request:
-        time.sleep(SERVER_POLLING_WAITING_DURATION_SHORT)
-    # when no connection is currently being processed, close the socket
-    polling_socket.close()
-    logging.debug(f" monitor_and_close | timed out")
-
-
 class PeerPollingClient(threading.Thread):
     """
     thread class to be used by the client side application to poll for the servers
     """
 
-    def __init__(self, port, max_conc_conn_count, controller: PeerIdentifier):
+    def __init__(self, port, max_conc_conn_count, controller: PeerIdentifier,
+                 cancellation_token: CancellationToken = None):
         threading.Thread.__init__(self)
         # port to which to connect
         self.application_port = port
@@ -242,24 +330,41 @@ class PeerPollingClient(threading.Thread):
         self.controller = controller
         # avctive thread counter
         self.counter = 0
+        # guards the counter and the server details against concurrent poll calls
+        self.__lock = threading.Lock()
+        # cancels the scan, its probes are closed right away
+        self.__is_token_owned = cancellation_token is None
+        self.cancellation_token = CancellationToken() if cancellation_token is None else cancellation_token
         logging.debug(f"{self.__class__.__name__} | created")
 
     def run(self) -> None:
-        # send key to each possible ip address in the network
-        for index in range(2, 255):
-            ip_addr = self.__calculate_ip_addr(index)
-            # start a new thread to handle a separate ip address
-            thread = threading.Thread(target=self.poll, args=(ip_addr, str(index)))
-            thread.start()
-            logging.debug(f"{self.__class__.__name__} | run | {ip_addr} | polling thread started")
-
-        # wait until all the threads unregister from the counter
-        while self.counter > 0:
-            time.sleep(0.2)
-            # logging.debug(f"{self.__class__.__name__} | run | waiting for polling threads to complete")
+        # probe every possible ip address in the network at once from this thread,
+        # the scan ends with the first valid response
+        scanner = ProbeScanner(self.application_port,
+                               PeerIdentifier.POLLING_REQUEST_STRING.encode(),
+                               PeerIdentifier.POLLING_RESPONSE_STRING.encode(),
+                               probe_timeout=PROBE_TIMEOUT, max_in_flight=MAX_IN_FLIGHT_PROBES)
+        try:
+            server_address = scanner.scan((self.__calculate_ip_addr(index) for index in range(2, 255)),
+                                          cancellation_token=self.cancellation_token)
+        except exc.OperationCancelledError as e:
+            logging.debug(f"{self.__class__.__name__} | run | {e}")
+            return
+        finally:
+            if self.__is_token_owned:
+                self.cancellation_token.close()
+        logging.debug(f"{self.__class__.__name__} | run | {scanner.probe_count} probes | {server_address}")
+        if server_address is not None:
+            self.__update_server_details(server_address)
 
     def poll(self, ip_addr, id_num):
-        lock = threading.Lock()
+        """
+        blocking poll of a single address
+        :param ip_addr: address to be polled
+        :param id_num: label of the poll in the log
+        :return: None
+        """
+        lock = self.__lock
         flag = False
 
         logging.debug(f"{self.__class__.__name__} | poll | {id_num} | {ip_addr} | started")
@@ -272,6 +377,7 @@ class PeerPollingClient(threading.Thread):
         try:
             # prepare and connect the socket
             socket_conn = socket.socket()
+            socket_conn.settimeout(PROBE_TIMEOUT)
             socket_conn.connect((ip_addr, self.application_port))
             logging.debug(f"{self.__class__.__name__} | poll | {id_num} |  {ip_addr} | connection established")
 
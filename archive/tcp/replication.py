@@ -0,0 +1,183 @@
+import logging
+import struct
+import zlib
+from typing import Callable, Tuple
+import components.listeners
+from components.board import Board
+from tcp.codec import (CLEARED_INDEX, BoardSnapshotMessage, CellDeltaMessage, CodecError, decode, encode)
+
+_STATE = struct.Struct("!HH")
+_EMPTY_VALUE = 0x03
+# the delta index and the 16 bit masks of the codec hold exactly the 9 cells of a 3x3 board
+_CELL_COUNT = 9
+_FULL_MASK = 0x1FF
+
+
+def _check_dimensions(m: int, n: int):
+    if (m, n) != (3, 3):
+        raise ValueError(f"replication supports 3x3 boards only, got {m}x{n}")
+
+
+def state_checksum(x_mask: int, o_mask: int) -> int:
+    """
+    crc32 of the coin masks, sent with every snapshot and in 16 bits with every delta
+    :param x_mask: 9 bit mask of the X coins
+    :param o_mask: 9 bit mask of the O coins
+    :return: unsigned 32 bit checksum
+    """
+    return zlib.crc32(_STATE.pack(x_mask, o_mask))
+
+
+def _apply_delta(x_mask: int, o_mask: int, index: int, coin_value: int) -> Tuple[int, int]:
+    if index == CLEARED_INDEX:
+        return 0, 0
+    bit = 1 << index
+    x_mask &= ~bit
+    o_mask &= ~bit
+    if coin_value == 0x01:
+        x_mask |= bit
+    elif coin_value == 0x02:
+        o_mask |= bit
+    return x_mask, o_mask
+
+
+class ReplicationSource(components.listeners.CellUpdateListenerInterface):
+    """
+    host side of the board replication
+
+    registered on the cell listener of a 3x3 board, every set_cell becomes a CellDeltaMessage
+    of 14 bytes. every snapshot_interval deltas a BoardSnapshotMessage is sent as well, so
+    replicas which missed a delta catch up without asking. nothing touches the disk.
+    """
+
+    def __init__(self, board: Board, game_id: int, send: Callable[[bytes], None], snapshot_interval: int = 32):
+        """
+        :param board: board to be replicated, its cell_listener is subscribed to
+        :param game_id: id of the game sent with every message
+        :param send: called with every encoded message, e.g. a framing or transport send
+        :param snapshot_interval: number of deltas between two snapshots, 0 sends no periodic snapshots
+        """
+        _check_dimensions(getattr(board, "m", 3), getattr(board, "n", 3))
+        components.listeners.CellUpdateListenerInterface.__init__(self)
+        self.board = board
+        self.game_id = game_id
+        self.send = send
+        self.snapshot_interval = snapshot_interval
+        self.sequence = 0
+        # the masks follow the events, not the board, so deltas and snapshots always agree
+        self.x_mask, self.o_mask = board.get_coin_masks()
+        board.cell_listener.register_listener(self)
+
+    def close(self):
+        self.board.cell_listener.unregister_listener(self)
+
+    def on_cell_updated(self, listener):
+        x, y, coin = listener
+        index = CLEARED_INDEX if x < 0 else x * 3 + y
+        self.x_mask, self.o_mask = _apply_delta(self.x_mask, self.o_mask, index, coin.value)
+        self.sequence += 1
+        checksum = state_checksum(self.x_mask, self.o_mask) & 0xFFFF
+        self.send(encode(CellDeltaMessage(self.game_id, self.sequence, index, coin.value, checksum)))
+        if self.snapshot_interval and self.sequence % self.snapshot_interval == 0:
+            self.send_snapshot()
+
+    def send_snapshot(self):
+        """
+        sends the full state, e.g. when a replica joins or reports that it is out of sync
+        :return: None
+        """
+        self.send(encode(BoardSnapshotMessage(self.game_id, self.sequence, self.x_mask, self.o_mask,
+                                              state_checksum(self.x_mask, self.o_mask))))
+
+
+class BoardReplica:
+    """
+    client side of the board replication
+
+    deltas are applied when their sequence number follows the last applied one and the checksum
+    of the resulting state matches. on a gap or a mismatch the replica waits for the next snapshot
+    and is_synchronized is False until then
+    """
+
+    def __init__(self, game_id: int, m: int = 3, n: int = 3):
+        """
+        :param game_id: id of the replicated game
+        :param m: number of rows of the replicated board, only 3 is supported
+        :param n: number of columns of the replicated board, only 3 is supported
+        """
+        _check_dimensions(m, n)
+        self.game_id = game_id
+        self.sequence = 0
+        self.x_mask = 0
+        self.o_mask = 0
+        self.is_synchronized = False
+        self.applied_count = 0
+        self.rejected_count = 0
+
+    def apply(self, data) -> bool:
+        """
+        applies one encoded CellDeltaMessage or BoardSnapshotMessage
+        :param data: bytes like object
+        :return: True if the state changed
+        """
+        message = decode(data)
+        if message.game_id != self.game_id:
+            raise CodecError(f"message of game {message.game_id} sent to the replica of game {self.game_id}")
+        if isinstance(message, BoardSnapshotMessage):
+            return self.__apply_snapshot(message)
+        if isinstance(message, CellDeltaMessage):
+            return self.__apply_delta(message)
+        raise CodecError(f"{type(message).__name__} is not a replication message")
+
+    def get_coin_masks(self) -> Tuple[int, int]:
+        return self.x_mask, self.o_mask
+
+    def get_cell_value(self, x, y) -> int:
+        """
+        :return: Coin value of the cell, 1 X, 2 O, 3 empty
+        """
+        bit = 1 << (x * 3 + y)
+        if self.x_mask & bit:
+            return 0x01
+        if self.o_mask & bit:
+            return 0x02
+        return _EMPTY_VALUE
+
+    def __apply_snapshot(self, message: BoardSnapshotMessage) -> bool:
+        if (message.x_mask | message.o_mask) & ~_FULL_MASK:
+            raise CodecError(f"snapshot {message.sequence} is not the state of a 3x3 board")
+        if message.checksum != state_checksum(message.x_mask, message.o_mask):
+            self.__reject(f"snapshot {message.sequence} has an invalid checksum")
+            return False
+        if self.is_synchronized and message.sequence <= self.sequence:
+            # stale or already covered by the deltas
+            return False
+        self.sequence = message.sequence
+        self.x_mask, self.o_mask = message.x_mask, message.o_mask
+        self.is_synchronized = True
+        self.applied_count += 1
+        return True
+
+    def __apply_delta(self, message: CellDeltaMessage) -> bool:
+        if message.index >= _CELL_COUNT and message.index != CLEARED_INDEX:
+            raise CodecError(f"delta {message.sequence} updates cell {message.index} outside of a 3x3 board")
+        if not self.is_synchronized:
+            return False
+        if message.sequence <= self.sequence:
+            return False
+        if message.sequence != self.sequence + 1:
+            self.__reject(f"delta {message.sequence} follows {self.sequence}")
+            return False
+        x_mask, o_mask = _apply_delta(self.x_mask, self.o_mask, message.index, message.coin)
+        if state_checksum(x_mask, o_mask) & 0xFFFF != message.checksum:
+            self.__reject(f"delta {message.sequence} leads to a different state")
+            return False
+        self.sequence = message.sequence
+        self.x_mask, self.o_mask = x_mask, o_mask
+        self.applied_count += 1
+        return True
+
+    def __reject(self, reason: str):
+        self.is_synchronized = False
+        self.rejected_count += 1
+        logging.debug(f"{self.__class__.__name__} | game {self.game_id} | {reason}, waiting for a snapshot")
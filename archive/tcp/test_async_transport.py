@@ -0,0 +1,79 @@
+import asyncio
+from unittest import TestCase
+from tcp.async_transport import HANDSHAKE_REQUEST, AsyncClient, AsyncHost, PeerStates, read_frame, write_frame
+
+
+class TestAsyncTransport(TestCase):
+
+    def test_persistent_connections(self):
+        async def main():
+            async def echo(peer, payload):
+                await peer.send(payload.upper())
+
+            host = AsyncHost(echo)
+            address = await host.start()
+            clients = [AsyncClient() for _ in range(50)]
+            await asyncio.gather(*(client.connect(*address) for client in clients))
+            self.assertEqual(len(host.peers), 50)
+            self.assertEqual(len({client.peer_id for client in clients}), 50)
+            for round_index in range(5):
+                for client in clients:
+                    await client.send(b"move %d" % round_index)
+                for client in clients:
+                    self.assertEqual(await client.receive(), b"MOVE %d" % round_index)
+            await host.broadcast(b"game over")
+            for client in clients:
+                self.assertEqual(await client.receive(), b"game over")
+            self.assertTrue(all(peer.received_count == 5 for peer in host.peers.values()))
+            await clients[0].close()
+            await asyncio.sleep(0.05)
+            self.assertEqual(len(host.peers), 49)
+            await host.close()
+            for client in clients[1:]:
+                self.assertIsNone(await client.receive())
+                self.assertIs(client.peer.state, PeerStates.CLOSED)
+                await client.close()
+
+        asyncio.run(main())
+
+    def test_invalid_handshake(self):
+        async def main():
+            host = AsyncHost(lambda peer, payload: None, max_peers=1)
+            address = await host.start()
+            reader, writer = await asyncio.open_connection(*address)
+            write_frame(writer, b"HTTP/1.1")
+            self.assertEqual(await reader.read(), b"")
+            writer.close()
+            first = AsyncClient()
+            await first.connect(*address)
+            # the host is full, the connection is closed before the handshake is answered
+            with self.assertRaises(asyncio.IncompleteReadError):
+                await AsyncClient().connect(*address)
+            self.assertEqual(list(host.peers), [first.peer_id])
+            await first.close()
+            await host.close()
+
+        asyncio.run(main())
+
+    def test_max_peers_during_handshake(self):
+        async def main():
+            host = AsyncHost(lambda peer, payload: None, max_peers=2)
+            address = await host.start()
+            # all connections are accepted before any of them sends the handshake
+            connections = [await asyncio.open_connection(*address) for _ in range(3)]
+            await asyncio.sleep(0.05)
+            answered = 0
+            for reader, writer in connections:
+                write_frame(writer, HANDSHAKE_REQUEST)
+                try:
+                    await read_frame(reader)
+                    answered += 1
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    pass
+            self.assertEqual(answered, 2)
+            self.assertEqual(len(host.peers), 2)
+            for _, writer in connections:
+                writer.close()
+            await host.close()
+
+        asyncio.run(main())
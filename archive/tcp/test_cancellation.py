@@ -0,0 +1,173 @@
+import asyncio
+import socket
+import threading
+import time
+from unittest import TestCase
+import tcp.exceptions as exc
+from tcp.cancellation import CancellationToken, Deadline
+from tcp.discovery import ProbeScanner
+from tcp.misc import CancellableThread
+from tcp.peer_identifiction import PeerIdentifier, PeerPollingReceptor
+
+REQUEST = b"0x123456"
+RESPONSE = b"0xedcba9"
+
+
+def cancel_later(token, delay=0.05):
+    timer = threading.Timer(delay, token.cancel)
+    timer.start()
+    return timer
+
+
+class TestDeadline(TestCase):
+
+    def test_remaining(self):
+        self.assertIsNone(Deadline().remaining())
+        self.assertEqual(Deadline().remaining(cap=1.0), 1.0)
+        self.assertFalse(Deadline().is_expired())
+        deadline = Deadline(10)
+        self.assertTrue(9 < deadline.remaining() <= 10)
+        self.assertEqual(deadline.remaining(cap=0.5), 0.5)
+        expired = Deadline(0)
+        self.assertEqual(expired.remaining(), 0)
+        self.assertTrue(expired.is_expired())
+        with self.assertRaises(exc.DeadlineExceededError):
+            expired.check()
+
+
+class TestCancellationToken(TestCase):
+
+    def setUp(self) -> None:
+        self.token = CancellationToken()
+        self.sender, self.receiver = socket.socketpair()
+
+    def tearDown(self) -> None:
+        self.token.close()
+        self.sender.close()
+        self.receiver.close()
+
+    def test_wait_readable(self):
+        self.sender.send(b"x")
+        self.token.wait_readable(self.receiver, Deadline(1))
+        self.token.wait_writable(self.sender, Deadline(1))
+
+    def test_cancel(self):
+        cancel_later(self.token)
+        start = time.monotonic()
+        with self.assertRaises(exc.OperationCancelledError):
+            self.token.wait_readable(self.receiver)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertTrue(self.token.is_cancelled)
+        # once cancelled every wait fails right away, a second cancel changes nothing
+        self.token.cancel("again")
+        self.assertEqual(self.token.reason, "cancelled")
+        with self.assertRaises(exc.OperationCancelledError):
+            self.token.wait_writable(self.sender)
+        self.assertFalse(self.token.sleep(10))
+
+    def test_deadline(self):
+        start = time.monotonic()
+        with self.assertRaises(exc.DeadlineExceededError):
+            self.token.wait_readable(self.receiver, Deadline(0.05))
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertTrue(self.token.sleep(0.01))
+
+    def test_callbacks(self):
+        calls = []
+        self.token.add_callback(lambda: calls.append(1))
+        self.token.cancel()
+        self.token.add_callback(lambda: calls.append(2))
+        self.assertEqual(calls, [1, 2])
+
+    def test_cancel_task(self):
+        async def main():
+            task = asyncio.ensure_future(asyncio.sleep(10))
+            self.token.cancel_task(task, asyncio.get_running_loop())
+            cancel_later(self.token)
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        start = time.monotonic()
+        asyncio.run(main())
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_thread(self):
+        def target(token, conn_socket):
+            token.wait_readable(conn_socket)
+
+        thread = CancellableThread(target, (self.receiver,))
+        thread.start()
+        start = time.monotonic()
+        self.assertTrue(thread.stop(timeout=1))
+        self.assertLess(time.monotonic() - start, 0.5)
+
+
+class TestPeerPolling(TestCase):
+
+    def setUp(self) -> None:
+        self.token = CancellationToken()
+        self.controller = PeerIdentifier(is_server=True, port=0, cancellation_token=self.token)
+
+    def tearDown(self) -> None:
+        self.token.close()
+
+    def receptor(self, waiting_duration=5.0):
+        receptor = PeerPollingReceptor(0, 5, self.controller, self.token, waiting_duration, "127.0.0.1")
+        receptor.start()
+        self.addCleanup(receptor.join)
+        self.addCleanup(self.token.cancel)
+        return receptor
+
+    def test_receptor_cancel(self):
+        receptor = self.receptor()
+        time.sleep(0.05)
+        start = time.monotonic()
+        self.controller.cancel()
+        receptor.join(1)
+        self.assertFalse(receptor.is_alive())
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(self.controller.registered_peer_list, [])
+
+    def test_receptor_cancel_during_request(self):
+        receptor = self.receptor()
+        with socket.create_connection(("127.0.0.1", receptor.port), timeout=1) as silent:
+            time.sleep(0.05)
+            # the receptor waits for the key of the accepted connection when it is cancelled
+            self.controller.cancel()
+            receptor.join(1)
+            self.assertFalse(receptor.is_alive())
+            self.assertEqual(silent.recv(8), b"")
+
+    def test_receptor_waiting_duration(self):
+        receptor = self.receptor(waiting_duration=0.1)
+        receptor.join(1)
+        self.assertFalse(receptor.is_alive())
+
+    def test_receptor_identifies_client(self):
+        receptor = self.receptor()
+        with socket.create_connection(("127.0.0.1", receptor.port), timeout=1) as silent:
+            # a wrong key does not end the polling
+            with socket.create_connection(("127.0.0.1", receptor.port), timeout=1) as wrong:
+                wrong.sendall(b"01234567")
+                self.assertEqual(wrong.recv(8), b"")
+            scanner = ProbeScanner(receptor.port, REQUEST, RESPONSE)
+            self.assertEqual(scanner.scan(["127.0.0.1"], timeout=2), "127.0.0.1")
+        receptor.join(1)
+        self.assertFalse(receptor.is_alive())
+        self.assertEqual(len(self.controller.registered_peer_list), 1)
+        self.assertEqual(self.controller.registered_peer_list[0][0], "127.0.0.1")
+
+    def test_scan_cancel(self):
+        listener = socket.socket()
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(8)
+        try:
+            # the peer accepts but never answers
+            scanner = ProbeScanner(listener.getsockname()[1], REQUEST, RESPONSE, probe_timeout=10)
+            cancel_later(self.token)
+            start = time.monotonic()
+            with self.assertRaises(exc.OperationCancelledError):
+                scanner.scan(["127.0.0.1"], cancellation_token=self.token)
+            self.assertLess(time.monotonic() - start, 0.5)
+        finally:
+            listener.close()
@@ -0,0 +1,52 @@
+from unittest import TestCase
+from tcp.codec import *
+
+MESSAGES = [
+    MoveMessage(7, 2, 1, 1),
+    BoardStateMessage(7, 12, 0x111, 0x0C0),
+    PlayerSwitchMessage(7, 3, True),
+    CoinAssignmentMessage(7, 4, 2),
+    HandshakeMessage(4, "Player_4 ✓"),
+]
+
+
+class TestCodec(TestCase):
+
+    def test_round_trip(self):
+        for message in MESSAGES:
+            data = encode(message)
+            self.assertEqual(len(data), encoded_size(message))
+            self.assertEqual(data[0], CODEC_VERSION)
+            self.assertEqual(decode(data), message)
+            self.assertIs(type(decode(memoryview(data))), type(message))
+        self.assertEqual(len(encode(MESSAGES[0])), 9)
+
+    def test_stream(self):
+        buffer = bytearray(256)
+        offset = 0
+        for message in MESSAGES:
+            offset += encode_into(buffer, offset, message)
+        decoded = []
+        position = 0
+        while position < offset:
+            message, size = decode_from(buffer, position)
+            decoded.append(message)
+            position += size
+        self.assertEqual(decoded, MESSAGES)
+
+    def test_invalid(self):
+        data = encode(MESSAGES[1])
+        with self.assertRaises(CodecError):
+            decode(data[:-1])
+        with self.assertRaises(CodecError):
+            decode(data + b"\x00")
+        with self.assertRaises(CodecError):
+            decode(bytes([CODEC_VERSION + 1]) + data[1:])
+        with self.assertRaises(CodecError):
+            decode(bytes([CODEC_VERSION, 0xFF]) + data[2:])
+        with self.assertRaises(CodecError):
+            encode(MoveMessage(-1, 0, 0, 1))
+        with self.assertRaises(CodecError):
+            encode((1, 2))
+        with self.assertRaises(CodecError):
+            decode(encode(MESSAGES[4])[:-2])
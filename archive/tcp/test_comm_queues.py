@@ -0,0 +1,165 @@
+import queue
+import threading
+import time
+from unittest import TestCase
+import tcp.exceptions as exc
+from tcp.comm_queues import (BaseReceptionQueue, BoundedQueue, OverflowPolicies, ReceptionQueue,
+                             TransmissionQueue)
+
+
+class TestBoundedQueue(TestCase):
+
+    def test_policies(self):
+        # policy -> (messages left, pushed count)
+        expected = {
+            OverflowPolicies.DROP_NEWEST: ([0, 1, 2], 3),
+            OverflowPolicies.DROP_OLDEST: ([2, 3, 4], 5),
+        }
+        for policy, (messages, pushed_count) in expected.items():
+            bounded_queue = BoundedQueue(3, policy)
+            for message in range(5):
+                bounded_queue.put(message)
+            self.assertEqual(bounded_queue.get_many(10), messages)
+            self.assertEqual((bounded_queue.pushed_count, bounded_queue.dropped_count), (pushed_count, 2))
+
+        bounded_queue = BoundedQueue(1, OverflowPolicies.RAISE)
+        self.assertTrue(bounded_queue.put("a"))
+        with self.assertRaises(exc.QueueOverflowError):
+            bounded_queue.put("b")
+        self.assertEqual(bounded_queue.get(0), "a")
+
+    def test_block(self):
+        bounded_queue = BoundedQueue(1, OverflowPolicies.BLOCK, put_timeout=0.05)
+        bounded_queue.put("a")
+        with self.assertRaises(exc.QueueOverflowError):
+            bounded_queue.put("b")
+        bounded_queue.put_timeout = 2
+        threading.Timer(0.05, bounded_queue.get).start()
+        start = time.monotonic()
+        self.assertTrue(bounded_queue.put("c"))
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(bounded_queue.get(0), "c")
+
+    def test_get_many(self):
+        bounded_queue = BoundedQueue(10)
+        self.assertEqual(bounded_queue.get_many(4), [])
+        with self.assertRaises(queue.Empty):
+            bounded_queue.get(0.01)
+        for message in range(6):
+            bounded_queue.put(message)
+        self.assertEqual(bounded_queue.get_many(4), [0, 1, 2, 3])
+        self.assertEqual(bounded_queue.get_many(4, None), [4, 5])
+        threading.Timer(0.05, bounded_queue.put, ("late",)).start()
+        self.assertEqual(bounded_queue.get_many(4, 2), ["late"])
+
+    def test_close(self):
+        bounded_queue = BoundedQueue(1, OverflowPolicies.BLOCK)
+        bounded_queue.put("a")
+        threading.Timer(0.05, bounded_queue.close).start()
+        # the blocked producer gives up, the queued message can still be read
+        self.assertFalse(bounded_queue.put("b"))
+        self.assertEqual(bounded_queue.get_many(4, None), ["a"])
+        self.assertEqual(bounded_queue.get_many(4, None), [])
+        self.assertFalse(bounded_queue.put("c"))
+
+
+class TestTransmissionQueue(TestCase):
+
+    def setUp(self) -> None:
+        self.transmission_queue = TransmissionQueue(max_size=4).build()
+        self.player = "192.168.0.2"
+        self.spectator = "192.168.0.3"
+        self.transmission_queue.add_recipient(self.player, max_size=100, overflow_policy=OverflowPolicies.BLOCK)
+        self.transmission_queue.add_recipient(self.spectator)
+
+    def test_not_singleton(self):
+        self.assertIsNot(TransmissionQueue(), self.transmission_queue)
+        self.assertEqual(TransmissionQueue().queue_list, {})
+
+    def test_fan_out(self):
+        message = bytearray(b"board")
+        self.assertEqual(self.transmission_queue.push(message), 2)
+        # every recipient gets the same object
+        self.assertIs(self.transmission_queue.get_message(self.player, 0), message)
+        self.assertIs(self.transmission_queue.get_message(self.spectator, 0), message)
+        self.assertEqual(self.transmission_queue.push("direct", self.player), 1)
+        self.assertEqual(self.transmission_queue.get_many(self.player), ["direct"])
+        self.assertEqual(self.transmission_queue.get_many(self.spectator), [])
+
+    def test_slow_spectator(self):
+        start = time.monotonic()
+        for move in range(50):
+            self.transmission_queue.push(move)
+        # the game loop never waited for the spectator which keeps the latest updates
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(self.transmission_queue.get_many(self.player, 100), list(range(50)))
+        self.assertEqual(self.transmission_queue.get_many(self.spectator, 100), [46, 47, 48, 49])
+        statistics = self.transmission_queue.get_statistics()
+        self.assertEqual(statistics[self.spectator], {"size": 0, "pushed": 50, "dropped": 46})
+        self.assertEqual(statistics[self.player]["dropped"], 0)
+
+    def test_recipients(self):
+        with self.assertRaises(ValueError):
+            self.transmission_queue.add_recipient(self.player)
+        with self.assertRaises(ValueError):
+            self.transmission_queue.add_recipient(TransmissionQueue.FOR_ALL)
+        with self.assertRaises(ValueError):
+            self.transmission_queue.get_message(timeout=0)
+        with self.assertRaises(KeyError):
+            self.transmission_queue.push("move", "10.0.0.1")
+        # a consumer waiting on a removed recipient is woken up
+        threading.Timer(0.05, self.transmission_queue.remove_recipient, (self.spectator,)).start()
+        with self.assertRaises(queue.Empty):
+            self.transmission_queue.get_message(self.spectator)
+        self.assertEqual(self.transmission_queue.get_recipient_ids(), [self.player])
+        self.transmission_queue.push("move")
+        self.assertEqual(self.transmission_queue.get_message(timeout=0), "move")
+
+
+class Listener:
+
+    def __init__(self, reception_queue):
+        self.reception_queue = reception_queue
+        self.received = []
+
+    def update(self):
+        self.received.append(self.reception_queue.buffer)
+
+
+class TestReceptionQueue(TestCase):
+
+    def test_base_init(self):
+        self.assertEqual(BaseReceptionQueue().listeners_register, [])
+
+    def test_delivery(self):
+        reception_queue = ReceptionQueue(max_batch_size=3).build()
+        listener = Listener(reception_queue)
+        reception_queue.register_listener(listener)
+        for index in range(10):
+            self.assertTrue(reception_queue.push(f"move {index}", "192.168.0.2"))
+        reception_queue.start()
+        reception_queue.close()
+        self.assertFalse(reception_queue.is_alive())
+        self.assertEqual(listener.received, [("192.168.0.2", f"move {index}") for index in range(10)])
+        self.assertFalse(reception_queue.push("late", "192.168.0.2"))
+        self.assertIsNot(ReceptionQueue(), reception_queue)
+
+    def test_failing_listener(self):
+        class Failing:
+            def update(self):
+                raise ValueError("broken listener")
+
+        reception_queue = ReceptionQueue(max_size=2).build()
+        listener = Listener(reception_queue)
+        reception_queue.register_listener(Failing())
+        reception_queue.register_listener(listener)
+        reception_queue.start()
+        pusher = threading.Thread(target=lambda: [reception_queue.push(index, "192.168.0.2") for index in range(100)])
+        with self.assertLogs(level="ERROR"):
+            pusher.start()
+            pusher.join(1)
+            # the receiving thread never waits, the delivery thread survives the failing listener
+            self.assertFalse(pusher.is_alive())
+            reception_queue.close()
+        self.assertFalse(reception_queue.is_alive())
+        self.assertEqual(listener.received[-1], ("192.168.0.2", 99))
@@ -0,0 +1,140 @@
+import socket
+import threading
+import time
+from unittest import TestCase
+from tcp.discovery import DatagramResponder, DiscoveryModes, ProbeScanner, announce
+from tcp.peer_identifiction import PeerIdentifier
+
+REQUEST = b"0x123456"
+RESPONSE = b"0xedcba9"
+
+
+class Responder(threading.Thread):
+    """
+    answers every connection on the address with the reply, or stays silent if it is None
+    """
+
+    def __init__(self, address, reply):
+        threading.Thread.__init__(self, daemon=True)
+        self.listener = socket.socket()
+        self.listener.bind((address, 0))
+        self.listener.listen(8)
+        self.port = self.listener.getsockname()[1]
+        self.reply = reply
+        self.connections = []
+
+    def run(self) -> None:
+        try:
+            while True:
+                conn, _ = self.listener.accept()
+                self.connections.append(conn)
+                if conn.recv(len(REQUEST)) == REQUEST and self.reply is not None:
+                    conn.sendall(self.reply)
+        except OSError:
+            pass
+
+    def close(self):
+        self.listener.close()
+        for conn in self.connections:
+            conn.close()
+
+
+class TestProbeScanner(TestCase):
+
+    def test_first_valid_responder(self):
+        responder = Responder("127.0.0.1", RESPONSE)
+        responder.start()
+        try:
+            scanner = ProbeScanner(responder.port, REQUEST, RESPONSE, max_in_flight=16)
+            start = time.monotonic()
+            address = scanner.scan([f"127.0.0.{index}" for index in range(2, 255)] + ["127.0.0.1"])
+            self.assertEqual(address, "127.0.0.1")
+            self.assertLess(time.monotonic() - start, 2)
+            self.assertEqual(scanner.probe_count, 254)
+        finally:
+            responder.close()
+
+    def test_invalid_and_silent_peers(self):
+        wrong = Responder("127.0.0.1", b"01234567")
+        wrong.start()
+        silent = Responder("127.0.0.1", None)
+        silent.start()
+        try:
+            for port in (wrong.port, silent.port):
+                scanner = ProbeScanner(port, REQUEST, RESPONSE, probe_timeout=0.1)
+                start = time.monotonic()
+                self.assertIsNone(scanner.scan(["127.0.0.1", "127.0.0.2"]))
+                self.assertLess(time.monotonic() - start, 1)
+            scanner = ProbeScanner(silent.port, REQUEST, RESPONSE, probe_timeout=10)
+            start = time.monotonic()
+            self.assertIsNone(scanner.scan(["127.0.0.1"], timeout=0.1))
+            self.assertLess(time.monotonic() - start, 1)
+        finally:
+            wrong.close()
+            silent.close()
+
+
+def free_udp_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+class TestDatagramDiscovery(TestCase):
+
+    def test_announce(self):
+        responder = DatagramResponder(0, REQUEST, RESPONSE, bind_address="127.0.0.1")
+        thread = threading.Thread(target=lambda: self.__setattr__("served", responder.serve(2.0)))
+        thread.start()
+        try:
+            start = time.monotonic()
+            self.assertEqual(announce(responder.port, REQUEST, RESPONSE, "127.0.0.1", listen_window=2.0),
+                             ["127.0.0.1"])
+            self.assertLess(time.monotonic() - start, 1)
+            thread.join()
+            self.assertEqual([address for address, _ in self.served], ["127.0.0.1"])
+        finally:
+            responder.close()
+
+    def test_listen_window(self):
+        responder = DatagramResponder(0, REQUEST, RESPONSE, bind_address="127.0.0.1")
+        try:
+            start = time.monotonic()
+            # nobody announces or answers, the window bounds both sides
+            self.assertEqual(responder.serve(0.1), [])
+            self.assertEqual(announce(free_udp_port(), REQUEST, RESPONSE, "127.0.0.1", listen_window=0.1), [])
+            self.assertLess(time.monotonic() - start, 1)
+            # an invalid challenge is not answered
+            self.assertEqual(announce(responder.port, b"0xffffff", RESPONSE, "127.0.0.1", listen_window=0.1), [])
+            self.assertEqual(responder.serve(0.1), [])
+        finally:
+            responder.close()
+
+    def test_peer_identifier(self):
+        port = free_udp_port()
+        server = PeerIdentifier(is_server=True, port=port, discovery_mode=DiscoveryModes.UDP_BROADCAST,
+                                listen_window=2.0)
+        thread = threading.Thread(target=server.get_peer_connections)
+        thread.start()
+        time.sleep(0.05)
+        client = PeerIdentifier(is_server=False, port=port, discovery_mode=DiscoveryModes.UDP_BROADCAST,
+                                listen_window=2.0, udp_target_address="127.0.0.1")
+        self.assertEqual(client.get_peer_connections(), "127.0.0.1")
+        thread.join()
+        # same (ip address, port) shape as the tcp scan
+        self.assertEqual(len(server.registered_peer_list), 1)
+        address, port = server.registered_peer_list[0]
+        self.assertEqual(address, "127.0.0.1")
+        self.assertIsInstance(port, int)
+
+    def test_cancel(self):
+        port = free_udp_port()
+        server = PeerIdentifier(is_server=True, port=port, discovery_mode=DiscoveryModes.UDP_BROADCAST,
+                                listen_window=10)
+        client = PeerIdentifier(is_server=False, port=free_udp_port(), discovery_mode=DiscoveryModes.UDP_BROADCAST,
+                                listen_window=10, udp_target_address="127.0.0.1")
+        for identifier, expected in ((server, []), (client, None)):
+            threading.Timer(0.05, identifier.cancel).start()
+            start = time.monotonic()
+            self.assertEqual(identifier.get_peer_connections(), expected)
+            self.assertLess(time.monotonic() - start, 0.5)
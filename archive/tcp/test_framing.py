@@ -0,0 +1,46 @@
+import socket
+import threading
+from unittest import TestCase
+import tcp.exceptions as exc
+from tcp.framing import FRAME_HEADER, FrameReader, send_frame
+
+
+class TestFraming(TestCase):
+
+    def setUp(self) -> None:
+        self.sender, self.receiver = socket.socketpair()
+
+    def tearDown(self) -> None:
+        self.sender.close()
+        self.receiver.close()
+
+    def test_round_trip(self):
+        reader = FrameReader(self.receiver, initial_capacity=16)
+        buffer = reader.buffer
+        for payload in (b"", b"move", bytes(range(16))):
+            self.assertEqual(send_frame(self.sender, payload), FRAME_HEADER.size + len(payload))
+            self.assertEqual(reader.read_frame(), payload)
+        # frames fitting the buffer are read in place
+        self.assertIs(reader.buffer, buffer)
+
+    def test_large_frame(self):
+        payload = bytes(range(256)) * 8192
+        thread = threading.Thread(target=send_frame, args=(self.sender, bytearray(payload)))
+        thread.start()
+        reader = FrameReader(self.receiver)
+        self.assertEqual(bytes(reader.read_frame()), payload)
+        thread.join()
+        send_frame(self.sender, b"after")
+        self.assertEqual(reader.read_frame(), b"after")
+
+    def test_limits(self):
+        reader = FrameReader(self.receiver, max_frame_size=4)
+        send_frame(self.sender, b"12345")
+        with self.assertRaises(ValueError):
+            reader.read_frame()
+
+    def test_truncated_frame(self):
+        self.sender.sendall(FRAME_HEADER.pack(3) + b"ab")
+        self.sender.close()
+        with self.assertRaises(exc.SocketConnectionError):
+            FrameReader(self.receiver).read_frame()
@@ -0,0 +1,106 @@
+import socket
+import threading
+import time
+from unittest import TestCase
+from tcp.host_listener import BasicHostDispatcher, BasicHostListenerSocket
+
+
+def wait_for(condition, timeout=2.0):
+    end = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.005)
+
+
+class TestHostDispatcher(TestCase):
+
+    def setUp(self) -> None:
+        self.release = threading.Event()
+        self.clients = []
+
+    def tearDown(self) -> None:
+        self.release.set()
+        for client in self.clients:
+            client.close()
+
+    def build(self, handler, max_connection=32, max_workers=4):
+        listener = BasicHostListenerSocket(max_connection=max_connection, host_address="127.0.0.1", port=0)
+        dispatcher = BasicHostDispatcher(handler, listener, max_workers=max_workers).build()
+        dispatcher.start()
+        self.addCleanup(dispatcher.close)
+        return dispatcher
+
+    def connect(self, dispatcher):
+        client = socket.create_connection(("127.0.0.1", dispatcher.host_listener.port), timeout=2)
+        self.clients.append(client)
+        return client
+
+    def test_echo(self):
+        def echo(conn_socket, address):
+            self.assertEqual(address[0], "127.0.0.1")
+            conn_socket.sendall(conn_socket.recv(16))
+
+        dispatcher = self.build(echo)
+        for _ in range(3):
+            client = self.connect(dispatcher)
+            client.sendall(b"ping")
+            self.assertEqual(client.recv(16), b"ping")
+            # the dispatcher closes the connection after the handler
+            self.assertEqual(client.recv(16), b"")
+        wait_for(lambda: dispatcher.metrics.completed_count == 3)
+        self.assertEqual(dispatcher.metrics.snapshot()["accepted"], 3)
+
+    def test_burst(self):
+        dispatcher = self.build(lambda conn_socket, address: self.release.wait(2), max_connection=10, max_workers=4)
+        for _ in range(16):
+            self.connect(dispatcher)
+        wait_for(lambda: dispatcher.metrics.accepted_count + dispatcher.metrics.refused_count == 16)
+        metrics = dispatcher.metrics.snapshot()
+        self.assertEqual(metrics["accepted"], 10)
+        self.assertEqual(metrics["refused"], 6)
+        wait_for(lambda: dispatcher.metrics.busy_count == 4)
+        self.assertEqual(dispatcher.metrics.queued_count, 6)
+        self.assertEqual(dispatcher.metrics.saturation, 1.0)
+        self.release.set()
+        wait_for(lambda: dispatcher.metrics.completed_count == 10)
+        metrics = dispatcher.metrics.snapshot()
+        self.assertEqual((metrics["busy"], metrics["queued"], metrics["peak_busy"]), (0, 0, 4))
+        # the slots are free again
+        self.connect(dispatcher)
+        wait_for(lambda: dispatcher.metrics.accepted_count == 11)
+
+    def test_close(self):
+        started = threading.Event()
+
+        def handler(conn_socket, address):
+            started.set()
+            self.release.wait(2)
+            conn_socket.sendall(b"done")
+
+        dispatcher = self.build(handler, max_workers=1)
+        running = self.connect(dispatcher)
+        started.wait(2)
+        queued = self.connect(dispatcher)
+        wait_for(lambda: dispatcher.metrics.queued_count == 1)
+        threading.Timer(0.1, self.release.set).start()
+        start = time.monotonic()
+        dispatcher.close()
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertFalse(dispatcher.is_alive())
+        # the running handler finished, the queued connection was dropped
+        self.assertEqual(running.recv(16), b"done")
+        self.assertEqual(queued.recv(16), b"")
+        self.assertEqual(dispatcher.metrics.dropped_count, 1)
+        self.assertFalse(dispatcher.host_listener.is_bound)
+        with self.assertRaises(OSError):
+            socket.create_connection(("127.0.0.1", dispatcher.host_listener.port), timeout=0.5)
+
+    def test_failing_handler(self):
+        def handler(conn_socket, address):
+            raise ValueError("broken")
+
+        dispatcher = self.build(handler)
+        self.assertEqual(self.connect(dispatcher).recv(16), b"")
+        wait_for(lambda: dispatcher.metrics.failed_count == 1)
+        self.assertTrue(dispatcher.is_alive())
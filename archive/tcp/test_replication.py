@@ -0,0 +1,86 @@
+from unittest import TestCase
+from components.board import BitBoard, Coin, MNKBoard, SimpleBoard
+from components.listeners import CellUpdatedListener
+from tcp.codec import BoardSnapshotMessage, CellDeltaMessage, CodecError, encode
+from tcp.replication import BoardReplica, ReplicationSource, state_checksum
+
+
+class TestReplication(TestCase):
+
+    def setUp(self) -> None:
+        self.board = SimpleBoard(cell_listener=CellUpdatedListener())
+        self.sent = []
+        self.source = ReplicationSource(self.board, 5, self.sent.append, snapshot_interval=4)
+        self.replica = BoardReplica(5)
+
+    def deliver(self, messages):
+        for data in messages:
+            self.replica.apply(data)
+
+    def test_deltas(self):
+        self.source.send_snapshot()
+        self.board.set_cell(1, 1, Coin.PIECE_X)
+        self.board.set_cell(0, 2, Coin.PIECE_O)
+        self.board.undo()
+        self.assertEqual([len(data) for data in self.sent[1:]], [14, 14, 14])
+        self.deliver(self.sent)
+        self.assertTrue(self.replica.is_synchronized)
+        self.assertEqual(self.replica.get_coin_masks(), self.board.get_coin_masks())
+        self.assertEqual(self.replica.get_cell_value(1, 1), Coin.PIECE_X.value)
+        self.assertEqual(self.replica.sequence, 3)
+        self.board.clear_board()
+        self.deliver(self.sent[-2:])
+        self.assertEqual(self.replica.get_coin_masks(), (0, 0))
+
+    def test_lost_delta(self):
+        self.source.send_snapshot()
+        moves = [(0, 0, Coin.PIECE_X), (1, 1, Coin.PIECE_O), (2, 2, Coin.PIECE_X), (0, 1, Coin.PIECE_O),
+                 (0, 2, Coin.PIECE_X)]
+        for x, y, coin in moves:
+            self.board.set_cell(x, y, coin)
+        # the delta of the second move is lost, the replica stops until the snapshot after move 4
+        self.deliver(self.sent[:2] + self.sent[3:])
+        self.assertEqual(self.replica.rejected_count, 1)
+        self.assertTrue(self.replica.is_synchronized)
+        self.assertEqual(self.replica.get_coin_masks(), self.board.get_coin_masks())
+
+    def test_corrupted_messages(self):
+        self.source.send_snapshot()
+        self.board.set_cell(2, 0, Coin.PIECE_O)
+        snapshot, delta = self.sent
+        self.assertFalse(self.replica.apply(snapshot[:-1] + bytes([snapshot[-1] ^ 1])))
+        self.assertFalse(self.replica.is_synchronized)
+        self.replica.apply(snapshot)
+        self.assertFalse(self.replica.apply(delta[:-1] + bytes([delta[-1] ^ 1])))
+        self.assertFalse(self.replica.is_synchronized)
+        with self.assertRaises(CodecError):
+            BoardReplica(6).apply(snapshot)
+
+    def test_bit_board(self):
+        board = BitBoard(cell_listener=CellUpdatedListener())
+        board.set_cell(0, 0, Coin.PIECE_X)
+        sent = []
+        source = ReplicationSource(board, 1, sent.append)
+        replica = BoardReplica(1)
+        source.send_snapshot()
+        board.set_cell(2, 1, Coin.PIECE_O)
+        source.close()
+        board.set_cell(1, 0, Coin.PIECE_X)
+        for data in sent:
+            replica.apply(data)
+        self.assertEqual(replica.get_coin_masks(), (1, 1 << 7))
+
+    def test_board_size(self):
+        board = MNKBoard(3, 3, 3, cell_listener=CellUpdatedListener())
+        ReplicationSource(board, 1, self.sent.append).close()
+        for m, n in ((15, 15), (3, 4)):
+            with self.assertRaises(ValueError):
+                ReplicationSource(MNKBoard(m, n, 3, cell_listener=CellUpdatedListener()), 1, self.sent.append)
+            with self.assertRaises(ValueError):
+                BoardReplica(1, m, n)
+        with self.assertRaises(CodecError):
+            self.replica.apply(encode(BoardSnapshotMessage(5, 1, 1 << 12, 0, state_checksum(1 << 12, 0))))
+        self.source.send_snapshot()
+        self.deliver(self.sent)
+        with self.assertRaises(CodecError):
+            self.replica.apply(encode(CellDeltaMessage(5, 1, 12, Coin.PIECE_X.value, 0)))
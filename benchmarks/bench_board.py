@@ -0,0 +1,73 @@
+"""
+microbenchmark comparing random playouts on SimpleBoard and BitBoard
+
+every step of a playout counts the coins on the board, collects the empty cells
+and places a coin on one of them, then the board is reset for the next game
+
+run from the repository root with
+    python -m benchmarks.bench_board [game_count]
+"""
+import random
+import sys
+import time
+
+from components.board import SimpleBoard, BitBoard, Coin, MASK_INDICES
+
+
+def play_simple_board(game_count: int, seed: int) -> float:
+    """
+    plays random games through the Board interface of SimpleBoard
+    :param game_count: number of games to be played
+    :param seed: seed for the move selection
+    :return: elapsed time in seconds
+    """
+    random_value = random.Random(seed).random
+    board = SimpleBoard()
+    start = time.perf_counter()
+    for _ in range(game_count):
+        coin = Coin.PIECE_X
+        while sum(1 for value in board.get_map().values() if value != Coin.EMPTY) < 9:
+            empty_cells = [key for key, value in board.get_map().items() if value == Coin.EMPTY]
+            x, y = empty_cells[int(random_value() * len(empty_cells))]
+            board.set_cell(x, y, coin)
+            coin = Coin.PIECE_O if coin == Coin.PIECE_X else Coin.PIECE_X
+        board.clear_board()
+    return time.perf_counter() - start
+
+
+def play_bit_board(game_count: int, seed: int) -> float:
+    """
+    plays random games through the raw move operations of BitBoard
+    :param game_count: number of games to be played
+    :param seed: seed for the move selection
+    :return: elapsed time in seconds
+    """
+    random_value = random.Random(seed).random
+    board = BitBoard()
+    piece_x, piece_o = Coin.PIECE_X, Coin.PIECE_O
+    start = time.perf_counter()
+    for _ in range(game_count):
+        coin = piece_x
+        played = []
+        while board.get_move_count() < 9:
+            empty_indices = MASK_INDICES[board.get_empty_mask()]
+            index = empty_indices[int(random_value() * len(empty_indices))]
+            board.apply_move(index, coin)
+            played.append(index)
+            coin = piece_o if coin is piece_x else piece_x
+        # undo keeps the zobrist hash consistent, clear_board would fire the cell listener
+        for index in reversed(played):
+            board.undo_move(index)
+    return time.perf_counter() - start
+
+
+def main(game_count: int = 50000):
+    simple_time = play_simple_board(game_count, seed=1)
+    bit_time = play_bit_board(game_count, seed=1)
+    print(f"SimpleBoard : {game_count / simple_time:12.0f} games/s")
+    print(f"BitBoard    : {game_count / bit_time:12.0f} games/s")
+    print(f"speedup     : {simple_time / bit_time:12.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
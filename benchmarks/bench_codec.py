@@ -0,0 +1,57 @@
+"""
+benchmark of the binary game message codec against pickle
+
+the pickle baseline serialises the messages the way archive/tcp/comm_queues.Message does,
+a Message object carrying the message type and its fields
+
+run from the repository root with
+    python -m benchmarks.bench_codec [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "archive"))
+
+from tcp.codec import (BoardStateMessage, CoinAssignmentMessage, HandshakeMessage, MoveMessage,  # noqa: E402
+                       PlayerSwitchMessage, decode, encode)
+from tcp.comm_queues import Message  # noqa: E402
+
+MESSAGES = (
+    MoveMessage(1024, 1, 2, 1),
+    BoardStateMessage(1024, 7, 0x111, 0x0C2),
+    PlayerSwitchMessage(1024, 2049, True),
+    CoinAssignmentMessage(1024, 2049, 2),
+    HandshakeMessage(2049, "Player_2049"),
+)
+
+
+def pickle_message(message) -> bytes:
+    wrapper = Message()
+    wrapper.data1 = type(message).__name__
+    wrapper.data2 = tuple(message)
+    return wrapper.pickle_it()
+
+
+def measure(function, argument, iterations: int) -> float:
+    """
+    :return: calls per second
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function(argument)
+    return iterations / (time.perf_counter() - start)
+
+
+def main(iterations: int = 100000):
+    print(f"{'message':<24}{'codec B':>8}{'pickle B':>9}{'encode/s':>12}{'pickle/s':>12}{'decode/s':>12}{'unpickle/s':>12}")
+    for message in MESSAGES:
+        data = encode(message)
+        dump = pickle_message(message)
+        print(f"{type(message).__name__:<24}{len(data):>8}{len(dump):>9}"
+              f"{measure(encode, message, iterations):>12.0f}{measure(pickle_message, message, iterations):>12.0f}"
+              f"{measure(decode, data, iterations):>12.0f}{measure(Message, dump, iterations):>12.0f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,101 @@
+"""
+tracemalloc benchmark of the memory held per hosted game
+
+a game is a board, two players, a player controller queue and a coin shuffler.
+the legacy layout rebuilds the dict backed model the components used before the boards
+moved to bytearray storage and the players to __slots__, so both can be measured side by side
+
+run from the repository root with
+    python -m benchmarks.bench_memory [game_count]
+"""
+import gc
+import sys
+import tracemalloc
+from typing import Callable
+
+import components.board as bc
+from components.controllers import SimpleCoinShuffler
+
+
+class LegacyBoard:
+    """
+    dict of tuple keys, one per cell, as SimpleBoard used to store them
+    """
+
+    def __init__(self):
+        self.map = {(x, y): bc.Coin.EMPTY for x in range(3) for y in range(3)}
+
+
+class LegacyPlayer:
+    """
+    player with a per instance __dict__ and a counter kept up by __del__
+    """
+    object_count = 0
+
+    def __init__(self, is_host):
+        LegacyPlayer.object_count += 1
+        self.name = f"Player_{LegacyPlayer.object_count}"
+        self.coin = bc.Coin.EMPTY
+        self.is_holding_turn = False
+        self.is_host = is_host
+
+    def __del__(self):
+        LegacyPlayer.object_count -= 1
+
+
+class LegacyController:
+
+    def __init__(self):
+        self.player_queue = []
+
+
+class LegacyShuffler:
+
+    def __init__(self, host_player, client_player):
+        self.host_player = host_player
+        self.client_player = client_player
+        self.is_first_time_shuffling = True
+
+
+def new_legacy_game():
+    host_player, client_player = LegacyPlayer(is_host=True), LegacyPlayer(is_host=False)
+    controller = LegacyController()
+    controller.player_queue = [host_player, client_player]
+    return LegacyBoard(), controller, LegacyShuffler(host_player, client_player)
+
+
+def new_game():
+    host_player, client_player = bc.BasePlayer(is_host=True), bc.BasePlayer(is_host=False)
+    controller = bc.SimplePlayerControllerQueue()
+    controller.set_player_queue([host_player, client_player])
+    return bc.SimpleBoard(), controller, SimpleCoinShuffler(host_player, client_player)
+
+
+def measure(factory: Callable, game_count: int) -> float:
+    """
+    keeps game_count games alive and measures the memory allocated for them
+    :param factory: function creating the objects of one game
+    :param game_count: number of games to be created
+    :return: bytes per game
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    games = [factory() for _ in range(game_count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del games
+    return size / game_count
+
+
+def main(game_count: int = 20000):
+    legacy_size = measure(new_legacy_game, game_count)
+    compact_size = measure(new_game, game_count)
+    print(f"legacy layout  : {legacy_size:8.0f} bytes/game")
+    print(f"compact layout : {compact_size:8.0f} bytes/game")
+    print(f"saved          : {1 - compact_size / legacy_size:8.1%}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
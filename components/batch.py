@@ -0,0 +1,88 @@
+"""
+vectorised evaluation of many 3x3 boards at once
+
+a batch is an (N, 9) uint8 array holding the Coin values of the cells,
+column x * 3 + y holds the cell (x, y) as everywhere else in components
+"""
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+import numpy as np
+import components.board as bc
+from components.verifier import HAS_LINE
+
+_X = bc.Coin.PIECE_X.value
+_O = bc.Coin.PIECE_O.value
+_EMPTY = bc.Coin.EMPTY.value
+
+# weight of every column when the cells of a board are packed into a 9 bit mask
+_BIT_WEIGHTS = (1 << np.arange(9)).astype(np.uint16)
+_HAS_LINE = np.array(HAS_LINE, dtype=bool)
+_CELLS = tuple(bc.index_to_cell(index) for index in range(9))
+
+
+class BatchEvaluation(NamedTuple):
+    # (N,) uint8 Coin value of the winner, Coin.EMPTY value when nobody has a line
+    winner: np.ndarray
+    # (N,) bool set for won and for full boards
+    is_terminal: np.ndarray
+    # (N, 9) bool set for the empty cells of boards that are still in play
+    legal_moves: np.ndarray
+    # (N,) uint8 number of coins on each board
+    move_count: np.ndarray
+
+
+def _check_batch(cells: np.ndarray) -> np.ndarray:
+    cells = np.asarray(cells)
+    if cells.ndim != 2 or cells.shape[1] != 9:
+        raise ValueError(f"expected an (N, 9) array of cells, got shape {cells.shape}")
+    return cells.astype(np.uint8, copy=False)
+
+
+def coin_masks(cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    packs the X and O cells of every board into 9 bit masks, see Board.get_coin_masks
+    :param cells: (N, 9) array of Coin values
+    :return: ((N,) X masks, (N,) O masks)
+    """
+    cells = _check_batch(cells)
+    return (cells == _X) @ _BIT_WEIGHTS, (cells == _O) @ _BIT_WEIGHTS
+
+
+def evaluate(cells: np.ndarray) -> BatchEvaluation:
+    """
+    computes winner, terminal flag, legal moves and move count of every board
+    :param cells: (N, 9) array of Coin values
+    :return: BatchEvaluation
+    """
+    cells = _check_batch(cells)
+    empty = cells == _EMPTY
+    x_mask, o_mask = coin_masks(cells)
+    x_wins = _HAS_LINE[x_mask]
+    o_wins = _HAS_LINE[o_mask]
+    winner = np.full(len(cells), _EMPTY, dtype=np.uint8)
+    winner[x_wins] = _X
+    winner[o_wins] = _O
+    move_count = (9 - empty.sum(axis=1)).astype(np.uint8)
+    is_terminal = x_wins | o_wins | (move_count == 9)
+    legal_moves = empty & ~is_terminal[:, None]
+    return BatchEvaluation(winner, is_terminal, legal_moves, move_count)
+
+
+def from_maps(coin_maps: Iterable[Dict[Tuple[int, int], bc.Coin]]) -> np.ndarray:
+    """
+    builds a batch out of layouts in the format returned by Board.get_map
+    :param coin_maps: iterable of dict of coord, coins
+    :return: (N, 9) uint8 array
+    """
+    rows = [[coin_map[cell].value for cell in _CELLS] for coin_map in coin_maps]
+    return np.array(rows, dtype=np.uint8).reshape(len(rows), 9)
+
+
+def to_maps(cells: np.ndarray) -> List[Dict[Tuple[int, int], bc.Coin]]:
+    """
+    converts a batch back to layouts in the format returned by Board.get_map
+    :param cells: (N, 9) array of Coin values
+    :return: list of dict of coord, coins
+    """
+    coins = {coin.value: coin for coin in bc.Coin}
+    return [dict(zip(_CELLS, (coins[value] for value in row))) for row in _check_batch(cells).tolist()]
+
@@ -1,6 +1,10 @@
 from enum import Enum
-from typing import Dict, Tuple, List
+from types import MappingProxyType
+from typing import Callable, Dict, Tuple, List, Mapping
+import itertools
+import threading
 import components.listeners
+from components.zobrist import get_zobrist_keys
 
 
 class Coin(Enum):
@@ -9,12 +13,234 @@ class Coin(Enum):
     EMPTY = 0x03
 
 
+# enum member lookups are comparatively slow, the hot paths of the boards use these aliases
+_PIECE_X = Coin.PIECE_X
+_PIECE_O = Coin.PIECE_O
+
+# the bytearray backed boards store Coin values, this maps a stored value back to its Coin
+COINS_BY_VALUE = (None, Coin.PIECE_X, Coin.PIECE_O, Coin.EMPTY)
+# coordinates of the 3x3 cells by index x * 3 + y
+_CELLS = tuple(divmod(index, 3) for index in range(9))
+
+
+def coin_value(coin: Coin) -> int:
+    """
+    returns the byte stored for the coin by the bytearray backed boards
+    :param coin: Coin enum
+    :return: int Coin value
+    """
+    if coin is _PIECE_X:
+        return 1
+    if coin is _PIECE_O:
+        return 2
+    return coin.value
+
+
+def zobrist_key(keys: Tuple[int, ...], index: int, coin: Coin) -> int:
+    """
+    returns the zobrist key of the coin on the cell, see components.zobrist
+    :param keys: keys of the board
+    :param index: index of the cell
+    :param coin: coin on the cell
+    :return: 64 bit key, 0 for an empty cell
+    """
+    if coin is _PIECE_X:
+        return keys[index << 1]
+    if coin is _PIECE_O:
+        return keys[index << 1 | 1]
+    return 0
+
+
+def masks_from_map(coin_map: Dict[Tuple[int, int], Coin]) -> Tuple[int, int]:
+    """
+    converts a coin layout in the format returned by Board.get_map to 9 bit masks
+    bit index of a cell is x * 3 + y
+    :param coin_map: dict of coord, coins
+    :return: (x_mask, o_mask)
+    """
+    x_mask = o_mask = 0
+    for (x, y), coin in coin_map.items():
+        if coin == Coin.PIECE_X:
+            x_mask |= 1 << (x * 3 + y)
+        elif coin == Coin.PIECE_O:
+            o_mask |= 1 << (x * 3 + y)
+    return x_mask, o_mask
+
+
+def masks_to_map(coin_masks: Tuple[int, int]) -> Dict[Tuple[int, int], Coin]:
+    """
+    converts 9 bit coin masks to a coin layout in the format returned by Board.get_map
+    :param coin_masks: (x_mask, o_mask)
+    :return: dict of coord, coins
+    """
+    x_mask, o_mask = coin_masks
+    result = {}
+    for index in range(9):
+        if x_mask >> index & 1:
+            result[divmod(index, 3)] = Coin.PIECE_X
+        elif o_mask >> index & 1:
+            result[divmod(index, 3)] = Coin.PIECE_O
+        else:
+            result[divmod(index, 3)] = Coin.EMPTY
+    return result
+
+
+# Coin values of an empty 3x3 board
+_EMPTY_CELLS = bytes([Coin.EMPTY.value]) * 9
+
+
+def cells_to_map(cells: bytes) -> Dict[Tuple[int, int], Coin]:
+    """
+    converts the 9 Coin values stored by SimpleBoard to a coin layout in the format returned by Board.get_map
+    :param cells: bytes like of Coin values, index x * 3 + y
+    :return: dict of coord, coins
+    """
+    return {cell: COINS_BY_VALUE[value] for cell, value in zip(_CELLS, cells)}
+
+
+class MoveJournal:
+    """
+    append only record of the cell updates of a board, backing Board.undo/redo/truncate
+
+    entry i is (xs[i], ys[i], previous[i], coins[i]) kept in parallel lists,
+    entries below position are applied, entries from position up to length can be redone.
+    slots are overwritten after an undo, so making and unmaking moves allocates nothing
+    once the lists have grown to the depth of the game
+    """
+
+    __slots__ = ("xs", "ys", "previous", "coins", "position", "length")
+
+    def __init__(self):
+        self.xs: List[int] = []
+        self.ys: List[int] = []
+        self.previous: List[Coin] = []
+        self.coins: List[Coin] = []
+        self.position = 0
+        self.length = 0
+
+    def record(self, x, y, previous: Coin, coin: Coin):
+        """
+        appends an entry at the current position, any redo history is discarded
+        :return: None
+        """
+        slot = self.position
+        if slot < len(self.xs):
+            self.xs[slot] = x
+            self.ys[slot] = y
+            self.previous[slot] = previous
+            self.coins[slot] = coin
+        else:
+            self.xs.append(x)
+            self.ys.append(y)
+            self.previous.append(previous)
+            self.coins.append(coin)
+        self.position = self.length = slot + 1
+
+    def step_back(self) -> int:
+        """
+        moves the position one entry back
+        :return: slot of the entry to be undone, -1 if there is none
+        """
+        if self.position == 0:
+            return -1
+        self.position -= 1
+        return self.position
+
+    def step_forward(self) -> int:
+        """
+        moves the position one entry forward
+        :return: slot of the entry to be redone, -1 if there is none
+        """
+        if self.position == self.length:
+            return -1
+        self.position += 1
+        return self.position - 1
+
+    def truncate(self):
+        """
+        discards the entries that could be redone
+        :return: None
+        """
+        self.length = self.position
+
+    def clear(self):
+        self.position = self.length = 0
+
+
+class BoardSnapshot:
+    """
+    immutable view of a board at one point in time, returned by Board.snapshot
+
+    the snapshot shares the storage of the board instead of copying it,
+    the board copies its storage before the next write (copy on write)
+    """
+    __slots__ = ("_source", "_to_map", "_map", "_coin_masks", "hash", "version")
+
+    def __init__(self, source, to_map: Callable, position_hash: int, version: int, coin_masks: Tuple[int, int] = None):
+        """
+        :param source: storage of the board, never modified after the snapshot is taken
+        :param to_map: function converting the storage to a dict of coord, coins, None if it already is one
+        :param position_hash: zobrist hash of the board
+        :param version: number of updates the board had applied
+        :param coin_masks: (x_mask, o_mask) if already known
+        """
+        self._source = source
+        self._to_map = to_map
+        self._map = None
+        self._coin_masks = coin_masks
+        self.hash = position_hash
+        self.version = version
+
+    def get_map(self) -> Mapping[Tuple[int, int], Coin]:
+        """
+        returns a read only map of coordinates and coins, built on first use
+        :return: mapping of coord, coins
+        """
+        if self._map is None:
+            self._map = MappingProxyType(self._to_map(self._source) if self._to_map else self._source)
+        return self._map
+
+    def get_cell(self, x, y) -> Coin:
+        return self.get_map()[x, y]
+
+    def get_coin_masks(self) -> Tuple[int, int]:
+        if self._coin_masks is None:
+            self._coin_masks = masks_from_map(self.get_map())
+        return self._coin_masks
+
+
 class Board:
     """
     base class for defining coin positions on the gam board
+
+    boards and their subclasses declare __slots__, a subclass without them gets a __dict__ back
     """
-    def __init__(self):
-        pass
+    __slots__ = ("journal", "cell_listener", "_hash", "_version", "_lock")
+
+    def __init__(self, cell_listener: components.listeners.CellUpdatedListener = None):
+        """
+        :param cell_listener: listener fired on cell updates, the process wide OnCellUpdatedListener by default
+        """
+        if cell_listener is None:
+            cell_listener = components.listeners.OnCellUpdatedListener()
+        self.cell_listener = cell_listener
+        # record of the set_cell calls since the last clear_board
+        self.journal = MoveJournal()
+        # zobrist hash of the position, updated by _write_cell
+        self._hash = 0
+        # number of updates applied to the board, updated by _write_cell and clear_board
+        self._version = 0
+        # serialises writers against snapshot, readers of snapshots never take it
+        self._lock = threading.Lock()
+
+    @property
+    def hash(self) -> int:
+        """
+        64 bit zobrist hash of the position, kept up to date by every cell update
+        equal positions hash equal on any board of the same size, in any process
+        :return: int
+        """
+        return self._hash
 
     def get_map(self) -> dict:
         """
@@ -52,41 +278,433 @@ class Board:
         """
         raise NotImplemented
 
+    def get_coin_masks(self) -> Tuple[int, int]:
+        """
+        returns the cells holding X and O coins as 9 bit masks, bit index is x * 3 + y
+        the default implementation is derived from get_map
+        :return: (x_mask, o_mask)
+        """
+        return masks_from_map(self.get_map())
+
+    def snapshot(self) -> BoardSnapshot:
+        """
+        returns an immutable view of the board in O(1), safe to read from any thread
+        the view never contains a partially applied update
+        :return: BoardSnapshot
+        """
+        raise NotImplemented
+
+    def undo(self) -> bool:
+        """
+        reverts the last set_cell call and fires the cell update event for it
+        :return: False if there was nothing to undo
+        """
+        journal = self.journal
+        with self._lock:
+            slot = journal.step_back()
+            if slot < 0:
+                return False
+            x, y, coin = journal.xs[slot], journal.ys[slot], journal.previous[slot]
+            self._write_cell(x, y, coin)
+        self.cell_listener.event_update((x, y, coin))
+        return True
+
+    def redo(self) -> bool:
+        """
+        reapplies the last undone set_cell call and fires the cell update event for it
+        :return: False if there was nothing to redo
+        """
+        journal = self.journal
+        with self._lock:
+            slot = journal.step_forward()
+            if slot < 0:
+                return False
+            x, y, coin = journal.xs[slot], journal.ys[slot], journal.coins[slot]
+            self._write_cell(x, y, coin)
+        self.cell_listener.event_update((x, y, coin))
+        return True
+
+    def truncate(self):
+        """
+        drops the undone moves, they can not be redone afterwards
+        :return: None
+        """
+        with self._lock:
+            self.journal.truncate()
+
+    def _write_cell(self, x, y, coin_to_insert) -> Coin:
+        """
+        stores the coin without recording it or firing events, used by set_cell, undo and redo
+        :return: coin previously held by the cell
+        """
+        raise NotImplemented
+
 
 class SimpleBoard(Board):
+    """
+    board storing the Coin value of every cell in a 9 byte bytearray, cell (x, y) lives at x * 3 + y
+    """
+    __slots__ = ("cells", "_zobrist_keys", "_shared")
 
-    def __init__(self):
-        Board.__init__(self)
-        self.map = {(0, 0): Coin.EMPTY, (0, 1): Coin.EMPTY, (0, 2): Coin.EMPTY,
-                    (1, 0): Coin.EMPTY, (1, 1): Coin.EMPTY, (1, 2): Coin.EMPTY,
-                    (2, 0): Coin.EMPTY, (2, 1): Coin.EMPTY, (2, 2): Coin.EMPTY}
+    def __init__(self, cell_listener: components.listeners.CellUpdatedListener = None):
+        Board.__init__(self, cell_listener)
+        self.cells = bytearray(_EMPTY_CELLS)
+        self._zobrist_keys = get_zobrist_keys(9)
+        # set while a snapshot shares self.cells
+        self._shared = False
 
     def get_map(self) -> Dict[Tuple[int, int], Coin]:
-        return self.map
+        # built on request, changes to the returned dict do not reach the board
+        return cells_to_map(self.cells)
 
     def set_cell(self, x, y, coin_to_insert):
-        self.map[(x, y)] = coin_to_insert
-        listener = components.listeners.OnCellUpdatedListener()
-        listener.event_update((x, y, coin_to_insert))
+        with self._lock:
+            previous = self._write_cell(x, y, coin_to_insert)
+            self.journal.record(x, y, previous, coin_to_insert)
+        self.cell_listener.event_update((x, y, coin_to_insert))
 
     def get_cell(self, x, y) -> Coin:
-        return self.map[x, y]
+        if x not in range(3) or y not in range(3):
+            raise KeyError((x, y))
+        return COINS_BY_VALUE[self.cells[x * 3 + y]]
 
     def clear_board(self):
-        for key, value in self.map.items():
-            self.map[key] = Coin.EMPTY
-        components.listeners.OnCellUpdatedListener().event_update((-1, -1, Coin.EMPTY))
+        with self._lock:
+            self.cells = bytearray(_EMPTY_CELLS)
+            self._shared = False
+            self.journal.clear()
+            self._hash = 0
+            self._version += 1
+        self.cell_listener.event_update((-1, -1, Coin.EMPTY))
+
+    def snapshot(self) -> BoardSnapshot:
+        with self._lock:
+            self._shared = True
+            return BoardSnapshot(self.cells, cells_to_map, self._hash, self._version)
+
+    def get_coin_masks(self) -> Tuple[int, int]:
+        x_mask = o_mask = 0
+        for index, value in enumerate(self.cells):
+            if value == 1:
+                x_mask |= 1 << index
+            elif value == 2:
+                o_mask |= 1 << index
+        return x_mask, o_mask
+
+    def _write_cell(self, x, y, coin_to_insert) -> Coin:
+        if x not in range(3) or y not in range(3):
+            raise KeyError((x, y))
+        index = x * 3 + y
+        if self._shared:
+            # a snapshot still reads the current bytes, continue on a copy
+            self.cells = bytearray(self.cells)
+            self._shared = False
+        previous = COINS_BY_VALUE[self.cells[index]]
+        self.cells[index] = coin_value(coin_to_insert)
+        keys = self._zobrist_keys
+        self._hash ^= zobrist_key(keys, index, previous) ^ zobrist_key(keys, index, coin_to_insert)
+        self._version += 1
+        return previous
+
+
+# all 9 cells of the board set
+FULL_MASK = 0x1FF
+# number of set bits for every possible 9 bit mask
+POPCOUNT = tuple(bin(mask).count("1") for mask in range(FULL_MASK + 1))
+# cell indices of the set bits for every possible 9 bit mask
+MASK_INDICES = tuple(tuple(index for index in range(9) if mask >> index & 1) for mask in range(FULL_MASK + 1))
+
+
+def cell_index(x, y) -> int:
+    """
+    converts the coordinates to the bit index used by BitBoard
+    :param x: x coordinate
+    :param y: y coordinate
+    :return: int index in range 0-8
+    """
+    return x * 3 + y
+
+
+def index_to_cell(index) -> Tuple[int, int]:
+    """
+    converts the bit index used by BitBoard back to coordinates
+    :param index: int index in range 0-8
+    :return: (x_coord, y_coord)
+    """
+    return divmod(index, 3)
+
+
+class BitBoard(Board):
+    """
+    board storing the positions of X and O coins as two 9 bit integers
+
+    bit (x * 3 + y) of x_bits/o_bits is set when the cell holds the respective coin
+    apply_move and undo_move are the raw O(1) operations meant for simulations and search,
+    they do not fire the cell update event and must not race with snapshot
+    """
+    __slots__ = ("x_bits", "o_bits", "_zobrist_keys")
+
+    def __init__(self, cell_listener: components.listeners.CellUpdatedListener = None):
+        Board.__init__(self, cell_listener)
+        self.x_bits = 0
+        self.o_bits = 0
+        self._zobrist_keys = get_zobrist_keys(9)
+
+    def get_map(self) -> Dict[Tuple[int, int], Coin]:
+        # built on request only, the board itself never holds a dict
+        return masks_to_map((self.x_bits, self.o_bits))
+
+    def set_cell(self, x, y, coin_to_insert):
+        with self._lock:
+            previous = self._write_cell(x, y, coin_to_insert)
+            self.journal.record(x, y, previous, coin_to_insert)
+        self.cell_listener.event_update((x, y, coin_to_insert))
+
+    def get_cell(self, x, y) -> Coin:
+        if x not in range(3) or y not in range(3):
+            raise KeyError((x, y))
+        bit = 1 << (x * 3 + y)
+        if self.x_bits & bit:
+            return Coin.PIECE_X
+        if self.o_bits & bit:
+            return Coin.PIECE_O
+        return Coin.EMPTY
+
+    def clear_board(self):
+        with self._lock:
+            self.x_bits = 0
+            self.o_bits = 0
+            self.journal.clear()
+            self._hash = 0
+            self._version += 1
+        self.cell_listener.event_update((-1, -1, Coin.EMPTY))
+
+    def snapshot(self) -> BoardSnapshot:
+        # the masks are immutable ints, nothing has to be shared or copied
+        with self._lock:
+            masks = (self.x_bits, self.o_bits)
+            return BoardSnapshot(masks, masks_to_map, self._hash, self._version, masks)
+
+    def _write_cell(self, x, y, coin_to_insert) -> Coin:
+        previous = self.get_cell(x, y)
+        keys = self._zobrist_keys
+        self._hash ^= zobrist_key(keys, x * 3 + y, previous) ^ zobrist_key(keys, x * 3 + y, coin_to_insert)
+        bit = 1 << (x * 3 + y)
+        self.x_bits &= ~bit
+        self.o_bits &= ~bit
+        if coin_to_insert is Coin.PIECE_X:
+            self.x_bits |= bit
+        elif coin_to_insert is Coin.PIECE_O:
+            self.o_bits |= bit
+        self._version += 1
+        return previous
+
+    def get_coin_masks(self) -> Tuple[int, int]:
+        return self.x_bits, self.o_bits
+
+    def apply_move(self, index, coin_to_insert):
+        """
+        places the coin on an empty cell without firing the cell update event
+        :param index: bit index of the cell, see cell_index
+        :param coin_to_insert: Coin.PIECE_X or Coin.PIECE_O
+        :return: None
+        """
+        if coin_to_insert is _PIECE_X:
+            self.x_bits |= 1 << index
+            self._hash ^= self._zobrist_keys[index << 1]
+        else:
+            self.o_bits |= 1 << index
+            self._hash ^= self._zobrist_keys[index << 1 | 1]
+
+    def undo_move(self, index):
+        """
+        empties the cell without firing the cell update event
+        :param index: bit index of the cell, see cell_index
+        :return: None
+        """
+        bit = 1 << index
+        if self.x_bits & bit:
+            self.x_bits ^= bit
+            self._hash ^= self._zobrist_keys[index << 1]
+        elif self.o_bits & bit:
+            self.o_bits ^= bit
+            self._hash ^= self._zobrist_keys[index << 1 | 1]
+
+    def get_empty_mask(self) -> int:
+        """
+        returns the mask of the cells that are still empty
+        :return: int 9 bit mask
+        """
+        return FULL_MASK & ~(self.x_bits | self.o_bits)
+
+    def get_move_count(self) -> int:
+        """
+        returns the number of coins on the board
+        :return: int
+        """
+        return POPCOUNT[self.x_bits | self.o_bits]
+
+
+class MNKBoard(Board):
+    """
+    m x n board won by k coins in a row, e.g. MNKBoard(15, 15, 5) for gomoku
+
+    the Coin values of the cells are stored row by row in a bytearray, cell (x, y) lives at x * n + y
+    the winner is tracked incrementally: placing a coin only walks the 4 lines through
+    the cell, at most k - 1 steps in each direction
+    """
+
+    # (x step, y step) of the row, column and both diagonals
+    DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+    __slots__ = ("m", "n", "k", "cells", "move_count", "winner", "_zobrist_keys", "_shared")
+
+    def __init__(self, m: int = 3, n: int = 3, k: int = 3,
+                 cell_listener: components.listeners.CellUpdatedListener = None):
+        Board.__init__(self, cell_listener)
+        if m < 1 or n < 1 or k < 1 or k > max(m, n):
+            raise ValueError(f"invalid board configuration m={m} n={n} k={k}")
+        self.m = m
+        self.n = n
+        self.k = k
+        self.cells = bytearray([Coin.EMPTY.value]) * (m * n)
+        self.move_count = 0
+        self.winner: Coin = None
+        self._zobrist_keys = get_zobrist_keys(m * n)
+        # set while a snapshot shares self.cells
+        self._shared = False
+
+    def get_map(self) -> Dict[Tuple[int, int], Coin]:
+        return self.__cells_to_map(self.cells)
+
+    def set_cell(self, x, y, coin_to_insert):
+        with self._lock:
+            previous = self._write_cell(x, y, coin_to_insert)
+            self.journal.record(x, y, previous, coin_to_insert)
+        self.cell_listener.event_update((x, y, coin_to_insert))
+
+    def get_cell(self, x, y) -> Coin:
+        if not (0 <= x < self.m and 0 <= y < self.n):
+            raise KeyError((x, y))
+        return COINS_BY_VALUE[self.cells[x * self.n + y]]
+
+    def clear_board(self):
+        with self._lock:
+            self.cells = bytearray([Coin.EMPTY.value]) * (self.m * self.n)
+            self._shared = False
+            self.move_count = 0
+            self.winner = None
+            self.journal.clear()
+            self._hash = 0
+            self._version += 1
+        self.cell_listener.event_update((-1, -1, Coin.EMPTY))
+
+    def _write_cell(self, x, y, coin_to_insert) -> Coin:
+        if not (0 <= x < self.m and 0 <= y < self.n):
+            raise KeyError((x, y))
+        index = x * self.n + y
+        if self._shared:
+            # a snapshot still reads the current bytes, continue on a copy
+            self.cells = bytearray(self.cells)
+            self._shared = False
+        previous = COINS_BY_VALUE[self.cells[index]]
+        self.cells[index] = coin_value(coin_to_insert)
+        self._version += 1
+        keys = self._zobrist_keys
+        self._hash ^= zobrist_key(keys, index, previous) ^ zobrist_key(keys, index, coin_to_insert)
+        self.move_count += (coin_to_insert != Coin.EMPTY) - (previous != Coin.EMPTY)
+        if previous != Coin.EMPTY and self.winner is not None:
+            # a coin was taken off a won board, the win may be gone
+            self.winner = self.__find_winner()
+        elif coin_to_insert != Coin.EMPTY and self.winner is None and self.__is_run_completed(x, y):
+            self.winner = coin_to_insert
+        return previous
+
+    def snapshot(self) -> BoardSnapshot:
+        with self._lock:
+            self._shared = True
+            return BoardSnapshot(self.cells, self.__cells_to_map, self._hash, self._version)
+
+    def __cells_to_map(self, cells: bytes) -> Dict[Tuple[int, int], Coin]:
+        n = self.n
+        return {divmod(index, n): COINS_BY_VALUE[value] for index, value in enumerate(cells)}
+
+    def get_coin_masks(self) -> Tuple[int, int]:
+        """
+        bit index of a cell is x * n + y, the masks are m * n bits wide
+        """
+        x_mask = o_mask = 0
+        for index, value in enumerate(self.cells):
+            if value == 1:
+                x_mask |= 1 << index
+            elif value == 2:
+                o_mask |= 1 << index
+        return x_mask, o_mask
+
+    def get_winner(self) -> Coin:
+        """
+        returns the coin which has completed a run of k
+        :return: Coin, None if there is no winner
+        """
+        return self.winner
+
+    def get_move_count(self) -> int:
+        """
+        returns the number of coins on the board
+        :return: int
+        """
+        return self.move_count
+
+    def is_full(self) -> bool:
+        return self.move_count == self.m * self.n
+
+    def __count_direction(self, x, y, dx, dy, value) -> int:
+        """
+        counts the cells holding the Coin value next to (x, y) in one direction, stops at k - 1
+        """
+        m, n, cells = self.m, self.n, self.cells
+        count = 0
+        x += dx
+        y += dy
+        while count < self.k - 1 and 0 <= x < m and 0 <= y < n and cells[x * n + y] == value:
+            count += 1
+            x += dx
+            y += dy
+        return count
+
+    def __is_run_completed(self, x, y) -> bool:
+        """
+        checks the 4 lines through the cell for a run of k coins
+        """
+        value = self.cells[x * self.n + y]
+        for dx, dy in MNKBoard.DIRECTIONS:
+            if 1 + self.__count_direction(x, y, dx, dy, value) + self.__count_direction(x, y, -dx, -dy, value) >= self.k:
+                return True
+        return False
+
+    def __find_winner(self):
+        """
+        full rescan, only needed after coins are taken off a won board
+        """
+        empty_value = Coin.EMPTY.value
+        for index, value in enumerate(self.cells):
+            if value != empty_value and self.__is_run_completed(*divmod(index, self.n)):
+                return COINS_BY_VALUE[value]
+        return None
 
 
 class BasePlayer:
     """
     Base class for encapsulating the player details
+
+    ids are handed out by a monotonic counter and never reused within a process
     """
-    __object_count = 0
+    __slots__ = ("player_id", "name", "coin", "is_holding_turn", "is_host")
+    __player_ids = itertools.count(1)
 
     def __init__(self, is_host):
-        BasePlayer.__object_count += 1
-        self.name: str = f"Player_{BasePlayer.__object_count}"
+        self.player_id: int = next(BasePlayer.__player_ids)
+        self.name: str = f"Player_{self.player_id}"
         self.coin: Coin = Coin.EMPTY
         self.is_holding_turn: bool = False
         self.is_host: bool = is_host
@@ -100,11 +718,9 @@ class BasePlayer:
     def set_turn(self, is_turn: bool):
         self.is_holding_turn = is_turn
 
-    def __del__(self):
-        BasePlayer.__object_count -= 1
-
 
 class BasePlayerQueueController:
+    __slots__ = ()
 
     def __init__(self):
         pass
@@ -156,6 +772,7 @@ class BasePlayerQueueController:
 
 
 class SimplePlayerControllerQueue(BasePlayerQueueController):
+    __slots__ = ("__player_queue",)
 
     def __init__(self):
         BasePlayerQueueController.__init__(self)
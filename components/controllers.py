@@ -6,6 +6,8 @@ class BaseCoinShuffler:
     """
     class for assigning a coin at random to the player objects
     """
+    __slots__ = ("host_player", "client_player")
+
     def __init__(self, host_player: bc.BasePlayer, client_player: bc.BasePlayer):
         self.host_player: bc.BasePlayer = host_player
         self.client_player: bc.BasePlayer = client_player
@@ -26,13 +28,18 @@ class BaseCoinShuffler:
 
 
 class SimpleCoinShuffler(BaseCoinShuffler):
+    __slots__ = ("is_first_time_shuffling", "rng")
 
-    def __init__(self, host_player: bc.BasePlayer, client_player: bc.BasePlayer):
+    def __init__(self, host_player: bc.BasePlayer, client_player: bc.BasePlayer, rng: random.Random = None):
+        """
+        :param rng: random number generator to draw from, the random module by default
+        """
         BaseCoinShuffler.__init__(self, host_player, client_player)
         self.is_first_time_shuffling = True
+        self.rng = rng if rng is not None else random
 
     def shuffle_deck(self):
-        index = random.randint(1, 2)
+        index = self.rng.randint(1, 2)
         if self.is_first_time_shuffling:
             self.__assign_coins(index)
             self.is_first_time_shuffling = False
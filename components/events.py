@@ -0,0 +1,180 @@
+"""
+topic based event bus
+
+a Topic names a kind of event and the type of its messages, new kinds of events only need a
+new Topic instead of a Singleton listener and an interface class. messages can be published
+with a key, e.g. the game id, subscribers registered for a key are only called for messages
+published with that key, subscribers without a key are called for every message of the topic.
+
+bound methods are referenced weakly, their subscription ends when the object is collected.
+other callables are kept alive by the bus until the subscription is cancelled.
+"""
+import itertools
+import threading
+import weakref
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, Type, TypeVar
+from components.listeners import BaseListener, ListenerInterface
+
+T = TypeVar("T")
+
+# key of the subscribers receiving every message of a topic
+ANY_KEY = object()
+
+
+class Topic(Generic[T]):
+    """
+    kind of event published on an EventBus
+    """
+
+    def __init__(self, name: str, message_type: Type[T] = object):
+        """
+        :param name: name of the topic
+        :param message_type: type every published message has to be an instance of
+        """
+        self.name = name
+        self.message_type = message_type
+
+    def __repr__(self):
+        return f"Topic({self.name!r}, {self.message_type.__name__})"
+
+
+# (int: x_coord, int: y_coord, Coin), see CellUpdatedListener
+CELL_UPDATED: Topic[tuple] = Topic("cell_updated", tuple)
+# (BasePlayer, bool: new status), see PlayerSwitchedListener
+PLAYER_SWITCHED: Topic[tuple] = Topic("player_switched", tuple)
+DICE_ROLLED: Topic[object] = Topic("dice_rolled")
+
+
+class Subscription:
+    """
+    handle returned by EventBus.subscribe, cancelling it removes the subscriber in O(1)
+    """
+
+    def __init__(self, bus: "EventBus", topic: Topic, key: Hashable, subscription_id: int,
+                 predicate: Optional[Callable[[Any], bool]]):
+        self.topic = topic
+        self.key = key
+        self.predicate = predicate
+        self.subscription_id = subscription_id
+        self.active = True
+        self.__bus = weakref.ref(bus)
+        self._callback: Callable[[], Optional[Callable[[Any], None]]] = None
+
+    def cancel(self):
+        """
+        stops the delivery to the subscriber, cancelling twice is harmless
+        :return: None
+        """
+        bus = self.__bus()
+        if self.active and bus is not None:
+            bus._remove(self)
+        self.active = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.cancel()
+
+
+class EventBus:
+    """
+    synchronous publish / subscribe of typed topics, safe to use from several threads
+    """
+
+    def __init__(self):
+        # topic -> key -> subscription id -> Subscription, in subscription order
+        self.__subscribers: Dict[Topic, Dict[Hashable, Dict[int, Subscription]]] = {}
+        self.__subscription_ids = itertools.count(1)
+        self.__lock = threading.Lock()
+
+    def subscribe(self, topic: Topic[T], callback: Callable[[T], None], key: Hashable = ANY_KEY,
+                  predicate: Callable[[T], bool] = None) -> Subscription:
+        """
+        registers the callback for the messages of the topic
+        :param topic: Topic to subscribe to
+        :param callback: function called with every delivered message
+        :param key: only deliver messages published with this key, all messages by default
+        :param predicate: only deliver messages for which it returns True
+        :return: Subscription
+        """
+        if key is None:
+            raise ValueError("None is the key of unkeyed messages, subscribe with ANY_KEY instead")
+        subscription = Subscription(self, topic, key, next(self.__subscription_ids), predicate)
+        if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+            subscription._callback = weakref.WeakMethod(callback, lambda _: subscription.cancel())
+        else:
+            subscription._callback = lambda: callback
+        with self.__lock:
+            keys = self.__subscribers.setdefault(topic, {})
+            keys.setdefault(key, {})[subscription.subscription_id] = subscription
+        return subscription
+
+    def publish(self, topic: Topic[T], message: T, key: Hashable = None) -> int:
+        """
+        calls the subscribers of the topic on the calling thread
+        :param topic: Topic of the message
+        :param message: instance of topic.message_type
+        :param key: key of the message, only subscribers of this key and of all keys are called
+        :return: number of subscribers called
+        """
+        if not isinstance(message, topic.message_type):
+            raise TypeError(f"{topic.name} expects {topic.message_type.__name__}, got {type(message).__name__}")
+        keys = self.__subscribers.get(topic)
+        if not keys:
+            return 0
+        subscriptions: Tuple[Subscription, ...] = tuple(keys.get(ANY_KEY, {}).values())
+        if key is not None and key in keys:
+            subscriptions += tuple(keys[key].values())
+        called = 0
+        for subscription in subscriptions:
+            if subscription.predicate is not None and not subscription.predicate(message):
+                continue
+            callback = subscription._callback()
+            if callback is not None and subscription.active:
+                callback(message)
+                called += 1
+        return called
+
+    def get_subscriber_count(self, topic: Topic, key: Hashable = ANY_KEY) -> int:
+        return len(self.__subscribers.get(topic, {}).get(key, ()))
+
+    def _remove(self, subscription: Subscription):
+        with self.__lock:
+            keys = self.__subscribers.get(subscription.topic)
+            if keys is None:
+                return
+            subscriptions = keys.get(subscription.key)
+            if subscriptions is not None:
+                subscriptions.pop(subscription.subscription_id, None)
+                if not subscriptions:
+                    del keys[subscription.key]
+
+
+class TopicForwarder(ListenerInterface):
+    """
+    republishes the events of a BaseListener on an EventBus
+    """
+
+    def __init__(self, bus: EventBus, topic: Topic, key: Hashable = None):
+        ListenerInterface.__init__(self)
+        self.bus = bus
+        self.topic = topic
+        self.key = key
+
+    def update(self, listener):
+        self.bus.publish(self.topic, listener, self.key)
+
+
+def forward(listener: BaseListener, bus: EventBus, topic: Topic, key: Hashable = None) -> TopicForwarder:
+    """
+    registers a TopicForwarder on the listener
+    :param listener: BaseListener whose events are forwarded
+    :param bus: EventBus to publish on
+    :param topic: Topic of the events
+    :param key: key the events are published with
+    :return: the registered TopicForwarder, unregister it from the listener to stop forwarding
+    """
+    forwarder = TopicForwarder(bus, topic, key)
+    listener.register_listener(forwarder)
+    return forwarder
@@ -1,3 +1,172 @@
+import asyncio
+import bisect
+import concurrent.futures
+import functools
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Dict, Tuple
+
+_logger = logging.getLogger(__name__)
+# queued by BatchingDispatcher.close to stop the worker
+_STOP = object()
+# DispatchMetrics collecting the subscriber timings, None while instrumentation is disabled
+_metrics = None
+
+
+class _Series:
+    """
+    call count, total time and latency histogram of one topic or subscriber
+    """
+    __slots__ = ("count", "total_seconds", "bucket_counts")
+
+    def __init__(self, bucket_count: int):
+        self.count = 0
+        self.total_seconds = 0.0
+        # calls per bucket, the last bucket holds the calls slower than every bound
+        self.bucket_counts = [0] * (bucket_count + 1)
+
+
+class DispatchMetrics:
+    """
+    timings of the subscriber calls made by BaseListener and BatchingDispatcher
+
+    topics are named after the class of the BaseListener, subscribers after the class of the
+    ListenerInterface. a topic series aggregates the calls of all its subscribers, the event
+    count of a topic is the number of messages delivered
+    """
+    # upper bounds of the latency buckets in seconds
+    DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        :param buckets: ascending upper bounds of the histogram buckets in seconds
+        """
+        self.buckets = tuple(buckets)
+        self.events: Dict[str, int] = {}
+        self.topics: Dict[str, _Series] = {}
+        self.subscribers: Dict[Tuple[str, str], _Series] = {}
+        self.__lock = threading.Lock()
+
+    def record_events(self, topic: str, count: int):
+        with self.__lock:
+            self.events[topic] = self.events.get(topic, 0) + count
+
+    def record_call(self, topic: str, subscriber: str, seconds: float):
+        """
+        adds one subscriber call to the series of the subscriber and of the topic
+        :param topic: name of the topic
+        :param subscriber: name of the subscriber
+        :param seconds: duration of the call
+        :return: None
+        """
+        bucket = bisect.bisect_left(self.buckets, seconds)
+        with self.__lock:
+            for series_map, key in ((self.topics, topic), (self.subscribers, (topic, subscriber))):
+                series = series_map.get(key)
+                if series is None:
+                    series = series_map[key] = _Series(len(self.buckets))
+                series.count += 1
+                series.total_seconds += seconds
+                series.bucket_counts[bucket] += 1
+
+    def time_call(self, topic: str, subscriber: "ListenerInterface", function, argument):
+        """
+        calls function(argument) and records its duration for the subscriber
+        :return: None
+        """
+        start = time.perf_counter()
+        try:
+            function(argument)
+        finally:
+            self.record_call(topic, type(subscriber).__qualname__, time.perf_counter() - start)
+
+    def reset(self):
+        with self.__lock:
+            self.events.clear()
+            self.topics.clear()
+            self.subscribers.clear()
+
+    def snapshot(self) -> dict:
+        """
+        returns a copy of the collected metrics, bucket counts are cumulative
+        :return: dict of events, topics and subscribers
+        """
+        with self.__lock:
+            return {
+                "events": dict(self.events),
+                "topics": [dict(topic=topic, **self.__series_dict(series))
+                           for topic, series in self.topics.items()],
+                "subscribers": [dict(topic=topic, subscriber=subscriber, **self.__series_dict(series))
+                                for (topic, subscriber), series in self.subscribers.items()],
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), sort_keys=True)
+
+    def to_prometheus(self) -> str:
+        """
+        renders the metrics in the Prometheus text exposition format
+        :return: str
+        """
+        snapshot = self.snapshot()
+        lines = ["# HELP listener_events_total messages delivered per topic",
+                 "# TYPE listener_events_total counter"]
+        for topic, count in snapshot["events"].items():
+            lines.append(f'listener_events_total{{topic="{_escape(topic)}"}} {count}')
+        for name, help_text, label_names in (
+                ("listener_topic_seconds", "time spent in the subscribers of a topic", ("topic",)),
+                ("listener_subscriber_seconds", "time spent in a subscriber", ("topic", "subscriber"))):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for series in snapshot["topics" if len(label_names) == 1 else "subscribers"]:
+                labels = ",".join(f'{label}="{_escape(series[label])}"' for label in label_names)
+                for bound, count in series["buckets"]:
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{name}_sum{{{labels}}} {series['total_seconds']}")
+                lines.append(f"{name}_count{{{labels}}} {series['count']}")
+        return "\n".join(lines) + "\n"
+
+    def __series_dict(self, series: _Series) -> dict:
+        buckets = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), series.bucket_counts):
+            cumulative += count
+            buckets.append(("+Inf" if bound == float("inf") else repr(bound), cumulative))
+        return {"count": series.count, "total_seconds": series.total_seconds, "buckets": buckets}
+
+
+def _escape(label_value: str) -> str:
+    return label_value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def enable_instrumentation(metrics: DispatchMetrics = None) -> DispatchMetrics:
+    """
+    starts timing every subscriber call of every listener in the process
+    :param metrics: DispatchMetrics to record into, a new one by default
+    :return: the DispatchMetrics in use
+    """
+    global _metrics
+    _metrics = metrics if metrics is not None else DispatchMetrics()
+    return _metrics
+
+
+def disable_instrumentation():
+    """
+    stops the timing, the subscribers are called directly again
+    :return: None
+    """
+    global _metrics
+    _metrics = None
+
+
+def get_metrics():
+    """
+    :return: the DispatchMetrics in use, None while instrumentation is disabled
+    """
+    return _metrics
 
 
 class Singleton(type):
@@ -24,6 +193,175 @@ class ListenerInterface:
         """
         raise NotImplemented
 
+    def update_batch(self, messages):
+        """
+        called by a BatchingDispatcher with the messages queued since the last batch, oldest first
+        override to handle a burst of events at once
+        :param messages: list of event messages
+        :return: None
+        """
+        for message in messages:
+            self.update(message)
+
+
+class Dispatcher:
+    """
+    decides how and on which thread the messages of a BaseListener reach its subscribers
+    """
+
+    def dispatch(self, listener, message):
+        """
+        delivers or queues the message of the listener
+        :param listener: BaseListener the event occurred on
+        :param message: message describing the event occurred
+        :return: None
+        """
+        raise NotImplemented
+
+    def flush(self):
+        """
+        waits until every message dispatched so far has been delivered
+        :return: None
+        """
+        pass
+
+    def close(self):
+        """
+        delivers the pending messages and releases the resources of the dispatcher
+        :return: None
+        """
+        pass
+
+
+class SynchronousDispatcher(Dispatcher):
+    """
+    calls the subscribers right away on the thread firing the event, the default mode
+    """
+
+    def dispatch(self, listener, message):
+        listener.update_listeners(message)
+
+
+class BatchingDispatcher(Dispatcher):
+    """
+    hands the messages to a worker thread through a bounded queue
+
+    the worker drains up to max_batch_size queued messages at a time, groups them per listener
+    and delivers them through ListenerInterface.update_batch. when the queue is full dispatch
+    blocks the firing thread until the subscribers catch up (backpressure), or raises queue.Full
+    once put_timeout has passed.
+
+    subscribers run on the worker thread, on the executor when one is given (the subscribers of
+    a batch run concurrently) or on the asyncio loop when one is given. the next batch is only
+    taken once the previous one has been delivered, so every subscriber sees the messages in order.
+    """
+
+    def __init__(self, max_queue_size: int = 1024, max_batch_size: int = 64,
+                 executor: concurrent.futures.Executor = None, loop: asyncio.AbstractEventLoop = None,
+                 put_timeout: float = None):
+        """
+        :param max_queue_size: number of messages queued before dispatch blocks
+        :param max_batch_size: maximum number of messages delivered in one batch
+        :param executor: executor running the subscribers, the worker thread by default
+        :param loop: running asyncio loop to deliver the batches on, excludes executor
+        :param put_timeout: seconds dispatch waits for room in the queue, None waits forever
+        """
+        if executor is not None and loop is not None:
+            raise ValueError("pass either an executor or a loop")
+        self.max_batch_size = max_batch_size
+        self.executor = executor
+        self.loop = loop
+        self.put_timeout = put_timeout
+        self.__queue = queue.Queue(maxsize=max_queue_size)
+        self.__closed = False
+        # makes the closed check and the put atomic, so nothing is queued behind the stop marker
+        self.__lock = threading.Lock()
+        self.__worker = threading.Thread(target=self.__run, name="BatchingDispatcher", daemon=True)
+        self.__worker.start()
+
+    def dispatch(self, listener, message):
+        if threading.current_thread() is self.__worker:
+            # fired by a subscriber, waiting for the queue here would deadlock the worker
+            listener.update_listeners(message)
+            return
+        with self.__lock:
+            if self.__closed:
+                raise RuntimeError("the dispatcher is closed")
+            self.__queue.put((listener, message), timeout=self.put_timeout)
+
+    def flush(self):
+        if threading.current_thread() is self.__worker:
+            # the batch being delivered is only done once the subscriber returns
+            return
+        self.__queue.join()
+
+    def close(self):
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            if self.__worker.is_alive():
+                self.__queue.put(_STOP)
+        self.__worker.join()
+
+    def __run(self):
+        pending = self.__queue
+        while True:
+            batch = [pending.get()]
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(pending.get_nowait())
+                except queue.Empty:
+                    break
+            stop = _STOP in batch
+            try:
+                self.__deliver([item for item in batch if item is not _STOP])
+            except Exception:
+                _logger.exception("event subscriber failed")
+            finally:
+                for _ in batch:
+                    pending.task_done()
+            if stop:
+                return
+
+    def __deliver(self, batch):
+        messages = {}
+        for listener, message in batch:
+            messages.setdefault(listener, []).append(message)
+        metrics = _metrics
+        calls = []
+        for listener, listener_messages in messages.items():
+            topic = type(listener).__name__
+            if metrics is not None:
+                metrics.record_events(topic, len(listener_messages))
+            for subscriber in listener.list_of_listeners:
+                call = subscriber.update_batch
+                if metrics is not None:
+                    call = functools.partial(metrics.time_call, topic, subscriber, call)
+                calls.append((call, listener_messages))
+        if self.executor is not None:
+            futures = [self.executor.submit(_call_logged, call, argument) for call, argument in calls]
+            for future in futures:
+                future.result()
+        elif self.loop is not None:
+            asyncio.run_coroutine_threadsafe(_call_all(calls), self.loop).result()
+        else:
+            for call, argument in calls:
+                _call_logged(call, argument)
+
+
+def _call_logged(call, argument):
+    # a failing subscriber must not keep the batch from the subscribers after it
+    try:
+        call(argument)
+    except Exception:
+        _logger.exception("event subscriber failed")
+
+
+async def _call_all(calls):
+    for call, argument in calls:
+        _call_logged(call, argument)
+
 
 class BaseListener:
     """
@@ -31,19 +369,31 @@ class BaseListener:
     Specific listeners need to extend this class
     """
 
-    def __init__(self, is_raw_call=True):
+    def __init__(self, is_raw_call=True, dispatcher: Dispatcher = None):
         """
         extending classes need to call the init function with is_raw_class as False
         :param is_raw_call: indicate whether called by extending class
+        :param dispatcher: delivery mode of the events, a SynchronousDispatcher by default
         """
-        # list of ListenerInterface objects
+        # list of ListenerInterface objects, replaced instead of modified so that
+        # a delivery in progress keeps iterating over the list it started with
         self.list_of_listeners = []
-        # message to be forwarded to the registered listening classes
-        self.update_message = None
+        self.dispatcher: Dispatcher = dispatcher if dispatcher is not None else SynchronousDispatcher()
+        # message being forwarded on the current thread, see get_update
+        self.__delivery = threading.local()
         # checks for raw call to the abstract class
         if is_raw_call:
             raise NotImplemented
 
+    def set_dispatcher(self, dispatcher: Dispatcher):
+        """
+        switches the delivery mode, the previous dispatcher is flushed first
+        :param dispatcher: new Dispatcher
+        :return: None
+        """
+        self.dispatcher.flush()
+        self.dispatcher = dispatcher
+
     def register_listener(self, listenable: ListenerInterface):
         """
         adds listener class to the list of listeners list
@@ -51,7 +401,7 @@ class BaseListener:
         :return: None
         """
         assert isinstance(listenable, ListenerInterface)
-        self.list_of_listeners.append(listenable)
+        self.list_of_listeners = self.list_of_listeners + [listenable]
 
     def unregister_listener(self, listenable: ListenerInterface):
         """
@@ -60,15 +410,31 @@ class BaseListener:
         :return: None
         """
         assert isinstance(listenable, ListenerInterface)
-        self.list_of_listeners.remove(listenable)
+        listeners = list(self.list_of_listeners)
+        listeners.remove(listenable)
+        self.list_of_listeners = listeners
 
-    def update_listeners(self):
+    def update_listeners(self, message=None):
         """
         calls the update function of the all registered listeners
+        :param message: message describing the event occurred
         :return: None
         """
-        for listener in self.list_of_listeners:
-            listener.update(self.update_message)
+        delivery = self.__delivery
+        outer_message = getattr(delivery, "message", None)
+        delivery.message = message
+        metrics = _metrics
+        try:
+            if metrics is None:
+                for listener in self.list_of_listeners:
+                    listener.update(message)
+            else:
+                topic = type(self).__name__
+                metrics.record_events(topic, 1)
+                for listener in self.list_of_listeners:
+                    metrics.time_call(topic, listener, listener.update, message)
+        finally:
+            delivery.message = outer_message
 
     def event_update(self, message):
         """
@@ -76,30 +442,38 @@ class BaseListener:
         :param message: message describing the event occurred
         :return: None
         """
-        self.update_message = message
-        self.update_listeners()
-        self.update_message = None
+        self.dispatcher.dispatch(self, message)
 
     def get_update(self):
         """
         function called by the subscribing class to read the message
+        only set while a synchronous delivery is in progress on the calling thread
         :return: change message
         """
-        return self.update_message
+        return getattr(self.__delivery, "message", None)
 
 
-class OnCellUpdatedListener(BaseListener, metaclass=Singleton):
+class CellUpdatedListener(BaseListener):
     """
-    listener fow when cells on the board are updated
+    listener fow when cells on the board are updated, one instance per game
 
     event message format should be
         tuple[int: x_coord, int:y_coord, Coin]
     if the board is to be cleared, x and y coord should be marked -1
     """
+
+    def __init__(self, dispatcher: Dispatcher = None):
+        BaseListener.__init__(self, is_raw_call=False, dispatcher=dispatcher)
+
+
+class OnCellUpdatedListener(CellUpdatedListener, metaclass=Singleton):
+    """
+    process wide CellUpdatedListener, fired by the boards created without a listener of their own
+    """
     __instance = None
 
     def __init__(self):
-        BaseListener.__init__(self, is_raw_call=False)
+        CellUpdatedListener.__init__(self)
 
 
 class CellUpdateListenerInterface(ListenerInterface):
@@ -119,14 +493,23 @@ class CellUpdateListenerInterface(ListenerInterface):
         raise NotImplemented
 
 
-class OnDiceRolledListener(BaseListener, metaclass=Singleton):
+class DiceRolledListener(BaseListener):
+    """
+    listener class for dice roll events, one instance per game
+    """
+
+    def __init__(self, dispatcher: Dispatcher = None):
+        BaseListener.__init__(self, is_raw_call=False, dispatcher=dispatcher)
+
+
+class OnDiceRolledListener(DiceRolledListener, metaclass=Singleton):
     """
-    listener class for dice roll events
+    process wide DiceRolledListener
     """
     __instance = None
 
     def __init__(self):
-        BaseListener.__init__(self, is_raw_call=False)
+        DiceRolledListener.__init__(self)
 
 
 class DiceRollListenerInterface(ListenerInterface):
@@ -147,17 +530,26 @@ class DiceRollListenerInterface(ListenerInterface):
         raise NotImplemented
 
 
-class OnPlayerSwitchedListener(BaseListener, metaclass=Singleton):
+class PlayerSwitchedListener(BaseListener):
     """
-    listener class for when players get turns
+    listener class for when players get turns, one instance per game
 
     event message format should be
         tuple(BasePlayer, bool: new status)
     """
+
+    def __init__(self, dispatcher: Dispatcher = None):
+        BaseListener.__init__(self, is_raw_call=False, dispatcher=dispatcher)
+
+
+class OnPlayerSwitchedListener(PlayerSwitchedListener, metaclass=Singleton):
+    """
+    process wide PlayerSwitchedListener
+    """
     __instance = None
 
     def __init__(self):
-        BaseListener.__init__(self, is_raw_call=False)
+        PlayerSwitchedListener.__init__(self)
 
 
 class PlayerSwitchListenerInterface(ListenerInterface):
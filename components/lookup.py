@@ -0,0 +1,174 @@
+"""
+offline generated perfect play table
+
+the build step walks every legal position reachable from an empty board (X moves first),
+solves it and writes one 16 bit record per position into a flat file indexed by the
+base 3 encoding of the board. the loader maps the file into memory and reads records in
+place, forked workers therefore share the page cache copy of the table.
+
+build the table with
+    python -m components.lookup perfect_play.bin
+"""
+import mmap
+import struct
+import sys
+from typing import List, Tuple
+import components.board as bc
+from components.solver import Solver, score_to_value
+from components.verifier import HAS_LINE, is_line_completed
+
+FILE_MAGIC = b"TTTP"
+FILE_VERSION = 0x01
+HEADER = struct.Struct("<4sBBH")
+RECORD = struct.Struct("<H")
+RECORD_COUNT = 3 ** 9
+
+# record layout: bits 0-8 mask of the best moves, bits 9-10 value + 1, bit 15 set for legal positions
+_VALUE_SHIFT = 9
+_VALID_FLAG = 0x8000
+
+# base 3 weight of every 9 bit mask, index of a position is TERNARY[x_mask] + 2 * TERNARY[o_mask]
+TERNARY = tuple(sum(3 ** index for index in range(9) if mask >> index & 1) for mask in range(bc.FULL_MASK + 1))
+
+
+def record_index(x_mask: int, o_mask: int) -> int:
+    """
+    position of the record of the board in the table
+    :param x_mask: 9 bit mask of the X coins
+    :param o_mask: 9 bit mask of the O coins
+    :return: int in range 0 - 3^9
+    """
+    return TERNARY[x_mask] + 2 * TERNARY[o_mask]
+
+
+def _evaluate(solver: Solver, own_mask: int, opponent_mask: int) -> Tuple[int, int]:
+    """
+    computes the value of the position and the mask of all moves reaching it
+    :return: (value for the side to move, best moves mask)
+    """
+    if HAS_LINE[opponent_mask]:
+        return -1, 0
+    empty_mask = bc.FULL_MASK & ~(own_mask | opponent_mask)
+    if not empty_mask:
+        return 0, 0
+    best_value = -1
+    best_moves = 0
+    for index in bc.MASK_INDICES[empty_mask]:
+        new_mask = own_mask | 1 << index
+        if is_line_completed(new_mask, index):
+            value = 1
+        else:
+            value = -score_to_value(solver.solve_masks(opponent_mask, new_mask)[0])
+        if value > best_value:
+            best_value, best_moves = value, 1 << index
+        elif value == best_value:
+            best_moves |= 1 << index
+    return best_value, best_moves
+
+
+def build_table(solver: Solver = None) -> bytearray:
+    """
+    enumerates and solves every position reachable from an empty board
+    :param solver: solver used for the evaluation, a new one by default
+    :return: file contents
+    """
+    solver = solver if solver is not None else Solver()
+    content = bytearray(HEADER.size + RECORD.size * RECORD_COUNT)
+    HEADER.pack_into(content, 0, FILE_MAGIC, FILE_VERSION, RECORD.size, 0)
+    pending = [bc.SimpleBoard().get_coin_masks()]
+    while pending:
+        x_mask, o_mask = pending.pop()
+        offset = HEADER.size + RECORD.size * record_index(x_mask, o_mask)
+        if RECORD.unpack_from(content, offset)[0]:
+            continue
+        x_to_move = bc.POPCOUNT[x_mask] == bc.POPCOUNT[o_mask]
+        if x_to_move:
+            value, moves = _evaluate(solver, x_mask, o_mask)
+        else:
+            value, moves = _evaluate(solver, o_mask, x_mask)
+        RECORD.pack_into(content, offset, _VALID_FLAG | (value + 1) << _VALUE_SHIFT | moves)
+        if HAS_LINE[x_mask] or HAS_LINE[o_mask]:
+            continue
+        for index in bc.MASK_INDICES[bc.FULL_MASK & ~(x_mask | o_mask)]:
+            if x_to_move:
+                pending.append((x_mask | 1 << index, o_mask))
+            else:
+                pending.append((x_mask, o_mask | 1 << index))
+    return content
+
+
+def write_table(path: str, solver: Solver = None) -> int:
+    """
+    builds the table and writes it to the file
+    :param path: destination file path
+    :param solver: solver used for the evaluation, a new one by default
+    :return: number of legal positions written
+    """
+    content = build_table(solver)
+    with open(path, "wb") as file:
+        file.write(content)
+    return sum(1 for (record,) in RECORD.iter_unpack(content[HEADER.size:]) if record & _VALID_FLAG)
+
+
+class PerfectPlayTable:
+    """
+    read only view of a table file written by write_table
+
+    records are read straight out of the memory mapped file, nothing is parsed or copied on load
+    values are seen from the side to move, 1 win, 0 draw, -1 loss
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.__map) != HEADER.size + RECORD.size * RECORD_COUNT:
+            self.close()
+            raise ValueError(f"{path} is not a perfect play table")
+        magic, version, record_size, _ = HEADER.unpack_from(self.__map, 0)
+        if magic != FILE_MAGIC or version != FILE_VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{path} has an unsupported format")
+
+    def lookup_masks(self, x_mask: int, o_mask: int, coin_to_move: bc.Coin = None) -> Tuple[int, int]:
+        """
+        reads the record of the position
+        the table is built with X moving first, the colours are swapped for games opened by O.
+        such a game is recognised by O being ahead, pass coin_to_move for the positions with
+        equal counts where O is to move
+        :param x_mask: 9 bit mask of the X coins
+        :param o_mask: 9 bit mask of the O coins
+        :param coin_to_move: coin of the side to move, derived from the coin count if None
+        :return: (value for the side to move, mask of the best moves)
+        """
+        x_count, o_count = bc.POPCOUNT[x_mask], bc.POPCOUNT[o_mask]
+        # O opened the game if it is ahead or to move with equal counts
+        if o_count > x_count or (coin_to_move == bc.Coin.PIECE_O and x_count == o_count):
+            x_mask, o_mask = o_mask, x_mask
+        (record,) = RECORD.unpack_from(self.__map, HEADER.size + RECORD.size * record_index(x_mask, o_mask))
+        if not record & _VALID_FLAG:
+            raise KeyError((x_mask, o_mask))
+        return (record >> _VALUE_SHIFT & 0x3) - 1, record & bc.FULL_MASK
+
+    def lookup(self, board: bc.Board, coin_to_move: bc.Coin = None) -> Tuple[int, List[Tuple[int, int]]]:
+        """
+        reads the value and the best moves of the board
+        :param board: position to be looked up
+        :param coin_to_move: coin of the side to move, derived from the coin count if None
+        :return: (value for the side to move, list of (x_coord, y_coord))
+        """
+        value, moves = self.lookup_masks(*board.get_coin_masks(), coin_to_move)
+        return value, [bc.index_to_cell(index) for index in bc.MASK_INDICES[moves]]
+
+    def close(self):
+        self.__map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+if __name__ == "__main__":
+    position_count = write_table(sys.argv[1] if len(sys.argv) > 1 else "perfect_play.bin")
+    print(f"{position_count} positions written")
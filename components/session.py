@@ -0,0 +1,149 @@
+"""
+hosting of many isolated games in one process
+
+every GameSession owns its board, players, SimpleCoinShuffler, SimplePlayerControllerQueue
+and its own listener instances. events of a session only reach the subscribers registered
+on that session, the process wide Singleton listeners are not fired.
+
+the events of every session are also published on the EventBus of the SessionManager under
+the game id, e.g. manager.bus.subscribe(CELL_UPDATED, callback, key=game_id)
+"""
+import itertools
+import random
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+import components.board as bc
+import components.listeners as ls
+from components.events import CELL_UPDATED, PLAYER_SWITCHED, EventBus, forward
+from components.controllers import SimpleCoinShuffler
+from components.verifier import ResultVerifier
+
+
+class GameSession:
+    """
+    a single 3x3 game between a host and a client player
+
+    the player dealt the X coin opens, the turns are handed out by the controller and every
+    change of turn is fired on player_switched_listener as (BasePlayer, bool: new status)
+    """
+
+    def __init__(self, game_id: int, board_factory: Callable[..., bc.Board] = bc.SimpleBoard,
+                 rng: random.Random = None, dispatcher: ls.Dispatcher = None):
+        """
+        :param game_id: id of the session within its SessionManager
+        :param board_factory: board class, called with the cell_listener of the session
+        :param rng: random number generator of the coin shuffler, the random module by default
+        :param dispatcher: delivery mode of the events of the session, synchronous by default
+        """
+        self.game_id = game_id
+        self.cell_listener = ls.CellUpdatedListener(dispatcher)
+        self.player_switched_listener = ls.PlayerSwitchedListener(dispatcher)
+        self.board: bc.Board = board_factory(cell_listener=self.cell_listener)
+        self.host_player = bc.BasePlayer(is_host=True)
+        self.client_player = bc.BasePlayer(is_host=False)
+        self.shuffler = SimpleCoinShuffler(self.host_player, self.client_player, rng=rng)
+        self.controller = bc.SimplePlayerControllerQueue()
+        self.verifier = ResultVerifier(self.board)
+
+    def start(self):
+        """
+        clears the board, deals the coins and hands the first turn to the X player
+        calling it again starts a rematch with the coins of the players swapped
+        :return: None
+        """
+        self.board.clear_board()
+        self.shuffler.shuffle_deck()
+        if self.host_player.coin == bc.Coin.PIECE_X:
+            self.controller.set_player_queue([self.host_player, self.client_player])
+        else:
+            self.controller.set_player_queue([self.client_player, self.host_player])
+        self.__switch_turn(None, self.controller.get_current_player())
+
+    def get_current_player(self) -> bc.BasePlayer:
+        return self.controller.get_current_player()
+
+    def play_move(self, x, y) -> Tuple[bool, Optional[bc.Coin]]:
+        """
+        places the coin of the current player and passes the turn
+        :param x: x coordinate
+        :param y: y coordinate
+        :return: (is_terminal, winner) as returned by ResultVerifier.get_result
+        """
+        if self.verifier.is_terminal():
+            raise ValueError(f"game {self.game_id} is already over")
+        if self.board.get_cell(x, y) != bc.Coin.EMPTY:
+            raise ValueError(f"cell {(x, y)} of game {self.game_id} is taken")
+        player = self.controller.get_current_player()
+        self.board.set_cell(x, y, player.coin)
+        result = self.verifier.get_result()
+        if result[0]:
+            self.__switch_turn(player, None)
+        else:
+            self.controller.round_completed()
+            self.__switch_turn(player, self.controller.get_current_player())
+        return result
+
+    def __switch_turn(self, previous: Optional[bc.BasePlayer], current: Optional[bc.BasePlayer]):
+        if previous is not None:
+            previous.set_turn(False)
+            self.player_switched_listener.event_update((previous, False))
+        if current is not None:
+            current.set_turn(True)
+            self.player_switched_listener.event_update((current, True))
+
+
+class SessionManager:
+    """
+    registry of the sessions hosted by the process, safe to use from several threads
+    """
+
+    def __init__(self, board_factory: Callable[..., bc.Board] = bc.SimpleBoard, dispatcher: ls.Dispatcher = None,
+                 bus: EventBus = None):
+        """
+        :param board_factory: board class of the created sessions
+        :param dispatcher: dispatcher shared by the events of all sessions, e.g. one BatchingDispatcher
+                           delivering the events of every game on a single worker thread
+        :param bus: EventBus the events of the sessions are published on, a new one by default
+        """
+        self.board_factory = board_factory
+        self.dispatcher = dispatcher
+        self.bus = bus if bus is not None else EventBus()
+        self.__sessions: Dict[int, GameSession] = {}
+        self.__game_ids = itertools.count(1)
+        self.__lock = threading.Lock()
+
+    def create_session(self, rng: random.Random = None) -> GameSession:
+        """
+        creates and registers a new session, the game is not started
+        :param rng: random number generator of the coin shuffler
+        :return: GameSession
+        """
+        session = GameSession(next(self.__game_ids), self.board_factory, rng, self.dispatcher)
+        forward(session.cell_listener, self.bus, CELL_UPDATED, session.game_id)
+        forward(session.player_switched_listener, self.bus, PLAYER_SWITCHED, session.game_id)
+        with self.__lock:
+            self.__sessions[session.game_id] = session
+        return session
+
+    def get_session(self, game_id: int) -> GameSession:
+        """
+        :param game_id: id of the session
+        :return: GameSession, raises KeyError for unknown ids
+        """
+        return self.__sessions[game_id]
+
+    def end_session(self, game_id: int) -> GameSession:
+        """
+        removes the session from the registry
+        :param game_id: id of the session
+        :return: the removed GameSession, raises KeyError for unknown ids
+        """
+        with self.__lock:
+            return self.__sessions.pop(game_id)
+
+    def get_session_ids(self) -> List[int]:
+        with self.__lock:
+            return list(self.__sessions)
+
+    def get_session_count(self) -> int:
+        return len(self.__sessions)
@@ -0,0 +1,210 @@
+"""
+self play simulator
+
+games are played between two policies, the coins are dealt by SimpleCoinShuffler and the
+turns are handed out by SimplePlayerControllerQueue. a run is cut into shards of games which
+are played on a process pool, results are yielded as soon as their shard is done.
+
+every game draws from its own random.Random seeded from the run seed and the game index,
+the results of a run therefore do not depend on the number of workers or the shard size.
+
+run a simulation from the command line with
+    python -m components.simulator [game_count] [workers]
+"""
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+import components.board as bc
+from components.controllers import SimpleCoinShuffler
+from components.solver import Solver
+from components.verifier import is_line_completed
+
+_SEED_MULTIPLIER = 0x9E3779B97F4A7C15
+_SEED_MASK = (1 << 64) - 1
+
+
+class Policy:
+    """
+    base class for the move selection of a simulated player
+    policies are sent to the worker processes and have to be picklable
+    """
+
+    def select_move(self, board: bc.BitBoard, coin: bc.Coin, rng: random.Random) -> int:
+        """
+        chooses the cell to place the coin on
+        :param board: current position, must not be modified
+        :param coin: coin of the player to move
+        :param rng: random number generator of the game
+        :return: bit index of an empty cell
+        """
+        raise NotImplemented
+
+
+class RandomPolicy(Policy):
+    """
+    plays a uniformly random empty cell
+    """
+
+    def select_move(self, board: bc.BitBoard, coin: bc.Coin, rng: random.Random) -> int:
+        empty_indices = bc.MASK_INDICES[board.get_empty_mask()]
+        return empty_indices[int(rng.random() * len(empty_indices))]
+
+
+class PerfectPolicy(Policy):
+    """
+    plays the solver's best move, the solver and its table are kept per process
+    """
+    __solver = None
+
+    def select_move(self, board: bc.BitBoard, coin: bc.Coin, rng: random.Random) -> int:
+        if PerfectPolicy.__solver is None:
+            PerfectPolicy.__solver = Solver()
+        if coin == bc.Coin.PIECE_X:
+            return PerfectPolicy.__solver.solve_masks(board.x_bits, board.o_bits)[1]
+        return PerfectPolicy.__solver.solve_masks(board.o_bits, board.x_bits)[1]
+
+
+class GameResult(NamedTuple):
+    game_index: int
+    # Coin of the winner, Coin.EMPTY for a draw
+    winner: bc.Coin
+    # coin dealt to the host player
+    host_coin: bc.Coin
+    # bit indices of the cells in the order they were played
+    moves: Tuple[int, ...]
+
+
+class SimulationReport(NamedTuple):
+    game_count: int
+    worker_count: int
+    elapsed_seconds: float
+    x_wins: int
+    o_wins: int
+    draws: int
+
+    def get_games_per_second(self) -> float:
+        return self.game_count / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def get_games_per_second_per_core(self) -> float:
+        return self.get_games_per_second() / max(self.worker_count, 1)
+
+
+def game_seed(seed: int, game_index: int) -> int:
+    """
+    derives the seed of a single game from the seed of the run
+    :param seed: seed of the run
+    :param game_index: index of the game in the run
+    :return: 64 bit seed
+    """
+    return (seed * _SEED_MULTIPLIER + game_index + 1) * _SEED_MULTIPLIER & _SEED_MASK
+
+
+def play_game(game_index: int, seed: int, host_policy: Policy, client_policy: Policy) -> GameResult:
+    """
+    plays a single game, the player holding the X coin opens
+    :param game_index: index of the game in the run
+    :param seed: seed of the run
+    :param host_policy: policy of the host player
+    :param client_policy: policy of the client player
+    :return: GameResult
+    """
+    rng = random.Random(game_seed(seed, game_index))
+    host_player = bc.BasePlayer(is_host=True)
+    client_player = bc.BasePlayer(is_host=False)
+    SimpleCoinShuffler(host_player, client_player, rng=rng).shuffle_deck()
+    controller = bc.SimplePlayerControllerQueue()
+    if host_player.coin == bc.Coin.PIECE_X:
+        controller.set_player_queue([host_player, client_player])
+    else:
+        controller.set_player_queue([client_player, host_player])
+
+    board = bc.BitBoard()
+    moves = []
+    winner = bc.Coin.EMPTY
+    while board.get_empty_mask():
+        player = controller.get_current_player()
+        policy = host_policy if player.is_host else client_policy
+        index = policy.select_move(board, player.coin, rng)
+        board.apply_move(index, player.coin)
+        moves.append(index)
+        coin_mask = board.x_bits if player.coin == bc.Coin.PIECE_X else board.o_bits
+        if is_line_completed(coin_mask, index):
+            winner = player.coin
+            break
+        controller.round_completed()
+    return GameResult(game_index, winner, host_player.coin, tuple(moves))
+
+
+def play_shard(first_index: int, game_count: int, seed: int,
+               host_policy: Policy, client_policy: Policy) -> List[GameResult]:
+    """
+    plays a consecutive range of games, the unit of work sent to the worker processes
+    :return: list of GameResult
+    """
+    return [play_game(index, seed, host_policy, client_policy)
+            for index in range(first_index, first_index + game_count)]
+
+
+class Simulator:
+    """
+    plays batches of games between two policies on a process pool
+
+    with worker_count 0 the games are played in the calling process
+    """
+
+    def __init__(self, host_policy: Policy, client_policy: Policy,
+                 worker_count: int = None, shard_size: int = 250):
+        self.host_policy = host_policy
+        self.client_policy = client_policy
+        self.worker_count = worker_count if worker_count is not None else os.cpu_count() or 1
+        self.shard_size = shard_size
+        self.report: Optional[SimulationReport] = None
+
+    def run(self, game_count: int, seed: int = 0) -> Iterator[GameResult]:
+        """
+        plays the games and yields the results shard by shard as they complete
+        the order of the results is not deterministic, their contents are
+        self.report holds the statistics of the run once the iterator is exhausted
+        :param game_count: number of games to be played
+        :param seed: seed of the run
+        :return: iterator of GameResult
+        """
+        self.report = None
+        counts = {bc.Coin.PIECE_X: 0, bc.Coin.PIECE_O: 0, bc.Coin.EMPTY: 0}
+        start = time.perf_counter()
+        for result in self.__play(game_count, seed):
+            counts[result.winner] += 1
+            yield result
+        self.report = SimulationReport(game_count, max(self.worker_count, 1), time.perf_counter() - start,
+                                       counts[bc.Coin.PIECE_X], counts[bc.Coin.PIECE_O], counts[bc.Coin.EMPTY])
+
+    def __play(self, game_count: int, seed: int) -> Iterator[GameResult]:
+        shards = [(first_index, min(self.shard_size, game_count - first_index))
+                  for first_index in range(0, game_count, self.shard_size)]
+        if self.worker_count == 0:
+            for first_index, count in shards:
+                yield from play_shard(first_index, count, seed, self.host_policy, self.client_policy)
+            return
+        executor = ProcessPoolExecutor(max_workers=self.worker_count)
+        try:
+            futures = [executor.submit(play_shard, first_index, count, seed, self.host_policy, self.client_policy)
+                       for first_index, count in shards]
+            for future in as_completed(futures):
+                yield from future.result()
+        finally:
+            # shards not yet started are dropped when the caller stops iterating early
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    arguments = [int(argument) for argument in sys.argv[1:]]
+    simulator = Simulator(RandomPolicy(), RandomPolicy(), *arguments[1:2])
+    for _ in simulator.run(arguments[0] if arguments else 100000):
+        pass
+    report = simulator.report
+    print(f"{report.game_count} games on {report.worker_count} workers in {report.elapsed_seconds:.2f}s")
+    print(f"X wins {report.x_wins}, O wins {report.o_wins}, draws {report.draws}")
+    print(f"{report.get_games_per_second():.0f} games/s, {report.get_games_per_second_per_core():.0f} games/s per core")
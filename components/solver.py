@@ -0,0 +1,192 @@
+from typing import Dict, Optional, Tuple
+import components.board as bc
+from components.verifier import HAS_LINE, is_line_completed
+from components.symmetry import CELL_PERMUTATIONS, INVERSE, canonical_key
+
+# bound types of the transposition table entries
+EXACT = 0x01
+LOWER_BOUND = 0x02
+UPPER_BOUND = 0x03
+
+# centre first, then the corners, then the edges
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+_INFINITY = 100
+
+
+class TranspositionTable:
+    """
+    cache of solved positions shared between searches
+
+    entries are keyed by position_key and hold tuple(score, bound type, best move index)
+    the move index is stored in the canonical orientation of the position
+    a single table may be handed to any number of Solver objects and kept for the lifetime of the process
+    """
+
+    def __init__(self):
+        self.entries: Dict[int, Tuple[int, int, int]] = {}
+        self.lookups = 0
+        self.hits = 0
+
+    def probe(self, key: int) -> Optional[Tuple[int, int, int]]:
+        """
+        reads the entry stored for the position
+        :param key: position key
+        :return: (score, bound type, move index), None if the position is unknown
+        """
+        self.lookups += 1
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+        return entry
+
+    def store(self, key: int, score: int, bound: int, move: int):
+        """
+        stores the search result of the position
+        :param key: position key
+        :param score: negamax score from the point of view of the side to move
+        :param bound: EXACT, LOWER_BOUND or UPPER_BOUND
+        :param move: index of the best move found, -1 if there is none
+        :return: None
+        """
+        self.entries[key] = (score, bound, move)
+
+    def get_hit_rate(self) -> float:
+        """
+        returns the fraction of probes answered by the table
+        :return: float in range 0-1
+        """
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def reset_statistics(self):
+        self.lookups = 0
+        self.hits = 0
+
+    def clear(self):
+        self.entries.clear()
+        self.reset_statistics()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def position_key(own_mask: int, opponent_mask: int) -> Tuple[int, int]:
+    """
+    key of a position seen from the side to move
+    the colour of the coins does not matter, only whose turn it is,
+    and all 8 symmetric variants of a position share the key
+    :param own_mask: 9 bit mask of the coins of the side to move
+    :param opponent_mask: 9 bit mask of the coins of the opponent
+    :return: (key, transform mapping the position to its canonical orientation)
+    """
+    return canonical_key(own_mask, opponent_mask)
+
+
+def score_to_value(score: int) -> int:
+    """
+    converts the negamax score to the game theoretic value
+    :param score: search score
+    :return: 1 for a win, 0 for a draw, -1 for a loss
+    """
+    return (score > 0) - (score < 0)
+
+
+class Solver:
+    """
+    perfect play solver based on negamax search with alpha-beta pruning
+
+    scores are seen from the side to move, a win scores 1 + the number of cells
+    left empty so that faster wins are preferred, a draw scores 0
+    """
+
+    def __init__(self, table: TranspositionTable = None):
+        self.table = table if table is not None else TranspositionTable()
+
+    def solve(self, board: bc.Board, coin_to_move: bc.Coin) -> Tuple[int, Optional[Tuple[int, int]]]:
+        """
+        finds the best move for the side to move
+        :param board: position to be solved
+        :param coin_to_move: Coin.PIECE_X or Coin.PIECE_O
+        :return: (game theoretic value, (x_coord, y_coord)), the move is None for finished games
+        """
+        x_mask, o_mask = board.get_coin_masks()
+        if coin_to_move == bc.Coin.PIECE_X:
+            score, move = self.solve_masks(x_mask, o_mask)
+        else:
+            score, move = self.solve_masks(o_mask, x_mask)
+        return score_to_value(score), (bc.index_to_cell(move) if move >= 0 else None)
+
+    def solve_masks(self, own_mask: int, opponent_mask: int) -> Tuple[int, int]:
+        """
+        finds the best move for the position described by the coin masks
+        :param own_mask: 9 bit mask of the coins of the side to move
+        :param opponent_mask: 9 bit mask of the coins of the opponent
+        :return: (score, move index), move index is -1 for finished games
+        """
+        if HAS_LINE[opponent_mask]:
+            return -(bc.POPCOUNT[bc.FULL_MASK & ~(own_mask | opponent_mask)] + 1), -1
+        if HAS_LINE[own_mask]:
+            return bc.POPCOUNT[bc.FULL_MASK & ~(own_mask | opponent_mask)] + 1, -1
+        if own_mask | opponent_mask == bc.FULL_MASK:
+            return 0, -1
+        key, transform = position_key(own_mask, opponent_mask)
+        entry = self.table.probe(key)
+        if entry is None or entry[1] != EXACT or entry[2] < 0:
+            self._negamax(own_mask, opponent_mask, -_INFINITY, _INFINITY)
+            entry = self.table.entries[key]
+        return entry[0], CELL_PERMUTATIONS[INVERSE[transform]][entry[2]]
+
+    def _negamax(self, own_mask: int, opponent_mask: int, alpha: int, beta: int) -> int:
+        """
+        recursive alpha-beta search, the position is not terminal
+        :return: score of the position
+        """
+        table = self.table
+        key, transform = canonical_key(own_mask, opponent_mask)
+        original_alpha = alpha
+        entry = table.probe(key)
+        hint = -1
+        if entry is not None:
+            score, bound, hint = entry
+            hint = CELL_PERMUTATIONS[INVERSE[transform]][hint]
+            if bound == EXACT:
+                return score
+            if bound == LOWER_BOUND:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return score
+
+        empty_mask = bc.FULL_MASK & ~(own_mask | opponent_mask)
+        remaining = bc.POPCOUNT[empty_mask] - 1
+        best_score = -_INFINITY
+        best_move = -1
+        for index in (hint,) + MOVE_ORDER if hint >= 0 else MOVE_ORDER:
+            bit = 1 << index
+            if not empty_mask & bit:
+                continue
+            empty_mask &= ~bit
+            new_mask = own_mask | bit
+            if is_line_completed(new_mask, index):
+                score = remaining + 1
+            elif not remaining:
+                score = 0
+            else:
+                score = -self._negamax(opponent_mask, new_mask, -beta, -alpha)
+            if score > best_score:
+                best_score = score
+                best_move = index
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        table.store(key, best_score, bound, CELL_PERMUTATIONS[transform][best_move])
+        return best_score
@@ -0,0 +1,97 @@
+from typing import Dict, Tuple
+import components.board as bc
+
+# the 8 symmetries of the square (D4 group) as coordinate mappings
+TRANSFORMS = (
+    lambda x, y: (x, y),            # identity
+    lambda x, y: (y, 2 - x),        # rotation by 90 degrees
+    lambda x, y: (2 - x, 2 - y),    # rotation by 180 degrees
+    lambda x, y: (2 - y, x),        # rotation by 270 degrees
+    lambda x, y: (x, 2 - y),        # reflection along the x axis
+    lambda x, y: (2 - x, y),        # reflection along the y axis
+    lambda x, y: (y, x),            # reflection along the main diagonal
+    lambda x, y: (2 - y, 2 - x),    # reflection along the anti diagonal
+)
+
+IDENTITY = 0
+
+# transform undoing each transform, only the quarter rotations are not their own inverse
+INVERSE = (0, 3, 2, 1, 4, 5, 6, 7)
+
+# CELL_PERMUTATIONS[transform][index] is the index the cell moves to
+CELL_PERMUTATIONS = tuple(tuple(bc.cell_index(*transform(*bc.index_to_cell(index))) for index in range(9))
+                          for transform in TRANSFORMS)
+
+
+def _permute_mask(mask: int, permutation: Tuple[int, ...]) -> int:
+    result = 0
+    for index in range(9):
+        if mask >> index & 1:
+            result |= 1 << permutation[index]
+    return result
+
+
+# PERMUTED_MASKS[transform][mask] is the mask after applying the transform
+PERMUTED_MASKS = tuple(tuple(_permute_mask(mask, permutation) for mask in range(bc.FULL_MASK + 1))
+                       for permutation in CELL_PERMUTATIONS)
+
+
+def canonical_masks(x_mask: int, o_mask: int) -> Tuple[int, int, int]:
+    """
+    maps the position to the representative of its symmetry class,
+    the representative is the orientation with the smallest x_mask | o_mask << 9
+    :param x_mask: 9 bit mask of the X coins
+    :param o_mask: 9 bit mask of the O coins
+    :return: (canonical x_mask, canonical o_mask, transform applied to reach it)
+    """
+    best_key = x_mask | o_mask << 9
+    best_transform = IDENTITY
+    for transform in range(1, 8):
+        table = PERMUTED_MASKS[transform]
+        key = table[x_mask] | table[o_mask] << 9
+        if key < best_key:
+            best_key = key
+            best_transform = transform
+    return best_key & bc.FULL_MASK, best_key >> 9, best_transform
+
+
+def canonical_key(x_mask: int, o_mask: int) -> Tuple[int, int]:
+    """
+    hash of the position shared by all of its symmetric variants
+    :param x_mask: 9 bit mask of the X coins
+    :param o_mask: 9 bit mask of the O coins
+    :return: (18 bit key, transform applied to reach the canonical orientation)
+    """
+    x_mask, o_mask, transform = canonical_masks(x_mask, o_mask)
+    return x_mask | o_mask << 9, transform
+
+
+def canonical_map(coin_map: Dict[Tuple[int, int], bc.Coin]) -> Tuple[Dict[Tuple[int, int], bc.Coin], int]:
+    """
+    canonicalises a coin layout in the format returned by Board.get_map
+    :param coin_map: dict of coord, coins
+    :return: (canonical dict of coord, coins, transform applied to reach it)
+    """
+    transform = canonical_masks(*bc.masks_from_map(coin_map))[2]
+    return {transform_cell(x, y, transform): coin for (x, y), coin in coin_map.items()}, transform
+
+
+def canonicalize(board: bc.Board) -> Tuple[int, int, int]:
+    """
+    canonicalises the coin layout of any Board
+    :param board: board to be read
+    :return: (canonical x_mask, canonical o_mask, transform applied to reach it)
+    """
+    return canonical_masks(*board.get_coin_masks())
+
+
+def transform_cell(x, y, transform: int) -> Tuple[int, int]:
+    """
+    applies the transform to the coordinates
+    use INVERSE[transform] to map a move on the canonical board back to the original orientation
+    :param x: x coordinate
+    :param y: y coordinate
+    :param transform: index into TRANSFORMS
+    :return: (x_coord, y_coord)
+    """
+    return TRANSFORMS[transform](x, y)
@@ -0,0 +1,50 @@
+from unittest import TestCase, skipIf
+from components.board import *
+from components.verifier import ResultVerifier
+
+try:
+    import numpy as np
+    from components.batch import *
+except ImportError:
+    np = None
+
+
+@skipIf(np is None, "numpy is not installed")
+class TestBatch(TestCase):
+
+    def setUp(self) -> None:
+        self.boards = [SimpleBoard() for _ in range(4)]
+        self.boards[1].set_cell(1, 1, Coin.PIECE_X)
+        self.boards[1].set_cell(0, 2, Coin.PIECE_O)
+        for y in range(3):
+            self.boards[2].set_cell(2, y, Coin.PIECE_O)
+        for index, symbol in enumerate("XOXXOOOXX"):
+            self.boards[3].set_cell(*index_to_cell(index), Coin.PIECE_X if symbol == "X" else Coin.PIECE_O)
+
+    def test_round_trip(self):
+        cells = from_maps(board.get_map() for board in self.boards)
+        self.assertEqual(cells.shape, (4, 9))
+        self.assertEqual(cells.dtype, np.uint8)
+        self.assertEqual(to_maps(cells), [board.get_map() for board in self.boards])
+
+    def test_evaluate(self):
+        result = evaluate(from_maps(board.get_map() for board in self.boards))
+        for row, board in enumerate(self.boards):
+            verifier = ResultVerifier(board)
+            winner = verifier.winner()
+            self.assertEqual(result.winner[row], (winner or Coin.EMPTY).value)
+            self.assertEqual(result.is_terminal[row], verifier.is_terminal())
+            self.assertEqual(result.move_count[row], sum(coin != Coin.EMPTY for coin in board.get_map().values()))
+        self.assertEqual(result.legal_moves[0].sum(), 9)
+        self.assertEqual(result.legal_moves[1].sum(), 7)
+        self.assertFalse(result.legal_moves[1][cell_index(1, 1)])
+        self.assertEqual(result.legal_moves[2].sum(), 0)
+
+    def test_coin_masks(self):
+        x_masks, o_masks = coin_masks(from_maps(board.get_map() for board in self.boards))
+        self.assertEqual(list(zip(x_masks.tolist(), o_masks.tolist())),
+                         [board.get_coin_masks() for board in self.boards])
+
+    def test_invalid_shape(self):
+        with self.assertRaises(ValueError):
+            evaluate(np.zeros((2, 8), dtype=np.uint8))
@@ -1,5 +1,7 @@
+import threading
 from unittest import TestCase
 from components.board import *
+import components.listeners
 
 
 class TestBoard(TestCase):
@@ -19,16 +21,30 @@ class TestBoard(TestCase):
         player1 = BasePlayer(is_host=True)
         self.assertTrue(player1.is_host)
         player2 = BasePlayer(is_host=False)
-        self.assertEqual(player2.get_name()[-1:], "2")
+        self.assertEqual(player2.player_id, player1.player_id + 1)
+        self.assertEqual(player2.get_name(), f"Player_{player2.player_id}")
+        last_id = player2.player_id
         player2 = None
         player1 = None
+        # ids are not reused once a player is gone
         player2 = BasePlayer(is_host=True)
-        self.assertEqual(player2.get_name()[-1:], "1")
+        self.assertEqual(player2.player_id, last_id + 1)
+        with self.assertRaises(AttributeError):
+            player2.score = 0
         player2.set_turn(True)
         self.assertTrue(player2.is_holding_turn)
         player2.set_turn(False)
         self.assertFalse(player2.is_holding_turn)
 
+    def test_compact_layout(self):
+        for board in (SimpleBoard(), BitBoard(), MNKBoard(3, 3, 3)):
+            self.assertFalse(hasattr(board, "__dict__"))
+        board = SimpleBoard()
+        board.set_cell(2, 0, Coin.PIECE_X)
+        self.assertEqual(bytes(board.cells), bytes([3, 3, 3, 3, 3, 3, 1, 3, 3]))
+        with self.assertRaises(KeyError):
+            board.set_cell(3, 0, Coin.PIECE_X)
+
     def test_player_controller(self):
         player1 = BasePlayer(is_host=True)
         player2 = BasePlayer(is_host=False)
@@ -45,3 +61,195 @@ class TestBoard(TestCase):
         self.assertEqual(player3, controller.get_current_player())
         controller.set_player_queue([player2, player3])
         self.assertEqual(player2, controller.get_current_player())
+
+
+class TestBitBoard(TestCase):
+
+    def test_board(self):
+        board = BitBoard()
+        for key, value in board.get_map().items():
+            self.assertEqual(board.get_map()[key], Coin.EMPTY)
+        self.assertEqual(len(board.get_map()), 9)
+        board.set_cell(0, 1, Coin.PIECE_O)
+        self.assertEqual(board.get_cell(0, 1), Coin.PIECE_O)
+        board.set_cell(0, 2, Coin.PIECE_X)
+        self.assertEqual(board.get_cell(0, 2), Coin.PIECE_X)
+        board.set_cell(0, 2, Coin.PIECE_O)
+        self.assertEqual(board.get_cell(0, 2), Coin.PIECE_O)
+        board.clear_board()
+        self.assertEqual(board.get_cell(0, 2), Coin.EMPTY)
+        with self.assertRaises(KeyError):
+            board.get_cell(3, 0)
+
+    def test_apply_and_undo_move(self):
+        board = BitBoard()
+        board.apply_move(cell_index(1, 1), Coin.PIECE_X)
+        board.apply_move(cell_index(2, 0), Coin.PIECE_O)
+        self.assertEqual(board.get_cell(1, 1), Coin.PIECE_X)
+        self.assertEqual(board.get_map()[(2, 0)], Coin.PIECE_O)
+        self.assertEqual(board.get_move_count(), 2)
+        self.assertEqual(MASK_INDICES[board.get_empty_mask()], (0, 1, 2, 3, 5, 7, 8))
+        board.undo_move(cell_index(1, 1))
+        self.assertEqual(board.get_cell(1, 1), Coin.EMPTY)
+        self.assertEqual(board.get_move_count(), 1)
+        self.assertEqual(index_to_cell(7), (2, 1))
+
+
+class TestMNKBoard(TestCase):
+
+    def test_board(self):
+        board = MNKBoard(7, 7, 4)
+        self.assertEqual(len(board.get_map()), 49)
+        for key, value in board.get_map().items():
+            self.assertEqual(board.get_map()[key], Coin.EMPTY)
+        board.set_cell(6, 5, Coin.PIECE_O)
+        self.assertEqual(board.get_cell(6, 5), Coin.PIECE_O)
+        self.assertEqual(board.get_map()[(6, 5)], Coin.PIECE_O)
+        board.clear_board()
+        self.assertEqual(board.get_cell(6, 5), Coin.EMPTY)
+        with self.assertRaises(KeyError):
+            board.get_cell(7, 0)
+        with self.assertRaises(ValueError):
+            MNKBoard(3, 3, 4)
+
+    def test_incremental_winner(self):
+        board = MNKBoard(15, 15, 5)
+        for step in range(4):
+            board.set_cell(3 + step, 10 - step, Coin.PIECE_X)
+            board.set_cell(0, step, Coin.PIECE_O)
+        self.assertIsNone(board.get_winner())
+        board.set_cell(7, 6, Coin.PIECE_X)
+        self.assertEqual(board.get_winner(), Coin.PIECE_X)
+        self.assertEqual(board.get_move_count(), 9)
+        board.set_cell(5, 8, Coin.EMPTY)
+        self.assertIsNone(board.get_winner())
+        board.set_cell(0, 4, Coin.PIECE_O)
+        self.assertEqual(board.get_winner(), Coin.PIECE_O)
+        board.clear_board()
+        self.assertIsNone(board.get_winner())
+        self.assertEqual(board.get_move_count(), 0)
+
+    def test_listener(self):
+        class Recorder(components.listeners.CellUpdateListenerInterface):
+            def __init__(self):
+                self.messages = []
+
+            def on_cell_updated(self, listener):
+                self.messages.append(listener)
+
+        recorder = Recorder()
+        components.listeners.OnCellUpdatedListener().register_listener(recorder)
+        try:
+            board = MNKBoard(4, 4, 3)
+            board.set_cell(3, 3, Coin.PIECE_X)
+            board.clear_board()
+        finally:
+            components.listeners.OnCellUpdatedListener().unregister_listener(recorder)
+        self.assertEqual(recorder.messages, [(3, 3, Coin.PIECE_X), (-1, -1, Coin.EMPTY)])
+
+
+class TestMoveJournal(TestCase):
+
+    def test_undo_redo(self):
+        for board in (SimpleBoard(), BitBoard(), MNKBoard(3, 3, 3)):
+            self.assertFalse(board.undo())
+            board.set_cell(1, 1, Coin.PIECE_X)
+            board.set_cell(0, 0, Coin.PIECE_O)
+            board.set_cell(0, 0, Coin.PIECE_X)
+            self.assertTrue(board.undo())
+            self.assertEqual(board.get_cell(0, 0), Coin.PIECE_O)
+            self.assertTrue(board.undo())
+            self.assertEqual(board.get_cell(0, 0), Coin.EMPTY)
+            self.assertTrue(board.redo())
+            self.assertEqual(board.get_cell(0, 0), Coin.PIECE_O)
+            board.truncate()
+            self.assertFalse(board.redo())
+            self.assertTrue(board.undo())
+            board.set_cell(2, 2, Coin.PIECE_O)
+            self.assertFalse(board.redo())
+            self.assertEqual(board.get_cell(1, 1), Coin.PIECE_X)
+            self.assertEqual(board.get_cell(2, 2), Coin.PIECE_O)
+            board.clear_board()
+            self.assertFalse(board.undo())
+
+    def test_slots_reused(self):
+        board = BitBoard()
+        for _ in range(3):
+            board.set_cell(1, 2, Coin.PIECE_O)
+            board.set_cell(2, 1, Coin.PIECE_X)
+            board.undo()
+            board.undo()
+        self.assertEqual(len(board.journal.xs), 2)
+        self.assertEqual(board.get_move_count(), 0)
+
+    def test_winner_undone(self):
+        board = MNKBoard(4, 4, 3)
+        for y in range(3):
+            board.set_cell(2, y, Coin.PIECE_X)
+        self.assertEqual(board.get_winner(), Coin.PIECE_X)
+        board.undo()
+        self.assertIsNone(board.get_winner())
+        board.redo()
+        self.assertEqual(board.get_winner(), Coin.PIECE_X)
+
+
+class TestSnapshot(TestCase):
+
+    def test_snapshot_is_immutable(self):
+        for board in (SimpleBoard(), BitBoard(), MNKBoard(3, 3, 3)):
+            board.set_cell(1, 1, Coin.PIECE_X)
+            snapshot = board.snapshot()
+            board.set_cell(0, 0, Coin.PIECE_O)
+            board.undo()
+            board.undo()
+            self.assertEqual(snapshot.get_cell(1, 1), Coin.PIECE_X)
+            self.assertEqual(snapshot.get_cell(0, 0), Coin.EMPTY)
+            self.assertEqual(snapshot.version, 1)
+            with self.assertRaises(TypeError):
+                snapshot.get_map()[(2, 2)] = Coin.PIECE_O
+            board.clear_board()
+            self.assertEqual(snapshot.get_cell(1, 1), Coin.PIECE_X)
+            self.assertEqual(board.get_cell(1, 1), Coin.EMPTY)
+
+    def test_storage_is_shared(self):
+        board = SimpleBoard()
+        live_cells = board.cells
+        first = board.snapshot()
+        second = board.snapshot()
+        self.assertIs(board.cells, live_cells)
+        board.set_cell(2, 1, Coin.PIECE_O)
+        # the first write after a snapshot moves the board to a copy
+        self.assertIsNot(board.cells, live_cells)
+        self.assertEqual(live_cells[7], Coin.EMPTY.value)
+        self.assertEqual(first.get_map(), second.get_map())
+        board.set_cell(2, 2, Coin.PIECE_O)
+        self.assertEqual(first.get_cell(2, 2), Coin.EMPTY)
+        third = board.snapshot()
+        self.assertEqual(third.get_coin_masks(), board.get_coin_masks())
+        self.assertEqual(third.hash, board.hash)
+
+    def test_concurrent_readers(self):
+        board = SimpleBoard()
+        moves = [(index_to_cell(index), Coin.PIECE_X if index % 2 else Coin.PIECE_O) for index in range(9)]
+        stop = threading.Event()
+
+        def writer():
+            while not stop.is_set():
+                for (x, y), coin in moves:
+                    board.set_cell(x, y, coin)
+                while board.undo():
+                    pass
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            for _ in range(2000):
+                snapshot = board.snapshot()
+                reference = SimpleBoard()
+                for (x, y), coin in snapshot.get_map().items():
+                    if coin != Coin.EMPTY:
+                        reference._write_cell(x, y, coin)
+                self.assertEqual(reference.hash, snapshot.hash)
+        finally:
+            stop.set()
+            thread.join()
@@ -1,3 +1,4 @@
+import random
 from unittest import TestCase
 from components.board import *
 from components.controllers import *
@@ -33,3 +34,10 @@ class TestSimpleCoinShuffler(TestCase):
         self.assertEqual(self.host_player_coin, self.host_player.coin)
         self.controller.shuffle_deck()
         self.assertNotEqual(self.host_player_coin, self.host_player.coin)
+
+    def test_seeded_shuffle(self):
+        for seed in range(8):
+            SimpleCoinShuffler(self.host_player, self.client_player, rng=random.Random(seed)).shuffle_deck()
+            self.host_player_coin = self.host_player.coin
+            SimpleCoinShuffler(self.host_player, self.client_player, rng=random.Random(seed)).shuffle_deck()
+            self.assertEqual(self.host_player_coin, self.host_player.coin)
@@ -0,0 +1,67 @@
+import gc
+from unittest import TestCase
+from components.board import Coin
+from components.events import *
+from components.session import SessionManager
+
+
+class Collector:
+    def __init__(self):
+        self.messages = []
+
+    def on_message(self, message):
+        self.messages.append(message)
+
+
+class TestEventBus(TestCase):
+
+    def test_keys_and_predicates(self):
+        bus = EventBus()
+        every, game_one, centre = [], [], []
+        bus.subscribe(CELL_UPDATED, every.append)
+        bus.subscribe(CELL_UPDATED, game_one.append, key=1)
+        bus.subscribe(CELL_UPDATED, centre.append, predicate=lambda message: message[:2] == (1, 1))
+        self.assertEqual(bus.publish(CELL_UPDATED, (1, 1, Coin.PIECE_X), key=1), 3)
+        self.assertEqual(bus.publish(CELL_UPDATED, (0, 1, Coin.PIECE_O), key=2), 1)
+        self.assertEqual(bus.publish(PLAYER_SWITCHED, (None, True), key=1), 0)
+        self.assertEqual(every, [(1, 1, Coin.PIECE_X), (0, 1, Coin.PIECE_O)])
+        self.assertEqual(game_one, [(1, 1, Coin.PIECE_X)])
+        self.assertEqual(centre, [(1, 1, Coin.PIECE_X)])
+        with self.assertRaises(TypeError):
+            bus.publish(CELL_UPDATED, "not a tuple")
+
+    def test_cancel(self):
+        bus = EventBus()
+        messages = []
+        subscriptions = [bus.subscribe(DICE_ROLLED, messages.append, key=7) for _ in range(3)]
+        subscriptions[1].cancel()
+        subscriptions[1].cancel()
+        self.assertEqual(bus.get_subscriber_count(DICE_ROLLED, 7), 2)
+        with subscriptions[0]:
+            bus.publish(DICE_ROLLED, 4, key=7)
+        bus.publish(DICE_ROLLED, 5, key=7)
+        self.assertEqual(messages, [4, 4, 5])
+
+    def test_weak_subscribers(self):
+        bus = EventBus()
+        collector = Collector()
+        subscription = bus.subscribe(DICE_ROLLED, collector.on_message)
+        bus.publish(DICE_ROLLED, 1)
+        self.assertEqual(collector.messages, [1])
+        collector = None
+        gc.collect()
+        self.assertFalse(subscription.active)
+        self.assertEqual(bus.get_subscriber_count(DICE_ROLLED), 0)
+        self.assertEqual(bus.publish(DICE_ROLLED, 2), 0)
+
+    def test_sessions_publish_by_game_id(self):
+        manager = SessionManager()
+        first, second = manager.create_session(), manager.create_session()
+        moves = []
+        manager.bus.subscribe(CELL_UPDATED, moves.append, key=second.game_id,
+                              predicate=lambda message: message[0] >= 0)
+        first.start()
+        second.start()
+        first.play_move(0, 0)
+        second.play_move(2, 2)
+        self.assertEqual(moves, [(2, 2, Coin.PIECE_X)])
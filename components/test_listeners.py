@@ -0,0 +1,240 @@
+import asyncio
+import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from components.listeners import *
+
+
+class Recorder(CellUpdateListenerInterface):
+    def __init__(self, gate: threading.Event = None):
+        self.messages = []
+        self.batches = []
+        self.threads = set()
+        self.gate = gate
+
+    def update_batch(self, messages):
+        if self.gate is not None:
+            self.gate.wait()
+        self.batches.append(list(messages))
+        self.threads.add(threading.current_thread())
+        CellUpdateListenerInterface.update_batch(self, messages)
+
+    def on_cell_updated(self, listener):
+        self.messages.append(listener)
+
+
+class TestSynchronousDispatcher(TestCase):
+
+    def test_delivered_in_place(self):
+        listener = CellUpdatedListener()
+        seen = []
+
+        class Reader(CellUpdateListenerInterface):
+            def on_cell_updated(self, message):
+                seen.append((message, listener.get_update()))
+                if message == 1:
+                    # fired from a subscriber, the outer message is restored afterwards
+                    listener.event_update(2)
+                    seen.append(listener.get_update())
+
+        listener.register_listener(Reader())
+        listener.event_update(1)
+        self.assertEqual(seen, [(1, 1), (2, 2), 1])
+        self.assertIsNone(listener.get_update())
+
+
+class TestBatchingDispatcher(TestCase):
+
+    def test_bursts_are_coalesced(self):
+        gate = threading.Event()
+        dispatcher = BatchingDispatcher(max_batch_size=16)
+        listener = CellUpdatedListener(dispatcher)
+        recorder = Recorder(gate)
+        listener.register_listener(recorder)
+        try:
+            listener.event_update(0)
+            for message in range(1, 33):
+                listener.event_update(message)
+            gate.set()
+            dispatcher.flush()
+        finally:
+            dispatcher.close()
+        self.assertEqual(recorder.messages, list(range(33)))
+        self.assertLessEqual(max(len(batch) for batch in recorder.batches), 16)
+        self.assertLess(len(recorder.batches), 33)
+        self.assertNotIn(threading.current_thread(), recorder.threads)
+
+    def test_backpressure(self):
+        gate = threading.Event()
+        dispatcher = BatchingDispatcher(max_queue_size=2, max_batch_size=1, put_timeout=0.05)
+        listener = CellUpdatedListener(dispatcher)
+        recorder = Recorder(gate)
+        listener.register_listener(recorder)
+        try:
+            with self.assertRaises(queue.Full):
+                for message in range(4):
+                    listener.event_update(message)
+            gate.set()
+            dispatcher.flush()
+        finally:
+            dispatcher.close()
+        self.assertEqual(recorder.messages, [0, 1, 2])
+
+    def test_flush_from_subscriber(self):
+        dispatcher = BatchingDispatcher()
+        listener = CellUpdatedListener(dispatcher)
+
+        class Flushing(CellUpdateListenerInterface):
+            def on_cell_updated(self, message):
+                dispatcher.flush()
+
+        listener.register_listener(Flushing())
+        recorder = Recorder()
+        listener.register_listener(recorder)
+        listener.event_update(1)
+        worker = threading.Thread(target=dispatcher.flush, daemon=True)
+        worker.start()
+        worker.join(2)
+        self.assertFalse(worker.is_alive())
+        dispatcher.close()
+        self.assertEqual(recorder.messages, [1])
+
+    def test_close_races_dispatch(self):
+        dispatcher = BatchingDispatcher(max_queue_size=4)
+        listener = CellUpdatedListener(dispatcher)
+        recorder = Recorder()
+        listener.register_listener(recorder)
+        accepted = []
+
+        def fire(offset):
+            for message in range(offset, offset + 500):
+                try:
+                    listener.event_update(message)
+                except RuntimeError:
+                    return
+                accepted.append(message)
+
+        threads = [threading.Thread(target=fire, args=(offset,)) for offset in (0, 1000)]
+        for thread in threads:
+            thread.start()
+        dispatcher.close()
+        for thread in threads:
+            thread.join()
+        # every message accepted before the close is delivered and flush does not hang
+        flushing = threading.Thread(target=dispatcher.flush, daemon=True)
+        flushing.start()
+        flushing.join(2)
+        self.assertFalse(flushing.is_alive())
+        self.assertEqual(sorted(recorder.messages), sorted(accepted))
+        dispatcher.close()
+
+    def test_failing_subscriber(self):
+        class Failing(CellUpdateListenerInterface):
+            def on_cell_updated(self, message):
+                raise ValueError("broken subscriber")
+
+        for executor in (None, ThreadPoolExecutor(max_workers=2)):
+            dispatcher = BatchingDispatcher(executor=executor)
+            listener = CellUpdatedListener(dispatcher)
+            recorder = Recorder()
+            listener.register_listener(Failing())
+            listener.register_listener(recorder)
+            with self.assertLogs("components.listeners", level="ERROR"):
+                for message in range(3):
+                    listener.event_update(message)
+                dispatcher.close()
+            if executor is not None:
+                executor.shutdown()
+            self.assertEqual(recorder.messages, [0, 1, 2])
+
+    def test_executor(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            dispatcher = BatchingDispatcher(executor=executor)
+            first, second = CellUpdatedListener(dispatcher), PlayerSwitchedListener(dispatcher)
+            first_recorder, second_recorder = Recorder(), Recorder()
+            first.register_listener(first_recorder)
+            second.register_listener(second_recorder)
+            for message in range(10):
+                first.event_update(message)
+                second.event_update(-message)
+            dispatcher.close()
+        self.assertEqual(first_recorder.messages, list(range(10)))
+        self.assertEqual(second_recorder.batches[0][0], 0)
+        self.assertEqual(sum(second_recorder.batches, []), [-message for message in range(10)])
+
+    def test_asyncio_loop(self):
+        recorder = Recorder()
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            dispatcher = BatchingDispatcher(loop=loop)
+            listener = CellUpdatedListener(dispatcher)
+            listener.register_listener(recorder)
+            for message in range(5):
+                listener.event_update(message)
+            await loop.run_in_executor(None, dispatcher.close)
+            return threading.current_thread()
+
+        loop_thread = asyncio.run(main())
+        self.assertEqual(recorder.messages, list(range(5)))
+        self.assertEqual(recorder.threads, {loop_thread})
+
+
+class TestInstrumentation(TestCase):
+
+    def tearDown(self) -> None:
+        disable_instrumentation()
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(get_metrics())
+
+    def test_records_subscribers(self):
+        metrics = enable_instrumentation(DispatchMetrics(buckets=(0.001, 10.0)))
+        listener = CellUpdatedListener()
+        recorder = Recorder()
+        listener.register_listener(recorder)
+        listener.register_listener(Recorder())
+        for message in range(3):
+            listener.event_update(message)
+        dispatcher = BatchingDispatcher()
+        listener.set_dispatcher(dispatcher)
+        listener.event_update(3)
+        dispatcher.close()
+        with self.assertRaises(RuntimeError):
+            listener.event_update(4)
+        listener.set_dispatcher(SynchronousDispatcher())
+        disable_instrumentation()
+        listener.event_update(4)
+
+        self.assertEqual(recorder.messages, [0, 1, 2, 3, 4])
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["events"], {"CellUpdatedListener": 4})
+        (topic,) = snapshot["topics"]
+        self.assertEqual(topic["count"], 8)
+        self.assertEqual(topic["buckets"][-1], ("+Inf", 8))
+        (subscriber,) = snapshot["subscribers"]
+        self.assertEqual(subscriber["subscriber"], "Recorder")
+        self.assertEqual(subscriber["count"], 8)
+        self.assertEqual([bound for bound, _ in subscriber["buckets"]], ["0.001", "10.0", "+Inf"])
+
+        text = metrics.to_prometheus()
+        self.assertIn('listener_events_total{topic="CellUpdatedListener"} 4', text)
+        self.assertIn('listener_subscriber_seconds_bucket{topic="CellUpdatedListener",subscriber="Recorder",le="+Inf"} 8',
+                      text)
+        self.assertIn('listener_topic_seconds_count{topic="CellUpdatedListener"} 8', text)
+        self.assertEqual(json.loads(metrics.to_json())["events"], snapshot["events"])
+
+    def test_failing_subscriber_is_timed(self):
+        metrics = enable_instrumentation()
+
+        class Failing(CellUpdateListenerInterface):
+            def on_cell_updated(self, listener):
+                raise RuntimeError(listener)
+
+        listener = CellUpdatedListener()
+        listener.register_listener(Failing())
+        with self.assertRaises(RuntimeError):
+            listener.event_update(1)
+        self.assertEqual(metrics.snapshot()["subscribers"][0]["count"], 1)
@@ -0,0 +1,70 @@
+import os
+import tempfile
+from unittest import TestCase
+from components.board import *
+from components.lookup import *
+
+
+class TestPerfectPlayTable(TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "perfect_play.bin")
+        cls.position_count = write_table(cls.path)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.directory.cleanup()
+
+    def test_position_count(self):
+        self.assertEqual(self.position_count, 5478)
+
+    def test_lookup(self):
+        with PerfectPlayTable(self.path) as table:
+            board = SimpleBoard()
+            self.assertEqual(table.lookup(board), (0, [(x, y) for x in range(3) for y in range(3)]))
+            board.set_cell(0, 0, Coin.PIECE_X)
+            self.assertEqual(table.lookup(board), (0, [(1, 1)]))
+            board.set_cell(1, 1, Coin.PIECE_O)
+            board.set_cell(0, 1, Coin.PIECE_X)
+            self.assertEqual(table.lookup(board), (0, [(0, 2)]))
+            board.set_cell(0, 2, Coin.PIECE_O)
+            self.assertEqual(table.lookup(board), (0, [(2, 0)]))
+
+    def test_game_opened_by_o(self):
+        with PerfectPlayTable(self.path) as table:
+            board = BitBoard()
+            board.set_cell(1, 1, Coin.PIECE_O)
+            board.set_cell(0, 1, Coin.PIECE_X)
+            value, moves = table.lookup(board, Coin.PIECE_O)
+            self.assertEqual(value, 1)
+            self.assertEqual(moves, [(0, 0), (0, 2), (1, 0), (1, 2), (2, 0), (2, 2)])
+            board.set_cell(0, 1, Coin.PIECE_O)
+            with self.assertRaises(KeyError):
+                table.lookup(board)
+
+    def test_x_to_move_in_game_opened_by_o(self):
+        with PerfectPlayTable(self.path) as table:
+            board = BitBoard()
+            board.set_cell(1, 1, Coin.PIECE_O)
+            mirrored = BitBoard()
+            mirrored.set_cell(1, 1, Coin.PIECE_X)
+            self.assertEqual(table.lookup(board, Coin.PIECE_X), table.lookup(mirrored))
+            self.assertEqual(table.lookup(board), table.lookup(mirrored))
+
+    def test_terminal_position(self):
+        with PerfectPlayTable(self.path) as table:
+            board = BitBoard()
+            for y in range(3):
+                board.set_cell(0, y, Coin.PIECE_X)
+                board.set_cell(1, y, Coin.PIECE_O)
+            board.set_cell(1, 2, Coin.EMPTY)
+            self.assertEqual(table.lookup(board), (-1, []))
+
+    def test_invalid_file(self):
+        path = os.path.join(self.directory.name, "invalid.bin")
+        with open(path, "wb") as file:
+            file.write(b"\x00" * 64)
+        with self.assertRaises(ValueError):
+            PerfectPlayTable(path)
@@ -0,0 +1,76 @@
+import random
+from unittest import TestCase
+from components.board import *
+from components.session import *
+import components.listeners
+
+
+class Recorder(components.listeners.CellUpdateListenerInterface):
+    def __init__(self):
+        self.messages = []
+
+    def on_cell_updated(self, listener):
+        self.messages.append(listener)
+
+
+class TestGameSession(TestCase):
+
+    def test_events_are_isolated(self):
+        manager = SessionManager()
+        first, second = manager.create_session(), manager.create_session()
+        first_recorder, second_recorder, global_recorder = Recorder(), Recorder(), Recorder()
+        first.cell_listener.register_listener(first_recorder)
+        second.cell_listener.register_listener(second_recorder)
+        components.listeners.OnCellUpdatedListener().register_listener(global_recorder)
+        try:
+            first.start()
+            first.play_move(1, 1)
+        finally:
+            components.listeners.OnCellUpdatedListener().unregister_listener(global_recorder)
+        self.assertEqual(first_recorder.messages[-1], (1, 1, Coin.PIECE_X))
+        self.assertEqual(second_recorder.messages, [])
+        self.assertEqual(global_recorder.messages, [])
+        self.assertIsNot(first.board, second.board)
+        self.assertEqual(second.board.get_cell(1, 1), Coin.EMPTY)
+
+    def test_play_to_win(self):
+        session = SessionManager(BitBoard).create_session(rng=random.Random(3))
+        switches = []
+
+        class SwitchRecorder(components.listeners.PlayerSwitchListenerInterface):
+            def on_player_turn_switched(self, listener):
+                switches.append(listener)
+
+        session.player_switched_listener.register_listener(SwitchRecorder())
+        session.start()
+        opener = session.get_current_player()
+        self.assertEqual(opener.coin, Coin.PIECE_X)
+        self.assertEqual(switches, [(opener, True)])
+        for x, y in ((0, 0), (1, 0), (0, 1), (1, 1)):
+            self.assertEqual(session.play_move(x, y), (False, None))
+        with self.assertRaises(ValueError):
+            session.play_move(0, 0)
+        self.assertEqual(session.play_move(0, 2), (True, Coin.PIECE_X))
+        self.assertEqual(switches[-1], (opener, False))
+        self.assertFalse(opener.is_holding_turn)
+        with self.assertRaises(ValueError):
+            session.play_move(2, 2)
+        # a rematch swaps the coins, the other player opens
+        session.start()
+        self.assertIsNot(session.get_current_player(), opener)
+        self.assertEqual(session.board.get_coin_masks(), (0, 0))
+
+
+class TestSessionManager(TestCase):
+
+    def test_registry(self):
+        manager = SessionManager()
+        sessions = [manager.create_session() for _ in range(100)]
+        self.assertEqual(manager.get_session_count(), 100)
+        self.assertEqual(len(set(session.game_id for session in sessions)), 100)
+        self.assertIs(manager.get_session(sessions[10].game_id), sessions[10])
+        self.assertIs(manager.end_session(sessions[10].game_id), sessions[10])
+        with self.assertRaises(KeyError):
+            manager.get_session(sessions[10].game_id)
+        self.assertEqual(manager.get_session_count(), 99)
+        self.assertNotIn(sessions[10].game_id, manager.get_session_ids())
@@ -0,0 +1,38 @@
+from unittest import TestCase
+from components.board import *
+from components.simulator import *
+from components.verifier import ResultVerifier
+
+
+class TestSimulator(TestCase):
+
+    def test_deterministic(self):
+        in_process = Simulator(RandomPolicy(), RandomPolicy(), worker_count=0, shard_size=7)
+        pooled = Simulator(RandomPolicy(), RandomPolicy(), worker_count=2, shard_size=5)
+        results = sorted(in_process.run(40, seed=3))
+        self.assertEqual(results, sorted(pooled.run(40, seed=3)))
+        self.assertNotEqual(results, sorted(in_process.run(40, seed=4)))
+        self.assertEqual([result.game_index for result in results], list(range(40)))
+        self.assertEqual(pooled.report.game_count, 40)
+        self.assertEqual(pooled.report.x_wins + pooled.report.o_wins + pooled.report.draws, 40)
+
+    def test_game_result(self):
+        for result in Simulator(RandomPolicy(), RandomPolicy(), worker_count=0).run(50, seed=1):
+            board = BitBoard()
+            coin = Coin.PIECE_X
+            for index in result.moves:
+                self.assertEqual(board.get_cell(*index_to_cell(index)), Coin.EMPTY)
+                board.set_cell(*index_to_cell(index), coin)
+                coin = Coin.PIECE_O if coin == Coin.PIECE_X else Coin.PIECE_X
+            verifier = ResultVerifier(board)
+            self.assertTrue(verifier.is_terminal())
+            self.assertEqual(verifier.winner() or Coin.EMPTY, result.winner)
+
+    def test_perfect_play(self):
+        simulator = Simulator(PerfectPolicy(), RandomPolicy(), worker_count=0)
+        for result in simulator.run(30, seed=2):
+            self.assertNotEqual(result.winner, Coin.PIECE_O if result.host_coin == Coin.PIECE_X else Coin.PIECE_X)
+        simulator = Simulator(PerfectPolicy(), PerfectPolicy(), worker_count=0)
+        for _ in simulator.run(10):
+            pass
+        self.assertEqual(simulator.report.draws, 10)
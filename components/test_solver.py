@@ -0,0 +1,62 @@
+from unittest import TestCase
+from components.board import *
+from components.solver import *
+from components.verifier import HAS_LINE
+
+
+def minimax(own_mask, opponent_mask):
+    """
+    plain minimax without pruning used as reference
+    """
+    if HAS_LINE[opponent_mask]:
+        return -1
+    empty_mask = FULL_MASK & ~(own_mask | opponent_mask)
+    if not empty_mask:
+        return 0
+    return max(-minimax(opponent_mask, own_mask | 1 << index) for index in MASK_INDICES[empty_mask])
+
+
+class TestSolver(TestCase):
+
+    def test_empty_board(self):
+        solver = Solver()
+        value, move = solver.solve(SimpleBoard(), Coin.PIECE_X)
+        self.assertEqual(value, 0)
+        self.assertIn(move, [(x, y) for x in range(3) for y in range(3)])
+
+    def test_winning_move(self):
+        board = SimpleBoard()
+        board.set_cell(0, 0, Coin.PIECE_O)
+        board.set_cell(1, 1, Coin.PIECE_O)
+        board.set_cell(0, 1, Coin.PIECE_X)
+        board.set_cell(0, 2, Coin.PIECE_X)
+        value, move = Solver().solve(board, Coin.PIECE_O)
+        self.assertEqual(value, 1)
+        self.assertEqual(move, (2, 2))
+        value, move = Solver().solve(board, Coin.PIECE_X)
+        self.assertEqual(value, 0)
+        self.assertEqual(move, (2, 2))
+
+    def test_finished_game(self):
+        board = BitBoard()
+        for y in range(3):
+            board.set_cell(2, y, Coin.PIECE_X)
+        self.assertEqual(Solver().solve(board, Coin.PIECE_O), (-1, None))
+
+    def test_matches_minimax(self):
+        solver = Solver()
+        positions = [(0, 0), (0x010, 0x001), (0x001, 0x010), (0x011, 0x006), (0x104, 0x030), (0x0A1, 0x046)]
+        for own_mask, opponent_mask in positions:
+            score, move = solver.solve_masks(own_mask, opponent_mask)
+            self.assertEqual(score_to_value(score), minimax(own_mask, opponent_mask))
+            self.assertEqual(-minimax(opponent_mask, own_mask | 1 << move), minimax(own_mask, opponent_mask))
+
+    def test_shared_table(self):
+        table = TranspositionTable()
+        Solver(table).solve(SimpleBoard(), Coin.PIECE_X)
+        entry_count = len(table)
+        self.assertGreater(entry_count, 0)
+        table.reset_statistics()
+        Solver(table).solve(SimpleBoard(), Coin.PIECE_O)
+        self.assertEqual(len(table), entry_count)
+        self.assertEqual(table.get_hit_rate(), 1.0)
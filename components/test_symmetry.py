@@ -0,0 +1,68 @@
+from unittest import TestCase
+from components.board import *
+from components.symmetry import *
+from components.verifier import HAS_LINE
+
+
+class TestSymmetry(TestCase):
+
+    def test_inverse(self):
+        for transform in range(8):
+            for x in range(3):
+                for y in range(3):
+                    moved = transform_cell(x, y, transform)
+                    self.assertEqual(transform_cell(*moved, INVERSE[transform]), (x, y))
+
+    def test_symmetric_positions_share_key(self):
+        board = SimpleBoard()
+        board.set_cell(0, 0, Coin.PIECE_X)
+        board.set_cell(0, 1, Coin.PIECE_O)
+        key = canonical_key(*board.get_coin_masks())[0]
+        for transform in range(8):
+            moved = BitBoard()
+            for (x, y), coin in board.get_map().items():
+                moved.set_cell(*transform_cell(x, y, transform), coin)
+            self.assertEqual(canonical_key(*moved.get_coin_masks())[0], key)
+        self.assertNotEqual(canonical_key(0x001, 0x010)[0], key)
+
+    def test_move_mapped_back(self):
+        board = BitBoard()
+        board.set_cell(2, 2, Coin.PIECE_X)
+        board.set_cell(1, 2, Coin.PIECE_O)
+        x_mask, o_mask, transform = canonicalize(board)
+        canonical_board = BitBoard()
+        canonical_board.x_bits, canonical_board.o_bits = x_mask, o_mask
+        for x in range(3):
+            for y in range(3):
+                original = transform_cell(x, y, INVERSE[transform])
+                self.assertEqual(canonical_board.get_cell(x, y), board.get_cell(*original))
+
+    def test_canonical_map(self):
+        board = SimpleBoard()
+        board.set_cell(2, 0, Coin.PIECE_O)
+        coin_map, transform = canonical_map(board.get_map())
+        self.assertEqual(len(coin_map), 9)
+        self.assertEqual(coin_map[transform_cell(2, 0, transform)], Coin.PIECE_O)
+        self.assertEqual(masks_from_map(coin_map), canonical_masks(*board.get_coin_masks())[:2])
+
+    def test_class_count(self):
+        # the 5478 legal positions fall into 765 symmetry classes
+        positions = set()
+        pending = [(0, 0)]
+        while pending:
+            x_mask, o_mask = pending.pop()
+            if (x_mask, o_mask) in positions:
+                continue
+            positions.add((x_mask, o_mask))
+            if x_mask | o_mask == FULL_MASK:
+                continue
+            if HAS_LINE[x_mask] or HAS_LINE[o_mask]:
+                continue
+            x_to_move = POPCOUNT[x_mask] == POPCOUNT[o_mask]
+            for index in MASK_INDICES[FULL_MASK & ~(x_mask | o_mask)]:
+                if x_to_move:
+                    pending.append((x_mask | 1 << index, o_mask))
+                else:
+                    pending.append((x_mask, o_mask | 1 << index))
+        self.assertEqual(len(positions), 5478)
+        self.assertEqual(len({canonical_key(*position)[0] for position in positions}), 765)
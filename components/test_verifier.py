@@ -0,0 +1,58 @@
+from unittest import TestCase
+from components.board import *
+from components.verifier import *
+
+
+class TestResultVerifier(TestCase):
+
+    def test_empty_board(self):
+        for board in (SimpleBoard(), BitBoard()):
+            verifier = ResultVerifier(board)
+            self.assertIsNone(verifier.winner())
+            self.assertFalse(verifier.is_draw())
+            self.assertFalse(verifier.is_terminal())
+            self.assertEqual(verifier.get_result(), (False, None))
+
+    def test_winner(self):
+        for board in (SimpleBoard(), BitBoard()):
+            verifier = ResultVerifier(board)
+            board.set_cell(0, 2, Coin.PIECE_O)
+            board.set_cell(1, 1, Coin.PIECE_O)
+            self.assertIsNone(verifier.winner_after_move(1, 1))
+            board.set_cell(2, 0, Coin.PIECE_O)
+            self.assertEqual(verifier.winner(), Coin.PIECE_O)
+            self.assertEqual(verifier.winner_after_move(2, 0), Coin.PIECE_O)
+            self.assertTrue(verifier.is_terminal())
+            self.assertFalse(verifier.is_draw())
+            board.clear_board()
+            for y in range(3):
+                board.set_cell(1, y, Coin.PIECE_X)
+            self.assertEqual(verifier.get_result(), (True, Coin.PIECE_X))
+
+    def test_draw(self):
+        layout = "XOXXOOOXX"
+        for board in (SimpleBoard(), BitBoard()):
+            for index, symbol in enumerate(layout):
+                x, y = index_to_cell(index)
+                board.set_cell(x, y, Coin.PIECE_X if symbol == "X" else Coin.PIECE_O)
+            verifier = ResultVerifier(board)
+            self.assertIsNone(verifier.winner())
+            self.assertTrue(verifier.is_draw())
+            self.assertTrue(verifier.is_terminal())
+
+    def test_board_size(self):
+        board = MNKBoard(3, 3, 3)
+        board.set_cell(0, 0, Coin.PIECE_X)
+        board.set_cell(1, 1, Coin.PIECE_X)
+        board.set_cell(2, 2, Coin.PIECE_X)
+        self.assertEqual(ResultVerifier(board).get_result(), (True, Coin.PIECE_X))
+        for m, n, k in ((15, 15, 5), (4, 4, 3), (3, 3, 2)):
+            with self.assertRaises(ValueError):
+                ResultVerifier(MNKBoard(m, n, k))
+
+    def test_tables(self):
+        self.assertEqual(len(WIN_LINES), 8)
+        self.assertEqual(len(LINES_THROUGH_CELL[cell_index(1, 1)]), 4)
+        self.assertEqual(len(LINES_THROUGH_CELL[cell_index(0, 1)]), 2)
+        self.assertTrue(HAS_LINE[0x1C0])
+        self.assertFalse(HAS_LINE[0x0AA])
@@ -0,0 +1,50 @@
+from unittest import TestCase
+from components.board import *
+from components.zobrist import *
+
+
+class TestZobrist(TestCase):
+
+    def test_keys_are_pinned(self):
+        # changing these values invalidates every stored hash
+        keys = get_zobrist_keys(9)
+        self.assertEqual(keys[0], 0xc0e16b163a85a4dc)
+        self.assertEqual(keys[17], 0x5540f5ba6a15576e)
+        self.assertEqual(get_zobrist_keys(225)[:18], keys)
+        self.assertEqual(len(set(get_zobrist_keys(225))), 450)
+
+    def test_incremental_hash(self):
+        for board in (SimpleBoard(), BitBoard(), MNKBoard(3, 3, 3)):
+            self.assertEqual(board.hash, 0)
+            board.set_cell(0, 0, Coin.PIECE_X)
+            board.set_cell(1, 1, Coin.PIECE_O)
+            first = board.hash
+            board.clear_board()
+            self.assertEqual(board.hash, 0)
+            board.set_cell(1, 1, Coin.PIECE_O)
+            board.set_cell(0, 0, Coin.PIECE_X)
+            self.assertEqual(board.hash, first)
+            board.set_cell(0, 0, Coin.PIECE_O)
+            self.assertNotEqual(board.hash, first)
+            board.undo()
+            self.assertEqual(board.hash, first)
+            board.undo()
+            board.undo()
+            self.assertEqual(board.hash, 0)
+
+    def test_boards_agree(self):
+        boards = (SimpleBoard(), BitBoard(), MNKBoard(3, 3, 3))
+        for index, coin in ((4, Coin.PIECE_X), (2, Coin.PIECE_O), (7, Coin.PIECE_X)):
+            for board in boards:
+                board.set_cell(*index_to_cell(index), coin)
+            self.assertEqual(len({board.hash for board in boards}), 1)
+
+    def test_raw_moves(self):
+        board = BitBoard()
+        board.set_cell(2, 0, Coin.PIECE_O)
+        expected = board.hash
+        board.clear_board()
+        board.apply_move(cell_index(2, 0), Coin.PIECE_O)
+        self.assertEqual(board.hash, expected)
+        board.undo_move(cell_index(2, 0))
+        self.assertEqual(board.hash, 0)
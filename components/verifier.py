@@ -0,0 +1,104 @@
+from typing import Optional, Tuple
+import components.board as bc
+
+# the 8 winning lines as 9 bit masks, bit index is x * 3 + y
+WIN_LINES = (0x007, 0x038, 0x1C0,   # x = 0, 1, 2
+             0x049, 0x092, 0x124,   # y = 0, 1, 2
+             0x111, 0x054)          # diagonals
+
+# winning lines passing through each cell index
+LINES_THROUGH_CELL = tuple(tuple(line for line in WIN_LINES if line >> index & 1) for index in range(9))
+
+# True for every 9 bit mask that contains at least one complete line
+HAS_LINE = tuple(any(mask & line == line for line in WIN_LINES) for mask in range(bc.FULL_MASK + 1))
+
+
+def get_winner(x_mask: int, o_mask: int) -> Optional[bc.Coin]:
+    """
+    looks up the winner of the position described by the coin masks
+    :param x_mask: 9 bit mask of the X coins
+    :param o_mask: 9 bit mask of the O coins
+    :return: winning coin, None if nobody has completed a line
+    """
+    if HAS_LINE[x_mask]:
+        return bc.Coin.PIECE_X
+    if HAS_LINE[o_mask]:
+        return bc.Coin.PIECE_O
+    return None
+
+
+def is_line_completed(coin_mask: int, index: int) -> bool:
+    """
+    checks only the lines through the given cell for a complete line
+    :param coin_mask: 9 bit mask of the coin placed last
+    :param index: bit index of the cell the coin was placed on
+    :return: bool
+    """
+    for line in LINES_THROUGH_CELL[index]:
+        if coin_mask & line == line:
+            return True
+    return False
+
+
+class ResultVerifier:
+    """
+    winner and terminal state detection for the components.board boards
+
+    every check is a constant number of table lookups on the coin masks of the board, so only
+    3x3 boards won by 3 in a row are supported. an MNKBoard tracks its own winner
+    """
+
+    def __init__(self, board: bc.Board):
+        dimensions = (getattr(board, "m", 3), getattr(board, "n", 3), getattr(board, "k", 3))
+        if dimensions != (3, 3, 3):
+            raise ValueError(f"ResultVerifier supports 3x3 boards won by 3 in a row, got m, n, k = {dimensions}, "
+                             f"use the winner of the MNKBoard instead")
+        self.board_of_concern = board
+
+    def winner(self) -> Optional[bc.Coin]:
+        """
+        returns the coin which has completed a line
+        :return: Coin, None if there is no winner
+        """
+        return get_winner(*self.board_of_concern.get_coin_masks())
+
+    def is_draw(self) -> bool:
+        """
+        checks if the board is full without any completed line
+        :return: bool
+        """
+        x_mask, o_mask = self.board_of_concern.get_coin_masks()
+        return x_mask | o_mask == bc.FULL_MASK and not HAS_LINE[x_mask] and not HAS_LINE[o_mask]
+
+    def is_terminal(self) -> bool:
+        """
+        checks if the game has ended, either by a win or by a draw
+        :return: bool
+        """
+        x_mask, o_mask = self.board_of_concern.get_coin_masks()
+        return x_mask | o_mask == bc.FULL_MASK or HAS_LINE[x_mask] or HAS_LINE[o_mask]
+
+    def winner_after_move(self, x, y) -> Optional[bc.Coin]:
+        """
+        incremental check to be called right after a coin is placed
+        only the lines through the updated cell are examined
+        :param x: x coordinate of the last placed coin
+        :param y: y coordinate of the last placed coin
+        :return: Coin, None if the move did not complete a line
+        """
+        x_mask, o_mask = self.board_of_concern.get_coin_masks()
+        index = x * 3 + y
+        if x_mask >> index & 1:
+            return bc.Coin.PIECE_X if is_line_completed(x_mask, index) else None
+        if o_mask >> index & 1:
+            return bc.Coin.PIECE_O if is_line_completed(o_mask, index) else None
+        return None
+
+    def get_result(self) -> Tuple[bool, Optional[bc.Coin]]:
+        """
+        returns the terminal flag and the winner in a single pass
+        :return: (is_terminal, winner)
+        """
+        x_mask, o_mask = self.board_of_concern.get_coin_masks()
+        winner = get_winner(x_mask, o_mask)
+        return winner is not None or x_mask | o_mask == bc.FULL_MASK, winner
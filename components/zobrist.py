@@ -0,0 +1,45 @@
+"""
+zobrist keys for the incremental position hash of the boards
+
+the keys are drawn from a splitmix64 sequence started at ZOBRIST_SEED, the generator is
+part of this module so the hashes stay the same across processes, platforms and python releases.
+the table of a larger board starts with the keys of every smaller board
+"""
+from typing import Dict, Tuple
+
+ZOBRIST_SEED = 0x2545F4914F6CDD1D
+
+_MASK_64 = (1 << 64) - 1
+_tables: Dict[int, Tuple[int, ...]] = {}
+
+
+def splitmix64(state: int) -> Tuple[int, int]:
+    """
+    one step of the splitmix64 generator
+    :param state: current 64 bit state
+    :return: (next state, 64 bit output)
+    """
+    state = (state + 0x9E3779B97F4A7C15) & _MASK_64
+    value = state
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return state, value ^ (value >> 31)
+
+
+def get_zobrist_keys(cell_count: int) -> Tuple[int, ...]:
+    """
+    returns the keys of a board with the given number of cells
+    key 2 * index belongs to an X coin on the cell, key 2 * index + 1 to an O coin,
+    empty cells do not contribute to the hash
+    :param cell_count: number of cells of the board
+    :return: tuple of 2 * cell_count 64 bit keys
+    """
+    keys = _tables.get(cell_count)
+    if keys is None:
+        state = ZOBRIST_SEED
+        generated = []
+        for _ in range(2 * cell_count):
+            state, value = splitmix64(state)
+            generated.append(value)
+        keys = _tables[cell_count] = tuple(generated)
+    return keys